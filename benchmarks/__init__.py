@@ -0,0 +1,6 @@
+# benchmarks – Laufzeitmessungen für die Analysepfade des Firmware File Analyzers
+#
+# generator.py         – deterministische synthetische Firmware-Logs (1 MB … 10 GB)
+# suite.py             – Durchsatz (Zeilen/s, MB/s) und Spitzen-RSS aller Hot Paths als JSON
+# history.py           – Historie mit Commit/Host-Fingerprint, Vergleich mit Konfidenzintervallen (bench compare)
+# bench_emba_parser.py – Streaming-Parser vs. BeautifulSoup für EMBA f17-Reports
@@ -0,0 +1,71 @@
+# benchmarks/bench_emba_parser.py – Streaming-Parser vs. BeautifulSoup auf einem synthetischen f17-Report
+#
+# python -m benchmarks.bench_emba_parser --components 50000
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from src.emba_parser import extract_cves_from_f17, extract_cves_streaming
+
+COMPONENT_NAMES = ["linux_kernel", "busybox", "openssl", "dropbear_ssh", "dnsmasq", "uclibc",
+                   "hostapd", "wpa_supplicant", "libcurl", "lighttpd", "zlib", "sqlite"]
+
+
+def write_synthetic_f17_report(path: str, components: int, seed: int = 42) -> int:
+    """
+    Schreibt einen synthetischen f17_cve_bin_tool.html-Report im EMBA-Stil.
+    Jede Ausgabezeile steht – wie bei EMBA – in einem eigenen <pre>-Block mit Farb-<span>s.
+    Gibt die Dateigröße in Bytes zurück.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html>\n<html><head><title>EMBA f17</title></head><body>\n")
+        f.write('<pre>[<span class="blue">*</span>] Static version detection and CVE analysis</pre>\n')
+        for i in range(components):
+            name = f"{rng.choice(COMPONENT_NAMES)}_{i % 997}"
+            version = f"{rng.randint(0, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 9)}"
+            cves = rng.randint(0, 300)
+            exploits = rng.randint(0, 12)
+            f.write(f'<pre>[<span class="green">+</span>] Component details: {name} : {version} : '
+                    f'CVEs: {cves} : Exploits: {exploits}</pre>\n')
+            f.write(f'<pre>    <span class="grey">&rarr; NVD lookup for {name} finished</span></pre>\n')
+        f.write(f'<pre>[<span class="green">+</span>] Identified {components * 7} CVE entries.</pre>\n')
+        f.write('<pre>[<span class="green">+</span>] Critical: 28 / High: 703 / Medium: 1671 / Low: 47</pre>\n')
+        f.write('<pre>[<span class="green">+</span>] Identified 58 verified exploits.</pre>\n')
+        f.write("</body></html>\n")
+    return os.path.getsize(path)
+
+
+def _measure(func, path: str, repeat: int) -> dict:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        timings.append(time.perf_counter() - start)
+    return {"best_s": round(min(timings), 4), "components": len(result[0]), "summary_lines": len(result[1])}
+
+
+def run(components: int, repeat: int = 3, include_reference: bool = True) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "f17_cve_bin_tool.html")
+        size = write_synthetic_f17_report(path, components)
+        results = {"components": components, "bytes": size,
+                   "streaming": _measure(extract_cves_streaming, path, repeat)}
+        if include_reference:
+            results["beautifulsoup"] = _measure(extract_cves_from_f17, path, repeat)
+            results["speedup"] = round(results["beautifulsoup"]["best_s"] / results["streaming"]["best_s"], 1)
+        results["streaming"]["mb_per_s"] = round(size / 1e6 / results["streaming"]["best_s"], 1)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark: EMBA f17-Parser")
+    parser.add_argument("--components", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-reference", action="store_true", help="BeautifulSoup-Referenz nicht messen")
+    args = parser.parse_args()
+    print(json.dumps(run(args.components, args.repeat, not args.skip_reference), indent=2))
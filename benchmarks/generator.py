@@ -0,0 +1,145 @@
+# benchmarks/generator.py – Deterministischer Generator für synthetische Firmware-Logs
+#
+# Erzeugt Logs in den Formaten aus data_250503/ (INFO/WARN-Zeilen in eckigen Klammern,
+# [ERROR]-Zeilen, Sensor-Telemetrie, Roboter-Wegpunkte) in beliebiger Größe (1 MB … 10 GB).
+#
+# python -m benchmarks.generator --size 100MB --format mixed --output ./.cache/bench/mixed_100MB.txt
+
+import argparse
+import os
+import random
+import re
+from datetime import datetime, timedelta
+
+LOG_FORMATS = ("firmware", "error", "sensor", "robot", "mixed")
+
+# Anteil der Zeilenarten im Format "mixed" (ähnlich sensor_data_with_lots_errors.txt)
+MIXED_WEIGHTS = {"sensor": 60, "error": 15, "firmware": 15, "robot": 10}
+
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+START_TIME = datetime(2025, 4, 27, 6, 0, 0)
+
+FIRMWARE_MESSAGES = [
+    ("INFO", "Updating module {n}..."),
+    ("INFO", "Communication link established."),
+    ("INFO", "System self-test passed."),
+    ("WARN", "Temporary disconnect at module {n}"),
+    ("WARN", "Voltage fluctuation detected."),
+    ("ERROR", "Sensor array failure detected."),
+    ("ERROR", "Firmware update failed at module {n}."),
+]
+FIRMWARE_WEIGHTS = [50, 10, 10, 12, 8, 6, 4]
+
+ERROR_MESSAGES = [
+    "Sensor failed: ID {n}",
+    "CAN-Bus timeout on channel {n}",
+    "Firmware exception at address 0x{addr:04X}",
+    "Voltage drop detected: {volt:.2f}V",
+    "Obstacle detected near waypoint {n}",
+]
+
+
+def parse_size(size: str) -> int:
+    """Wandelt Größenangaben wie '1MB', '512 KB' oder '10GB' in Bytes um."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", str(size).upper())
+    if not match:
+        raise ValueError(f"Ungültige Größenangabe: {size}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def format_size(num_bytes: int) -> str:
+    """Kurzform für Dateinamen, z. B. 1048576 → '1MB'."""
+    for unit in ("GB", "MB", "KB"):
+        if num_bytes % SIZE_UNITS[unit] == 0:
+            return f"{num_bytes // SIZE_UNITS[unit]}{unit}"
+    return f"{num_bytes}B"
+
+
+def iter_log_lines(log_format: str = "mixed", seed: int = 42):
+    """
+    Endloser, deterministischer Zeilenstrom im gewählten Format (ohne Zeilenende).
+    Gleicher seed → identische Ausgabe.
+    """
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unbekanntes Logformat: {log_format} (erlaubt: {', '.join(LOG_FORMATS)})")
+
+    rng = random.Random(seed)
+    timestamp = START_TIME
+    waypoint = 0
+    kinds = list(MIXED_WEIGHTS) if log_format == "mixed" else [log_format]
+    weights = list(MIXED_WEIGHTS.values()) if log_format == "mixed" else [1]
+
+    while True:
+        kind = rng.choices(kinds, weights)[0] if len(kinds) > 1 else kinds[0]
+        if kind != "error":
+            timestamp += timedelta(seconds=30)
+        ts = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+
+        if kind == "sensor":
+            yield (f"[{ts}] Temperature: {rng.uniform(20, 80):.2f} C, Humidity: {rng.uniform(30, 70):.2f} %, "
+                   f"Voltage: {rng.uniform(11, 14):.2f} V, Motor RPM: {rng.randint(1000, 3000)}, "
+                   f"Load Current: {rng.uniform(1, 5):.2f} A")
+        elif kind == "error":
+            template = rng.choice(ERROR_MESSAGES)
+            message = template.format(n=rng.randint(1, 20), addr=rng.randint(0, 0xFFFF), volt=rng.uniform(9, 11))
+            yield f"{ts} [ERROR] {message}"
+        elif kind == "firmware":
+            level, template = rng.choices(FIRMWARE_MESSAGES, FIRMWARE_WEIGHTS)[0]
+            yield f"[{ts}] {level}: {template.format(n=rng.randint(1, 40))}"
+        else:
+            if rng.random() < 0.1:
+                yield f"Obstacle detected at {ts}"
+            else:
+                waypoint += 1
+                yield (f"Reached waypoint {waypoint} (X: {rng.uniform(0, 100):.2f}, "
+                       f"Y: {rng.uniform(0, 100):.2f}, Z: {rng.uniform(0, 6):.2f})")
+
+
+def write_synthetic_log(path: str, size_bytes: int, log_format: str = "mixed", seed: int = 42,
+                        block_lines: int = 10_000) -> dict:
+    """
+    Schreibt ein synthetisches Log mit ca. size_bytes Bytes (UTF-8, nur ganze Zeilen).
+    Zeilen werden blockweise geschrieben; gibt {'path', 'bytes', 'lines'} zurück.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    lines_iter = iter_log_lines(log_format, seed)
+    written = 0
+    lines = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        while written < size_bytes:
+            block = "\n".join(next(lines_iter) for _ in range(block_lines)) + "\n"
+            encoded = block.encode("utf-8")
+            last_block = written + len(encoded) >= size_bytes
+            if last_block:
+                # Letzten Block zeilengenau kürzen
+                cut = encoded.rfind(b"\n", 0, size_bytes - written) + 1 or encoded.find(b"\n") + 1
+                encoded = encoded[:cut]
+            f.write(encoded.decode("utf-8"))
+            written += len(encoded)
+            lines += encoded.count(b"\n")
+            if last_block:
+                break
+    os.replace(tmp_path, path)
+    return {"path": path, "bytes": written, "lines": lines}
+
+
+def ensure_synthetic_log(directory: str, size_bytes: int, log_format: str = "mixed", seed: int = 42) -> dict:
+    """Erzeugt das Log nur, wenn es noch nicht existiert (Dateiname enthält Format, Größe und seed)."""
+    path = os.path.join(directory, f"{log_format}_{format_size(size_bytes)}_s{seed}.txt")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            lines = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1024 * 1024), b""))
+        return {"path": path, "bytes": os.path.getsize(path), "lines": lines}
+    return write_synthetic_log(path, size_bytes, log_format, seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetische Firmware-Logs erzeugen")
+    parser.add_argument("--size", default="1MB", help="Zielgröße, z. B. 1MB, 500MB, 10GB")
+    parser.add_argument("--format", default="mixed", choices=LOG_FORMATS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", required=True, help="Zieldatei")
+    args = parser.parse_args()
+    info = write_synthetic_log(args.output, parse_size(args.size), args.format, args.seed)
+    print(f"✅ {info['lines']} Zeilen ({info['bytes']} Bytes) geschrieben: {info['path']}")
@@ -0,0 +1,147 @@
+# benchmarks/history.py – Benchmark-Historie und Regressionsprüfung
+#
+# Ergebnisse der Suite werden mit Commit und Host-Fingerprint als JSON Lines abgelegt.
+# Ein neuer Lauf wird gegen eine Baseline verglichen (Mittelwert ± 95-%-Konfidenzintervall je Benchmark);
+# eine Regression liegt vor, wenn die Verlangsamung auch am günstigen Rand des Intervalls über der Toleranz liegt.
+
+import hashlib
+import json
+import math
+import os
+import statistics
+import subprocess
+
+DEFAULT_HISTORY_PATH = "./.cache/bench/history.jsonl"
+DEFAULT_TRACKED = ("classify_custom_error", "build_error_dataframe", "parse_log_to_dataframe", "emba_streaming")
+DEFAULT_TOLERANCE = 0.10
+
+# Zweiseitige 95-%-Quantile der t-Verteilung für df = 1 … 30 (danach Normalverteilung)
+T_975 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+         2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+         2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def t_critical(df: float) -> float:
+    """t-Quantil für (ggf. gebrochene) Freiheitsgrade; abgerundet, also eher konservativ."""
+    if df > len(T_975):
+        return 1.96
+    return T_975[max(int(df), 1) - 1]
+
+
+def git_commit(cwd: str | None = None) -> str:
+    """Kurz-Hash des aktuellen Commits, mit '+dirty' bei uncommitteten Änderungen ('unknown' ohne git)."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=cwd, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}+dirty" if dirty else commit
+
+
+def host_fingerprint(host: dict) -> str:
+    """Kurzer, stabiler Fingerprint der Messumgebung (Plattform, CPU, Python-Version)."""
+    key = "|".join(str(host.get(field, "")) for field in ("platform", "machine", "processor", "cpu_count", "python"))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+def append_history(report: dict, path: str = DEFAULT_HISTORY_PATH, commit: str | None = None,
+                   source: str = "run") -> dict:
+    """
+    Ergänzt einen Suite-Report um Commit, Host-Fingerprint und Herkunft ("run" = bench run, "compare" =
+    gespeicherter Vergleichslauf) und hängt ihn an die Historie an. Baselines sind nur "run"-Einträge.
+    """
+    record = dict(report)
+    record["commit"] = commit or git_commit()
+    record["host_fingerprint"] = host_fingerprint(report.get("host", {}))
+    record["source"] = source
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    return record
+
+
+def load_history(path: str = DEFAULT_HISTORY_PATH) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_baseline(history: list[dict], fingerprint: str, size: str, log_format: str,
+                  commit: str | None = None, tracked: tuple = ()) -> dict | None:
+    """
+    Neuester passender Eintrag aus bench run (gleicher Host, gleiche Loggröße und -format), der alle
+    Benchmarks aus tracked enthält. Vergleichsläufe (source "compare") sind nie Baseline – sonst würde eine
+    Regression beim nächsten Lauf zur neuen Baseline. Mit commit wird zusätzlich nach Commit-Präfix gefiltert.
+    """
+    for record in reversed(history):
+        if record.get("source", "run") != "run" or record.get("host_fingerprint") != fingerprint:
+            continue
+        if any(name not in record.get("results", {}) for name in tracked):
+            continue
+        if record.get("size") != size or record.get("log_format") != log_format:
+            continue
+        if commit and not record.get("commit", "").startswith(commit):
+            continue
+        return record
+    return None
+
+
+def mean_ci(samples: list[float]) -> tuple[float, float]:
+    """Mittelwert und halbe Breite des 95-%-Konfidenzintervalls."""
+    mean = statistics.fmean(samples)
+    if len(samples) < 2:
+        return mean, 0.0
+    return mean, t_critical(len(samples) - 1) * statistics.stdev(samples) / math.sqrt(len(samples))
+
+
+def compare_samples(baseline: list[float], current: list[float], tolerance: float = DEFAULT_TOLERANCE) -> dict:
+    """
+    Vergleicht zwei Messreihen (Sekunden pro Lauf) per Welch-Intervall der Mittelwertdifferenz.
+    change = relative Verlangsamung; change_low/change_high = 95-%-Intervall dafür.
+    Status: 'regression' (untere Grenze > Toleranz), 'improvement' (obere Grenze < -Toleranz), sonst 'ok'.
+    """
+    base_mean, base_ci = mean_ci(baseline)
+    cur_mean, cur_ci = mean_ci(current)
+    n_base, n_cur = len(baseline), len(current)
+    var_base = statistics.variance(baseline) / n_base if n_base > 1 else 0.0
+    var_cur = statistics.variance(current) / n_cur if n_cur > 1 else 0.0
+    stderr = math.sqrt(var_base + var_cur)
+    if stderr > 0 and n_base > 1 and n_cur > 1:
+        # Welch–Satterthwaite-Freiheitsgrade
+        dof = (var_base + var_cur) ** 2 / (var_base ** 2 / (n_base - 1) + var_cur ** 2 / (n_cur - 1))
+        margin = t_critical(dof) * stderr
+    else:
+        margin = 0.0
+
+    diff = cur_mean - base_mean
+    change = diff / base_mean if base_mean else 0.0
+    change_low = (diff - margin) / base_mean if base_mean else 0.0
+    change_high = (diff + margin) / base_mean if base_mean else 0.0
+    if change_low > tolerance:
+        status = "regression"
+    elif change_high < -tolerance:
+        status = "improvement"
+    else:
+        status = "ok"
+    return {
+        "baseline_mean_s": base_mean, "baseline_ci_s": base_ci,
+        "current_mean_s": cur_mean, "current_ci_s": cur_ci,
+        "change": change, "change_low": change_low, "change_high": change_high,
+        "status": status,
+    }
+
+
+def compare_reports(baseline: dict, current: dict, tracked: tuple = DEFAULT_TRACKED,
+                    tolerance: float = DEFAULT_TOLERANCE) -> dict:
+    """Vergleicht alle in beiden Reports vorhandenen, verfolgten Benchmarks."""
+    comparison = {}
+    for name in tracked:
+        base = baseline.get("results", {}).get(name)
+        cur = current.get("results", {}).get(name)
+        if not base or not cur:
+            continue
+        comparison[name] = compare_samples(base["timings_s"], cur["timings_s"], tolerance)
+    return comparison
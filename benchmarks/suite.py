@@ -0,0 +1,272 @@
+# benchmarks/suite.py – Durchsatzmessung der Analysepfade auf synthetischen Logs
+#
+# python -m benchmarks.suite --size 10MB --repeat 3
+# python -m benchmarks.suite --size 1GB --only build_error_dataframe --only classify_custom_error --output bench.json
+#
+# Jeder Benchmark läuft in einem eigenen Prozess (spawn), damit die Spitzen-RSS pro Messung vergleichbar ist.
+#
+# build_error_dataframe, parse_log_to_dataframe und classify_custom_error messen Funktionen, die ihre Eingabe als
+# Liste bzw. Text im Speicher erwarten. Sie laden höchstens IN_MEMORY_LIMIT_BYTES vom Anfang des Logs (an einer
+# Zeilengrenze abgeschnitten); Zeilen, Bytes und Durchsatz beziehen sich dann auf diesen Ausschnitt
+# ("input_capped" im Ergebnis). Die dateibasierten Benchmarks lesen das ganze Log gestreamt.
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import multiprocessing
+import pandas as pd
+
+from benchmarks.generator import ensure_synthetic_log, parse_size, format_size
+from benchmarks.bench_emba_parser import write_synthetic_f17_report
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_WORKDIR = "./.cache/bench"
+SEARCH_TERM = "sensor failed"
+# Durchschnittliche Größe einer Komponente im synthetischen f17-Report (Bytes)
+F17_BYTES_PER_COMPONENT = 190
+# Obergrenze der Eingabe für Benchmarks, die das Log vollständig im Speicher halten
+IN_MEMORY_LIMIT_BYTES = 256 * 1024 * 1024
+
+
+def peak_rss_mb() -> float | None:
+    """Spitzen-RSS des aktuellen Prozesses in MB (None, falls nicht ermittelbar)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux liefert KB, macOS Bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _single_file_dir(log_path: str) -> str:
+    """Verzeichnis, das nur das Benchmark-Log enthält (für verzeichnisbasierte Analysen)."""
+    directory = f"{os.path.splitext(log_path)[0]}_dir"
+    target = os.path.join(directory, os.path.basename(log_path))
+    if not os.path.exists(target):
+        os.makedirs(directory, exist_ok=True)
+        try:
+            os.link(log_path, target)
+        except OSError:
+            import shutil
+            shutil.copyfile(log_path, target)
+    return directory
+
+
+# --- Benchmarks: setup(log_path, size_bytes, workdir) → (funktion, zeilen, bytes) ---------------------------
+
+def _read_log_prefix(log_path: str, limit: int = IN_MEMORY_LIMIT_BYTES) -> str:
+    """Anfang des Logs bis höchstens limit Bytes, an der letzten vollständigen Zeile abgeschnitten."""
+    with open(log_path, "rb") as f:
+        data = f.read(limit)
+        if f.read(1):
+            data = data[:data.rfind(b"\n") + 1]
+    return data.decode("utf-8")
+
+
+def _setup_build_error_dataframe(log_path, size_bytes, workdir):
+    from src.error_timeparser import build_error_dataframe
+    text = _read_log_prefix(log_path)
+    lines = text.splitlines()
+    num_bytes = len(text.encode("utf-8"))
+    del text
+    return (lambda: build_error_dataframe(lines)), len(lines), num_bytes
+
+
+def _setup_parse_log_to_dataframe(log_path, size_bytes, workdir):
+    from src.data_analysis import parse_log_to_dataframe
+    text = _read_log_prefix(log_path)
+    return (lambda: parse_log_to_dataframe(text)), text.count("\n"), len(text.encode("utf-8"))
+
+
+def _setup_classify_custom_error(log_path, size_bytes, workdir):
+    from src.custom_classifier import classify_custom_error
+    messages = [line.split("[ERROR] ", 1)[1] for line in _read_log_prefix(log_path).splitlines() if "[ERROR] " in line]
+
+    def run():
+        for message in messages:
+            classify_custom_error(message)
+
+    return run, len(messages), sum(len(message.encode("utf-8")) + 1 for message in messages)
+
+
+def _setup_text_analyzer(log_path, size_bytes, workdir):
+    from src.text_analyzer import TextAnalyzer
+    directory = _single_file_dir(log_path)
+
+    def run():
+        analyzer = TextAnalyzer(directory)
+        analyzer.collect_files()
+        analyzer.analyze()
+
+    return run, _count_lines(log_path), os.path.getsize(log_path)
+
+
+def _setup_search_text(log_path, size_bytes, workdir):
+    from main import search_text
+    directory = _single_file_dir(log_path)
+    return (lambda: search_text(dir=directory, term=SEARCH_TERM)), _count_lines(log_path), os.path.getsize(log_path)
+
+
+def _f17_report(size_bytes, workdir) -> str:
+    components = max(1, size_bytes // F17_BYTES_PER_COMPONENT)
+    path = os.path.join(workdir, f"f17_{format_size(size_bytes)}.html")
+    if not os.path.exists(path):
+        write_synthetic_f17_report(path, components)
+    return path
+
+
+def _setup_emba_streaming(log_path, size_bytes, workdir):
+    from src.emba_parser import extract_cves_streaming
+    path = _f17_report(size_bytes, workdir)
+    return (lambda: extract_cves_streaming(path)), _count_lines(path), os.path.getsize(path)
+
+
+def _setup_emba_beautifulsoup(log_path, size_bytes, workdir):
+    from src.emba_parser import extract_cves_from_f17
+    path = _f17_report(size_bytes, workdir)
+    return (lambda: extract_cves_from_f17(path)), _count_lines(path), os.path.getsize(path)
+
+
+def _count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1024 * 1024), b""))
+
+
+BENCHMARKS = {
+    "build_error_dataframe": _setup_build_error_dataframe,
+    "parse_log_to_dataframe": _setup_parse_log_to_dataframe,
+    "classify_custom_error": _setup_classify_custom_error,
+    "text_analyzer_analyze": _setup_text_analyzer,
+    "search_text": _setup_search_text,
+    "emba_streaming": _setup_emba_streaming,
+    "emba_beautifulsoup": _setup_emba_beautifulsoup,
+}
+
+
+# Benchmarks, deren Eingabe auf IN_MEMORY_LIMIT_BYTES begrenzt ist
+IN_MEMORY_BENCHMARKS = ("build_error_dataframe", "parse_log_to_dataframe", "classify_custom_error")
+
+
+def run_benchmark(name: str, log_path: str, size_bytes: int, workdir: str, repeat: int = 3) -> dict:
+    """
+    Führt einen Benchmark repeat-mal aus (Konsolenausgaben werden verworfen).
+    Durchsatz wird aus dem Median berechnet, alle Einzelzeiten bleiben für Auswertungen erhalten.
+    """
+    func, lines, num_bytes = BENCHMARKS[name](log_path, size_bytes, workdir)
+    rss_before = peak_rss_mb()
+    timings = []
+    output = None
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            output = None  # Ergebnis des Vorlaufs freigeben, bevor der nächste misst
+            start = time.perf_counter()
+            output = func()
+            timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    result = {
+        "lines": lines,
+        "bytes": num_bytes,
+        "timings_s": [round(t, 6) for t in timings],
+        "best_s": round(min(timings), 6),
+        "median_s": round(median, 6),
+        "lines_per_s": round(lines / median, 1) if median else None,
+        "mb_per_s": round(num_bytes / 1e6 / median, 3) if median else None,
+        "setup_peak_rss_mb": rss_before,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if name in IN_MEMORY_BENCHMARKS and os.path.getsize(log_path) > IN_MEMORY_LIMIT_BYTES:
+        result["input_capped"] = True
+    if isinstance(output, pd.DataFrame):
+        result["frame_memory"] = frame_memory(output)
+    return result
+
+
+def frame_memory(df: pd.DataFrame) -> dict:
+    """Speicherbedarf eines Ergebnis-DataFrames im kompakten Schema und als Objekt-Strings (vorher/nachher)."""
+    from src.event_schema import expand_events, memory_usage_mb
+
+    compact_mb = memory_usage_mb(df)
+    object_mb = memory_usage_mb(expand_events(df))
+    return {
+        "rows": len(df),
+        "compact_mb": compact_mb,
+        "object_mb": object_mb,
+        "saving": round(1 - compact_mb / object_mb, 3) if object_mb else 0.0,
+    }
+
+
+def host_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(size: str = "1MB", repeat: int = 3, names: list[str] | None = None, workdir: str = DEFAULT_WORKDIR,
+              log_format: str = "mixed", seed: int = 42, isolate: bool = True) -> dict:
+    """
+    Erzeugt (falls nötig) das synthetische Log und misst alle bzw. die ausgewählten Benchmarks.
+    Mit isolate=True läuft jeder Benchmark in einem frischen Prozess.
+    """
+    names = names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unbekannte Benchmarks: {', '.join(unknown)} (verfügbar: {', '.join(BENCHMARKS)})")
+
+    workdir = os.path.abspath(workdir)
+    size_bytes = parse_size(size)
+    log_info = ensure_synthetic_log(workdir, size_bytes, log_format, seed)
+
+    results = {}
+    for name in names:
+        args = (name, log_info["path"], size_bytes, workdir, repeat)
+        if isolate:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                results[name] = pool.submit(run_benchmark, *args).result()
+        else:
+            results[name] = run_benchmark(*args)
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "size": size,
+        "log_format": log_format,
+        "seed": seed,
+        "repeat": repeat,
+        "log": {"bytes": log_info["bytes"], "lines": log_info["lines"]},
+        "host": host_info(),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark-Suite des Firmware File Analyzers")
+    parser.add_argument("--size", default="1MB", help="Größe des synthetischen Logs, z. B. 1MB, 1GB, 10GB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append", choices=list(BENCHMARKS), help="Nur diesen Benchmark (mehrfach)")
+    parser.add_argument("--format", default="mixed", help="Logformat des Generators")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="Ablage für generierte Testdaten")
+    parser.add_argument("--no-isolate", action="store_true", help="Alle Benchmarks im selben Prozess ausführen")
+    parser.add_argument("--output", help="Ergebnisse zusätzlich als JSON-Datei speichern")
+    args = parser.parse_args()
+
+    report = run_suite(args.size, args.repeat, args.only, args.workdir, args.format, args.seed, not args.no_isolate)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
@@ -9,13 +9,84 @@ if str(src_path) not in sys.path:
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from src.data_analysis import parse_log_to_dataframe
-from src.emba_parser import evaluate_firmware_acceptance
+from collections import OrderedDict
+from threading import Lock
+from src.upload_analysis import analyze_upload, content_hash, render_charts
+from src.rollup import build_rollup, chart_series, page_events, type_totals, DEFAULT_PAGE_SIZE
 from src.error_visualizer import export_error_report_to_pdf
 import os
 import time
 
+# Anzahl vollständig analysierter Uploads, die im Server-Speicher gehalten werden (sitzungsübergreifend)
+MAX_CACHED_UPLOADS = 3
+
+
+@st.cache_resource
+def _analysis_store():
+    """Prozessweiter LRU-Speicher: Inhalts-Hash → Analyse (DataFrame, Aggregate, gerenderte Charts)."""
+    return OrderedDict(), Lock()
+
+
+def load_analysis(uploaded_file) -> dict:
+    """Analysiert einen Upload genau einmal pro Inhalt; Reruns (Buttons, Eingaben) lesen nur den Cache."""
+    data = uploaded_file.getvalue()
+    digest = content_hash(data)
+    store, lock = _analysis_store()
+    with lock:
+        if digest in store:
+            store.move_to_end(digest)
+            return store[digest]
+
+    bar = st.progress(0.0, text="Analysiere Log …")
+
+    def progress(done, total):
+        bar.progress(done / total if total else 1.0, text=f"Analysiere Log … {done / 1e6:.0f} / {total / 1e6:.0f} MB")
+
+    analysis = analyze_upload(data, progress=progress)
+    bar.empty()
+    with lock:
+        store[digest] = analysis
+        while len(store) > MAX_CACHED_UPLOADS:
+            store.popitem(last=False)
+    return analysis
+
+
+def show_aggregated(analysis: dict) -> None:
+    """
+    Ansicht für große Logs: Filter und Diagramme arbeiten auf dem vorberechneten Minuten-Rollup,
+    die Ereignistabelle wird seitenweise geladen. An den Browser gehen nur feste Datenmengen.
+    """
+    if "rollup" not in analysis:
+        analysis["rollup"] = build_rollup(analysis["df"])
+    rollup = analysis["rollup"]
+    if rollup["start"] is None:
+        st.info("Keine Ereignisse mit Zeitstempel gefunden.")
+        return
+
+    start, end = rollup["start"].to_pydatetime(), rollup["end"].to_pydatetime()
+    if start < end:
+        start, end = st.sidebar.slider("Zeitraum", min_value=start, max_value=end, value=(start, end),
+                                       format="YYYY-MM-DD HH:mm")
+    error_types = st.sidebar.multiselect("Fehlerarten", rollup["error_types"], default=rollup["error_types"])
+
+    st.markdown("### 📊 Fehlerarten im Zeitraum")
+    totals = type_totals(rollup, start, end, error_types)
+    st.bar_chart(totals)
+
+    st.markdown("### 📈 Fehlerzeitverlauf (verdichtet)")
+    st.bar_chart(chart_series(rollup, start, end, error_types))
+
+    st.markdown("### 🧪 Ereignisse")
+    page_size = st.sidebar.selectbox("Zeilen pro Seite", [50, DEFAULT_PAGE_SIZE, 500], index=1)
+    _, total = page_events(rollup, 0, 0, start, end, error_types)
+    pages = max(1, -(-total // page_size))
+    page = st.number_input(f"Seite (von {pages})", min_value=1, max_value=pages, value=1) - 1
+    events, _ = page_events(rollup, page, page_size, start, end, error_types)
+    st.caption(f"{total} Ereignisse im Filter – Zeilen {page * page_size + 1 if total else 0}"
+               f"–{page * page_size + len(events)}")
+    st.dataframe(events)
+
+
 # Streamlit GUI für die Firmware-Analyse
 st.set_page_config(page_title="Firmware File Analyzer", layout="wide")
 st.title("🛠️ Firmware File Analyzer")
@@ -28,63 +99,43 @@ ob die Firmware für den Produktionseinsatz geeignet ist.
 uploaded_file = st.file_uploader("📂 Wähle eine Logdatei (.txt)", type=["txt"])
 
 if uploaded_file is not None:
-    # Zeilen einlesen und analysieren
-    lines = uploaded_file.read().decode("utf-8").splitlines()
-    text = "\n".join(lines)
-    df = parse_log_to_dataframe(text, classify=True)
-    # optional Vorschläge nachträglich ergänzen
-    from src.data_analysis import parse_log_to_dataframe as parse_df_alt
-    df_temp = parse_df_alt(text, classify=False)
-    if hasattr(df_temp, "attrs") and "suggested_classes" in df_temp.attrs:
-        df.attrs["suggested_classes"] = df_temp.attrs["suggested_classes"]
-
-    st.markdown("### 🧪 Fehlerarten-Zeitverlauf")
-    st.dataframe(df)
+    analysis = load_analysis(uploaded_file)
+    df = analysis["df"]
+    view = st.sidebar.radio("Ansicht", ["Aggregiert (große Logs)", "Vollständig"])
 
     st.markdown("### 📋 Deployment-Entscheidung")
-    status, reason = evaluate_firmware_acceptance(df)
-
-    if status:
-        st.success(reason)
+    if analysis["status"]:
+        st.success(analysis["reason"])
     else:
-        st.error(reason)
-
-    st.markdown("---")
+        st.error(analysis["reason"])
     st.markdown(f"Anzahl Fehler insgesamt: **{len(df)}**")
-    st.markdown(f"Verteilung nach Typ:")
-    st.dataframe(df["error_type"].value_counts().reset_index().rename(columns={"index": "Fehlertyp", "error_type": "Anzahl"}))
-
-    st.markdown("### 📊 Fehlerarten (Diagramm)")
-    fig, ax = plt.subplots()
-    df["error_type"].value_counts().plot(kind="bar", color="tomato", ax=ax)
-    ax.set_ylabel("Anzahl")
-    ax.set_xlabel("Fehlertyp")
-    ax.set_title("Verteilung der Fehlerarten")
-    st.pyplot(fig)
-
-    st.markdown("### 📈 Fehlerzeitverlauf & Heatmap")
-    df_hourly = df.copy()
-    df_hourly["hour"] = df_hourly["timestamp"].dt.floor("h")
-    grouped = df_hourly.groupby(["hour", "error_type"]).size().unstack(fill_value=0)
-
-    # Gestapelter Zeitverlauf
-    st.markdown("#### Fehleranzahl pro Stunde (gestapelt)")
-    fig1, ax1 = plt.subplots(figsize=(12, 5))
-    grouped.plot(kind="bar", stacked=True, ax=ax1)
-    ax1.set_xlabel("Zeit (Stunde)")
-    ax1.set_ylabel("Fehleranzahl")
-    ax1.set_title("Gestapelte Fehler über Zeit")
-    st.pyplot(fig1)
-
-    # Heatmap
-    st.markdown("#### Fehler-Heatmap")
-    import seaborn as sns
-    fig2, ax2 = plt.subplots(figsize=(12, 4))
-    sns.heatmap(grouped.T, annot=True, fmt=".0f", cmap="YlGnBu", ax=ax2, cbar_kws={"label": "Fehleranzahl"})
-    ax2.set_xlabel("Zeit (Stunde)")
-    ax2.set_ylabel("Fehlerart")
-    ax2.set_title("Heatmap: Fehlerarten über Zeit")
-    st.pyplot(fig2)
+    st.markdown("---")
+
+    if view == "Vollständig":
+        charts = render_charts(analysis)
+
+        st.markdown("### 🧪 Fehlerarten-Zeitverlauf")
+        st.dataframe(df)
+
+        st.markdown(f"Verteilung nach Typ:")
+        st.dataframe(analysis["counts"].rename_axis("Fehlertyp").reset_index(name="Anzahl"))
+
+        st.markdown("### 📊 Fehlerarten (Diagramm)")
+        if "error_types" in charts:
+            st.image(charts["error_types"])
+
+        st.markdown("### 📈 Fehlerzeitverlauf & Heatmap")
+        # Gestapelter Zeitverlauf
+        st.markdown("#### Fehleranzahl pro Stunde (gestapelt)")
+        if "error_stacked_bar" in charts:
+            st.image(charts["error_stacked_bar"])
+
+        # Heatmap
+        st.markdown("#### Fehler-Heatmap")
+        if "error_heatmap" in charts:
+            st.image(charts["error_heatmap"])
+    else:
+        show_aggregated(analysis)
 
     # 🧠 Exportbuttons für Charts + Vorschläge
     from src.error_visualizer import export_suggested_classes
@@ -94,11 +145,14 @@ if uploaded_file is not None:
     os.makedirs(export_chart_dir, exist_ok=True)
 
     if st.button("💾 Charts als PNG speichern"):
-        fig1.savefig(os.path.join(export_chart_dir, "error_stacked_bar.png"))
-        fig2.savefig(os.path.join(export_chart_dir, "error_heatmap.png"))
+        charts = render_charts(analysis)
+        for name in ("error_stacked_bar", "error_heatmap"):
+            if name in charts:
+                with open(os.path.join(export_chart_dir, f"{name}.png"), "wb") as f:
+                    f.write(charts[name])
         st.success(f"Gespeichert in {export_chart_dir}")
 
-    if hasattr(df, "attrs") and "suggested_classes" in df.attrs:
+    if analysis["suggested_classes"]:
         if st.button("💾 suggested_classes.json exportieren"):
             json_path = os.path.join(export_chart_dir, "suggested_classes.json")
             export_suggested_classes(df, json_path)
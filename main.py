@@ -7,6 +7,8 @@
 # python main.py analyze --dir ./data
 # python main.py analyze-pandas --dir ./data --export report.csv --format csv
 # python main.py analyze-pandas --dir ./data --export stats.json --format json
+# python main.py analyze --dir ./data --format jsonl --export ./exports/events.jsonl.gz
+# python main.py analyze --dir ./data --format xlsx --export ./exports/events.xlsx
 # python main.py export-basic --dir ./data --output export.csv --format csv
 #
 # Interaktive Funktionen
@@ -25,22 +27,52 @@
 # python main.py generate-error-report --filepath ./data/sensor_data_with_lots_errors.txt
 # python main.py generate-full-error-report --filepath ./data/sensor_data_with_lots_errors.txt
 # python main.py generate-error-report-zip --filepath ./data/sensor_data_with_lots_errors.txt
+# python main.py generate-batch-reports --dir ./data_250503 --output-dir ./charts/batch --workers 4 --zip
 #
 # Kritische Fehlerzeitfenster filtern
 # ------------------------------------
 # python main.py find-critical-errors --filepath ./data/sensor_data_with_lots_errors.txt --error-type firmware_issue --threshold 4
+#
+# EMBA-Auswertung
+# ---------------
+# python main.py analyze-emba-tree --report-dir ./emba/fw_a/html-report --report-dir ./emba/fw_b/html-report --export components.csv
+# python main.py import-cve-feed --feed ./nvd_mirror --index ./.cache/cve_index.json.gz
+# python main.py analyze-emba-cves --filepath ./f17_cve_bin_tool.html --cve-index ./.cache/cve_index.json.gz
+# python main.py analyze-binary --filepath ./firmware/fw_a.bin --export ./exports/fw_a_regions.csv
+# python main.py diff-emba --old ./emba/fw_a/html-report/f17_cve_bin_tool.html --new ./emba/fw_b/html-report/f17_cve_bin_tool.html
+#
+# Benchmarks
+# ----------
+# python main.py bench run --size 10MB --repeat 5
+# python main.py bench compare --size 10MB --tolerance 0.1
+# python main.py --metrics-file /var/lib/node_exporter/textfile/firmware_analyzer.prom check-firmware-status --filepath ./data/log.txt
+# Analyse-Server (warme Worker, Client-Modus)
+# -------------------------------------------
+# python main.py serve --socket ./.cache/analyzer.sock --workers 4
+# python main.py check-firmware-status --filepath ./data/log.txt --server ./.cache/analyzer.sock
+# python main.py check-firmware-status --filepath ./data/log.txt --full-scan   (Gesamtzahlen statt Frühabbruch)
+# python main.py analyze --dir ./data --export ./exports/events.csv --server tcp://127.0.0.1:8765
+# Flottenvergleich (Map-Reduce über viele Logdateien)
+# ---------------------------------------------------
+# python main.py compare-logs --directory ./fleet --workers 8 --partial ./exports/fleet_partial.json.gz
+# python main.py compare-logs --directory ./data --dedupe   (überlappende Logabschnitte nur einmal zählen)
+# python main.py plan --dir /nfs/logs --shards 4 --output ./shards
+# python main.py analyze --manifest ./shards/shard-001-of-004.manifest.json   (je Rechner ein Shard)
+# python main.py merge --partial "./shards/*.analyze.json.gz" --export ./exports/events.csv
+# python main.py --profile --profile-pstats ./charts/profile/run.pstats generate-full-error-report --filepath ./data/sensor_data_with_lots_errors.txt
 # ------------------------------------------------------------
 
 
 import typer
 import logging
 import os
+import time
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from src.text_tool import remove_whitespace, word_count
-from src.file_writer import export_to_csv, export_to_json
-from src.file_reader import read_text_file
+from src.file_writer import export_to_csv, export_to_json, export_to_jsonl, export_to_xlsx
+from src.file_reader import count_invalid_bytes, read_log_bytes, read_text_file
 from src.log_util import setup_logger
 from src.text_analyzer import TextAnalyzer
 from src.visualizer import (plot_analysis, plot_trends, plot_error_types)
@@ -49,7 +81,7 @@ from src.data_analysis import (build_enhanced_dataframe, save_dataframe, detect_
 from src.error_visualizer import (plot_error_timecourse, plot_error_heatmap, export_error_report_to_pdf, export_report_as_zip,
                                   detect_critical_error_windows, publish_reports_to_docs, compare_error_logs, compare_custom_error_logs,
                                   plot_error_comparison, plot_error_heatmap_logs, export_emba_report_to_pdf)
-from src.error_timeparser import classify_error_type, extract_timestamp, build_error_dataframe
+from src.error_timeparser import classify_error_type, extract_timestamp, build_error_dataframe_bytes
 from src.emba_parser import (extract_summary_from_index, extract_cves_auto, extract_cves_from_f17, plot_top_cve_components)
 from typing import Optional
 from rich import print as rprint
@@ -61,46 +93,130 @@ from rich.table import Table
 app = typer.Typer()
 setup_logger()
 
+
+def _submit_to_server(server: str, request: dict) -> dict:
+    """Client-Modus: Anfrage an einen laufenden Analyse-Server, Fehler als CLI-Fehlermeldung."""
+    from src.analysis_server import ServerError, submit
+
+    try:
+        return submit(server, request)
+    except ServerError as e:
+        print(f"❌ {e}")
+        raise typer.Exit(code=1)
+
+
+def _print_dedupe(stats: dict) -> None:
+    """Zusammenfassung der Deduplizierung, falls die Aufgabe mit --dedupe lief."""
+    if "dedupe" in stats:
+        from src.dedupe import describe_stats
+
+        print(describe_stats(stats["dedupe"]))
+
+
+def _print_invalid_bytes(stats: dict) -> None:
+    """Hinweis auf ersetzte ungültige UTF-8-Bytes (Kennzahl invalid_bytes pro Datei)."""
+    damaged = [entry["invalid_bytes"] for entry in stats.get("files", []) if entry.get("invalid_bytes")]
+    if damaged:
+        print(f"⚠️ {sum(damaged)} ungültige Bytes in {len(damaged)} Datei(en) ersetzt")
+
+
+def _read_log(filepath: str) -> bytes:
+    """Logdatei binär lesen und ersetzte ungültige UTF-8-Bytes melden (wie analyze)."""
+    data = read_log_bytes(filepath)
+    _print_invalid_bytes({"files": [{"invalid_bytes": count_invalid_bytes(data)}]})
+    return data
+
+
+@app.callback()
+def global_options(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", help="Wall-/CPU-Zeit und Speicherspitze pro Pipeline-Stufe messen"),
+    profile_output: str = typer.Option("./charts/profile/profile.json", help="Zieldatei des Profils (JSON)"),
+    profile_pstats: Optional[str] = typer.Option(None, help="Zusätzlicher cProfile-Dump (pstats), z. B. ./charts/profile/run.pstats"),
+    profile_memory: bool = typer.Option(True, "--profile-memory/--no-profile-memory", help="tracemalloc-Spitze erfassen (kostet Laufzeit)"),
+    metrics_file: Optional[str] = typer.Option(None, envvar="FFA_METRICS_FILE", help="Prometheus-Textfile (node_exporter textfile collector), geschrieben am Ende des Laufs"),
+    metrics_interval: float = typer.Option(0.0, help="Zusätzlich alle N Sekunden schreiben (langlaufende Modi, 0 = nur am Ende)")
+):
+    """Firmware File Analyzer – Analyse von Firmware-Logs und EMBA-Reports."""
+    if metrics_file:
+        from src.metrics import REGISTRY, finish_run
+
+        started = time.time()
+        if metrics_interval > 0:
+            REGISTRY.start_interval_writer(metrics_file, metrics_interval)
+        ctx.call_on_close(lambda: finish_run(started, metrics_file))
+
+    if not profile:
+        return
+    from src.profiling import enable_profiling, disable_profiling
+
+    enable_profiling(trace_memory=profile_memory, pstats_path=profile_pstats)
+
+    def write_profile():
+        report = disable_profiling(profile_output)
+        slowest = ", ".join(f"{stage} {values['self_wall_s']:.2f}s" for stage, values in list(report["stages"].items())[:4])
+        print(f"⏱️ Profil gespeichert: {profile_output} ({slowest})")
+        if profile_pstats:
+            print(f"📄 pstats-Dump: {profile_pstats}")
+
+    ctx.call_on_close(write_profile)
+
 @app.command()
 def analyze(
     dir: str = typer.Option("./data","--dir","-d",help="Pfad zum Verzeichnis mit .txt-Dateien"),
-    format: str = typer.Option("csv", help="Exportformat: csv oder json"),
-    export: Optional[str] = typer.Option(None, help="Pfad zur Exportdatei (optional)")
+    format: str = typer.Option("csv", help="Exportformat: csv, json, jsonl (Endung .gz → gzip-komprimiert) oder xlsx"),
+    export: Optional[str] = typer.Option(None, help="Pfad zur Exportdatei (optional)"),
+    server: Optional[str] = typer.Option(None, help="Analyse-Server (Socket-Pfad oder tcp://host:port) statt lokaler Ausführung"),
+    manifest: Optional[str] = typer.Option(None, help="Nur die Dateien dieses Shard-Manifests (siehe plan) auswerten und ein Teilergebnis schreiben"),
+    partial: Optional[str] = typer.Option(None, help="Zieldatei des Teilergebnisses (Standard: neben dem Manifest, *.analyze.json.gz)"),
+    dedupe: bool = typer.Option(False, "--dedupe", help="Dateiübergreifend doppelte Ereignisse (gleicher Zeitstempel und Zeile) nur einmal zählen")
 ):
     """Analysiert ein Verzeichnis mit .txt-Dateien."""
-    all_entries = []
-    for fname in os.listdir(dir):
-        if fname.endswith(".txt"):
-            path = os.path.join(dir, fname)
-            with open(path, encoding="utf-8") as f:
-                content = f.read()
-            lines = content.splitlines()
-            error_df = build_error_dataframe(lines)
-            if error_df.empty:
-                continue
-            error_df["source_file"] = fname
-            all_entries.append(error_df)
-
-    if not all_entries:
+    if manifest and server:
+        print("❌ --manifest kann nicht mit --server kombiniert werden.")
+        raise typer.Exit(code=1)
+    if manifest:
+        from src.analysis_tasks import analyze_directory, record_task_metrics
+        from src.sharding import default_partial_path, load_manifest, save_events_partial
+
+        shard = load_manifest(manifest)
+        result_df, stats = analyze_directory(shard["directory"], shard["files"], dedupe=dedupe)
+        record_task_metrics(stats)
+        _print_dedupe(stats)
+        _print_invalid_bytes(stats)
+        partial = partial or default_partial_path(manifest, "analyze")
+        save_events_partial(result_df, stats, shard, partial)
+        print(f"💾 Teilergebnis Shard {shard['shard']}/{shard['shards']} gespeichert: {partial} "
+              f"({len(shard['files'])} Dateien, {stats['events']} Ereignisse)")
+        return
+
+    if server:
+        result = _submit_to_server(server, {"command": "analyze", "dir": os.path.abspath(dir), "format": format,
+                                 "export": os.path.abspath(export) if export else None, "dedupe": dedupe})
+        _print_dedupe(result)
+        _print_invalid_bytes(result)
+        if not result["events"]:
+            print("⚠️ Keine gültigen Fehlerdaten gefunden.")
+            raise typer.Exit()
+        print(result["preview"])
+        if result["exported"]:
+            print(f"✅ {format.upper()} exportiert: {result['exported']}")
+        return
+
+    from src.analysis_tasks import analyze_directory, export_events, record_task_metrics
+
+    result_df, stats = analyze_directory(dir, dedupe=dedupe)
+    record_task_metrics(stats)
+    _print_dedupe(stats)
+    _print_invalid_bytes(stats)
+    if result_df.empty:
         print("⚠️ Keine gültigen Fehlerdaten gefunden.")
         raise typer.Exit()
 
-    result_df = pd.concat(all_entries)
     print(result_df.head())
 
-
     if export:
-        export_dir = os.path.dirname(export)
-        if export_dir:
-            os.makedirs(export_dir, exist_ok=True)
-        if format == "csv":
-            export_to_csv(result_df, export)
-            print(f"✅ CSV exportiert: {export}")
-        elif format == "json":
-            export_to_json(result_df, export)
-            print(f"✅ JSON exportiert: {export}")
-        else:
-            print(f"❌ Unbekanntes Format: {format}")
+        export_events(result_df, export, format)
 
     
 @app.command()
@@ -171,10 +287,10 @@ def analyze_pandas(
     ),
     format: str = typer.Option(
         "csv", "--format", "-f",
-        help="Exportformat: csv oder json"
+        help="Exportformat: csv, json, jsonl oder xlsx"
     )
 ):
-    """Analysiert mit pandas-Erweiterung und exportiert als CSV oder JSON."""
+    """Analysiert mit pandas-Erweiterung und exportiert als CSV, JSON, JSON Lines oder Excel."""
     if not os.path.exists(dir):
         typer.echo(f"❌ Fehler: Verzeichnis nicht gefunden: {dir}")
         raise typer.Exit(code=1)
@@ -187,30 +303,34 @@ def analyze_pandas(
 
 @app.command()
 def check_firmware_status(
-    filepath: str = typer.Option(..., help="Pfad zur Logdatei (.txt) mit Zeitstempeln und Fehlern")
+    filepath: str = typer.Option(..., help="Pfad zur Logdatei (.txt) mit Zeitstempeln und Fehlern"),
+    full_scan: bool = typer.Option(False, "--full-scan", help="Ganzes Log auswerten statt beim ersten sicheren Befund abzubrechen"),
+    server: Optional[str] = typer.Option(None, help="Analyse-Server (Socket-Pfad oder tcp://host:port) statt lokaler Ausführung")
 ):
     """
     Prüft automatisch, ob die Firmware anhand des Fehlerlogs für das Deployment geeignet ist.
     """
-    from src.error_timeparser import build_error_dataframe
-    from src.emba_parser import evaluate_firmware_acceptance
-
     if not os.path.exists(filepath):
         print(f"❌ Datei nicht gefunden: {filepath}")
         raise typer.Exit()
 
-    with open(filepath, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    df = build_error_dataframe(lines)
-    status, reason = evaluate_firmware_acceptance(df)
+    if server:
+        result = _submit_to_server(server, {"command": "check-firmware-status", "filepath": os.path.abspath(filepath),
+                                            "full_scan": full_scan})
+    else:
+        from src.analysis_tasks import check_firmware_file, record_task_metrics
+        result = check_firmware_file(filepath, full_scan=full_scan)
+        record_task_metrics(result)
 
     print("\n📋 Deployment-Entscheidung:")
-    if status:
+    if result["status"]:
         print("✅ Firmware FREIGEGEBEN")
     else:
         print("❌ Firmware BLOCKIERT")
-    print(f"Begründung: {reason}")
+    print(f"Begründung: {result['reason']}")
+    if result.get("early_exit"):
+        print(f"⏩ Entscheidung nach {result['files'][0]['lines']:,} Zeilen feststehend – Rest nicht gelesen "
+              f"(--full-scan für Gesamtzahlen).")
 
 
 @app.command()
@@ -229,7 +349,7 @@ def export_basic(
     for filename in os.listdir(dir):
         if filename.endswith(".txt"):
             path = os.path.join(dir, filename)
-            text = read_text_file(path)
+            text = read_text_file(path, errors="replace")
             if text:
                 stats.append({
                     "filename": filename,
@@ -249,17 +369,24 @@ def export_basic(
 @app.command()
 def visualize(
     dir: str = "./data",
-    export: str = typer.Option(None, "--export", "-e", help="Exportiere erweiterten DataFrame (Pfad zu .csv oder .json)"),
-    alert_threshold: float = typer.Option(10.0, "--alert-threshold", "-a", help="Fehlerquote-Schwelle für Warnungen (%)")
+    export: str = typer.Option(None, "--export", "-e", help="Exportiere erweiterten DataFrame (Pfad zu .csv, .json oder .jsonl, optional .gz, oder .xlsx)"),
+    alert_threshold: float = typer.Option(10.0, "--alert-threshold", "-a", help="Fehlerquote-Schwelle für Warnungen (%)"),
+    dedupe: bool = typer.Option(False, "--dedupe", help="Dateiübergreifend doppelte Ereignisse nur in der ersten Datei zählen")
 ):
     """Erstellt Visualisierungen auf Basis der .txt-Analysen."""
     analyzer = TextAnalyzer(dir)
     if analyzer.collect_files():
         analyzer.analyze()
         data = []
+        deduplicator = None
+        if dedupe:
+            from src.dedupe import LineDeduplicator
+            deduplicator = LineDeduplicator()
         for filename in analyzer.txt_files:
             path = os.path.join(dir, filename)
-            text = read_text_file(path)
+            text = read_text_file(path, errors="replace")
+            if text and deduplicator is not None:
+                text = deduplicator.filter_text(text)
             errors, warnings, infos = count_log_entries(text) if text else (0, 0, 0)
             error_classes = classify_errors(text) if text else {}
             threshold_classes = detect_threshold_warnings(text) if text else {}
@@ -288,6 +415,8 @@ def visualize(
                 "overheating_warning": threshold_classes.get("overheating_warning", 0),
                 "low_voltage_warning": voltage_classes.get("low_voltage_warning", 0)
             })
+        if deduplicator is not None:
+            print(deduplicator.summary())
         plot_analysis(data)
         plot_error_types(data)
         # Ausgabe der Statistiken im Terminal       
@@ -340,7 +469,9 @@ def visualize(
 
 
         # Export, wenn Option angegeben ist
-        if export:
+        if export and export.endswith(".xlsx"):
+            export_to_xlsx({"file_stats": enhanced_df, "correlations": correlations.reset_index()}, export)
+        elif export:
             save_dataframe(enhanced_df, export)
 
         typer.echo("✅ Visualisierungen wurden erfolgreich erstellt und gespeichert.")
@@ -356,10 +487,7 @@ def visualize_errors(
         print(f"Datei nicht gefunden: {filepath}")
         return
 
-    with open(filepath, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    df = build_error_dataframe(lines)
+    df = build_error_dataframe_bytes(_read_log(filepath))
 
     # Info-Zeilen ggf. filtern
     df = df[df["error_type"] != "info"]
@@ -380,10 +508,7 @@ def visualize_errors_all(
         print(f"Datei nicht gefunden: {filepath}")
         return
 
-    with open(filepath, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    df = build_error_dataframe(lines)
+    df = build_error_dataframe_bytes(_read_log(filepath))
     df = df[df["error_type"] != "info"]
 
     plot_error_timecourse(df)
@@ -400,10 +525,7 @@ def generate_error_report(
         print(f"❌ Datei nicht gefunden: {filepath}")
         return
 
-    with open(filepath, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    df = build_error_dataframe(lines)
+    df = build_error_dataframe_bytes(_read_log(filepath))
     df = df[df["error_type"] != "info"]
 
     plot_error_timecourse(df)
@@ -411,7 +533,8 @@ def generate_error_report(
 
 @app.command()
 def generate_full_error_report(
-    filepath: str = "./data/sensor_data_with_lots_errors.txt"
+    filepath: str = "./data/sensor_data_with_lots_errors.txt",
+    output_dir: str = typer.Option("./charts", help="Ausgabeverzeichnis (Reports landen unter <output_dir>/errors)")
 ):
     """
     Erstellt vollständige Fehleranalyse mit PDF-Report inklusive Heatmap und kritischer Zusammenfassung.
@@ -420,19 +543,19 @@ def generate_full_error_report(
         print(f"❌ Datei nicht gefunden: {filepath}")
         return
 
-    with open(filepath, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    df = build_error_dataframe(lines)
+    df = build_error_dataframe_bytes(_read_log(filepath))
     df = df[df["error_type"] != "info"]
 
-    plot_error_timecourse(df)
-    plot_error_heatmap(df)
-    export_error_report_to_pdf(df)
+    plot_error_timecourse(df, output_dir=output_dir)
+    plot_error_heatmap(df, output_dir=output_dir)
+    export_error_report_to_pdf(df, output_path=os.path.join(output_dir, "errors", "fehlerreport.pdf"))
 
 @app.command()
 def generate_error_report_zip(
-    filepath: str = "./data/sensor_data_with_lots_errors.txt"
+    filepath: str = "./data/sensor_data_with_lots_errors.txt",
+    output_dir: str = typer.Option("./charts", help="Ausgabeverzeichnis (Reports landen unter <output_dir>/errors)"),
+    compression: str = typer.Option("deflated", help="ZIP-Kompression: stored, deflated, bzip2 oder lzma"),
+    level: int = typer.Option(6, help="Kompressionsstufe (deflated: 0-9, bzip2: 1-9)")
 ):
     """
     Erstellt vollständigen Fehlerbericht inkl. ZIP-Export aller Ausgabedateien.
@@ -441,16 +564,48 @@ def generate_error_report_zip(
         print(f"❌ Datei nicht gefunden: {filepath}")
         return
 
-    with open(filepath, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    df = build_error_dataframe(lines)
+    df = build_error_dataframe_bytes(_read_log(filepath))
     df = df[df["error_type"] != "info"]
 
-    plot_error_timecourse(df)
-    plot_error_heatmap(df)
-    export_error_report_to_pdf(df)
-    export_report_as_zip()
+    report_dir = os.path.join(output_dir, "errors")
+    plot_error_timecourse(df, output_dir=output_dir)
+    plot_error_heatmap(df, output_dir=output_dir)
+    export_error_report_to_pdf(df, output_path=os.path.join(report_dir, "fehlerreport.pdf"))
+    export_report_as_zip(output_dir=report_dir, compression=compression, compresslevel=level)
+
+
+@app.command()
+def generate_batch_reports(
+    dir: str = typer.Option("./data", "--dir", "-d", help="Verzeichnis mit .txt-Logdateien"),
+    output_dir: str = typer.Option("./charts/batch", help="Wurzelverzeichnis für die Reports (ein Unterordner pro Datei)"),
+    workers: int = typer.Option(os.cpu_count() or 1, help="Anzahl paralleler Worker-Prozesse"),
+    create_zip: bool = typer.Option(False, "--zip", help="Zusätzlich ein ZIP-Bundle pro Report erzeugen")
+):
+    """
+    Erstellt für jede Logdatei eines Verzeichnisses einen isolierten Fehlerreport (parallel) inkl. Summary-Index.
+    """
+    from src.batch_report import generate_batch_reports as run_batch
+
+    if not os.path.isdir(dir):
+        typer.echo(f"❌ Fehler: Verzeichnis nicht gefunden: {dir}")
+        raise typer.Exit(code=1)
+
+    index_df = run_batch(dir, output_root=output_dir, workers=workers, create_zip=create_zip)
+    if index_df.empty:
+        print("⚠️ Keine .txt-Dateien gefunden.")
+        raise typer.Exit()
+
+    console = Console()
+    table = Table(title="📑 Batch-Reports", header_style="bold cyan")
+    for col in ["filename", "status", "events", "duration_s"]:
+        table.add_column(col)
+    for row in index_df.itertuples(index=False):
+        style = "red" if row.status == "error" else ""
+        table.add_row(row.filename, f"[{style}]{row.status}[/{style}]" if style else row.status,
+                      str(row.events), f"{row.duration_s:.2f}")
+    console.print(table)
+    console.print(f"📁 Summary-Index: {os.path.join(output_dir, 'index.csv')}")
+    _print_invalid_bytes({"files": index_df.to_dict("records")})
 
 @app.command()
 def find_critical_errors(
@@ -465,10 +620,7 @@ def find_critical_errors(
         print(f"❌ Datei nicht gefunden: {filepath}")
         return
 
-    with open(filepath, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    df = build_error_dataframe(lines)
+    df = build_error_dataframe_bytes(_read_log(filepath))
     df = df[df["error_type"] != "info"]
 
     filtered = detect_critical_error_windows(df, threshold=threshold)
@@ -490,13 +642,85 @@ def publish_docs():
 
 
 @app.command()
-def compare_logs(directory: str = "./data"):
+def compare_logs(
+    directory: str = "./data",
+    workers: int = typer.Option(1, help="Parallele Prozesse für die Map-Phase (lohnt ab einigen hundert Dateien)"),
+    partial: Optional[str] = typer.Option(None, help="Teilergebnis zusätzlich speichern (JSON, Endung .gz → gzip)"),
+    manifest: Optional[str] = typer.Option(None, help="Nur die Dateien dieses Shard-Manifests (siehe plan); Teilergebnis standardmäßig *.compare.json.gz daneben"),
+    dedupe: bool = typer.Option(False, "--dedupe", help="Dateiübergreifend doppelte Ereignisse nur einmal zählen (Map-Phase dann sequenziell)")
+):
     """
     Vergleicht Fehlerarten über mehrere Logdateien im angegebenen Verzeichnis.
     """
-    df = compare_error_logs(directory)
+    files, plan = None, None
+    if manifest:
+        from src.sharding import default_partial_path, load_manifest, shard_plan
+
+        shard = load_manifest(manifest)
+        directory, files, plan = shard["directory"], shard["files"], shard_plan(shard)
+        partial = partial or default_partial_path(manifest, "compare")
+    df = compare_error_logs(directory, workers=workers, partial_path=partial, files=files, dedupe=dedupe, plan=plan)
     print(df)
 
+
+@app.command()
+def plan(
+    dir: str = typer.Option("./data", "--dir", "-d", help="Verzeichnis mit .txt-Dateien (auf allen Rechnern unter demselben Pfad)"),
+    shards: int = typer.Option(..., min=1, help="Anzahl der Shards (z. B. Anzahl der Analyse-Rechner)"),
+    output: str = typer.Option("./shards", help="Zielverzeichnis für die Manifeste")
+):
+    """
+    Teilt die Logdateien eines Verzeichnisses nach Bytes ausgeglichen auf mehrere Shard-Manifeste auf.
+    """
+    from src.sharding import plan_shards, write_manifests
+
+    manifests = plan_shards(dir, shards)
+    paths = write_manifests(manifests, output)
+    for manifest, path in zip(manifests, paths):
+        print(f"🗂️ {path}: {len(manifest['files'])} Dateien, {manifest['bytes'] / 1024 / 1024:.1f} MB")
+
+
+@app.command()
+def merge(
+    partial: list[str] = typer.Option(..., "--partial", "-p", help="Teilergebnis oder Glob-Muster in Anführungszeichen (mehrfach angebbar)"),
+    export: Optional[str] = typer.Option(None, help="analyze-Teilergebnisse: Exportdatei wie bei analyze"),
+    format: str = typer.Option("csv", help="Exportformat: csv, json, jsonl (Endung .gz → gzip-komprimiert) oder xlsx"),
+    output: Optional[str] = typer.Option(None, help="compare-logs-Teilergebnisse: zusammengeführtes Teilergebnis speichern")
+):
+    """
+    Führt Teilergebnisse von analyze --manifest bzw. compare-logs --manifest zur normalen Ausgabe zusammen.
+    """
+    from src.sharding import expand_partial_paths, merge_compare_partials, merge_events_partials, partial_kind
+
+    paths = expand_partial_paths(partial)
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if not paths or missing:
+        print(f"❌ Teilergebnis nicht gefunden: {', '.join(missing) or ', '.join(partial)}")
+        raise typer.Exit(code=1)
+    try:
+        kinds = {partial_kind(path) for path in paths}
+        if len(kinds) > 1:
+            raise ValueError("analyze- und compare-logs-Teilergebnisse können nicht gemeinsam zusammengeführt werden.")
+        print(f"🔗 {len(paths)} Teilergebnisse werden zusammengeführt")
+        if kinds == {"compare"}:
+            print(merge_compare_partials(paths, output))
+            if output:
+                print(f"💾 Teilergebnis gespeichert: {output}")
+            return
+        result_df, _ = merge_events_partials(paths)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise typer.Exit(code=1)
+
+    from src.analysis_tasks import export_events
+
+    if result_df.empty:
+        print("⚠️ Keine gültigen Fehlerdaten gefunden.")
+        raise typer.Exit()
+    print(result_df.head())
+    if export:
+        export_events(result_df, export, format)
+
 @app.command()
 def plot_error_comparison_chart(directory: str = "./data"):
     """
@@ -506,12 +730,19 @@ def plot_error_comparison_chart(directory: str = "./data"):
     plot_error_comparison(df)
 
 @app.command()
-def plot_error_heatmap_chart(directory: str = "./data"):
+def plot_error_heatmap_chart(
+    directory: str = "./data",
+    workers: int = typer.Option(1, help="Parallele Prozesse für das Zählen (Map-Phase)"),
+    max_files: int = typer.Option(50, help="Nur die Dateien mit den meisten Fehlern zeigen")
+):
     """
     Erstellt eine Heatmap der Fehlerarten über mehrere Logdateien.
+    Gezählt wird per Map-Reduce in eine Sparse-Matrix Datei × Fehlerart; dicht wird nur die Top-Auswahl.
     """
-    df = compare_error_logs(directory)
-    plot_error_heatmap_logs(df)
+    from src.fleet_compare import compare_directory, partial_to_sparse
+
+    matrix = partial_to_sparse(compare_directory(directory, workers=workers))
+    plot_error_heatmap_logs(matrix, max_files=max_files)
 
 
 @app.command()
@@ -542,6 +773,50 @@ def interactive_report():
     typer.echo("✅ Interaktive Reportgenerierung abgeschlossen.")
 
 
+@app.command()
+def analyze_binary(
+    filepath: str = typer.Option(..., help="Firmware-Image (z. B. .bin, wie für EMBA)"),
+    window: int = typer.Option(4096, help="Fenstergröße in Bytes (Vielfaches von --step)"),
+    step: int = typer.Option(1024, help="Schrittweite des gleitenden Fensters in Bytes"),
+    high: float = typer.Option(7.2, help="Ab dieser Entropie (Bit/Byte) gilt ein Bereich als komprimiert/verschlüsselt"),
+    low: float = typer.Option(1.0, help="Bis zu dieser Entropie (Bit/Byte) gilt ein Bereich als Füllbereich"),
+    min_region: int = typer.Option(16 * 1024, help="Kürzere auffällige Bereiche (Bytes) werden nicht gemeldet"),
+    output_dir: str = typer.Option("./charts/binary", help="Zielverzeichnis für das Entropie-Diagramm"),
+    export: Optional[str] = typer.Option(None, help="Auffällige Bereiche exportieren (.csv oder .json)")
+):
+    """Berechnet das Entropie-Profil eines Firmware-Images und markiert komprimierte/verschlüsselte Bereiche."""
+    from src.binary_analysis import analyze_binary_file, describe_region, region_rows
+    from src.visualizer import plot_entropy_profile
+
+    if not os.path.isfile(filepath):
+        print(f"❌ Datei nicht gefunden: {filepath}")
+        raise typer.Exit(code=1)
+    try:
+        profile = analyze_binary_file(filepath, window=window, step=step, high=high, low=low, min_bytes=min_region)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise typer.Exit(code=1)
+
+    print(f"🔬 {filepath}: {profile['size'] / 1024 / 1024:.1f} MB, Gesamtentropie {profile['overall_entropy']:.2f} Bit/Byte "
+          f"({len(profile['entropy'])} Fenster in {profile['seconds']:.2f}s)")
+    if profile["regions"]:
+        for region in profile["regions"]:
+            print(f" - {describe_region(region)}")
+    else:
+        print("✅ Keine auffälligen Bereiche erkannt.")
+    if len(profile["entropy"]):
+        plot_entropy_profile(profile, output_dir)
+
+    if export:
+        rows = region_rows(profile)
+        if export.endswith(".csv"):
+            export_to_csv(rows, export)
+        elif export.endswith(".json"):
+            export_to_json(rows, export)
+        else:
+            print("❌ Nur .csv oder .json unterstützt.")
+
+
 @app.command()
 def analyze_emba(
     filepath: str = typer.Option(..., help="Pfad zur index.html von EMBA"),
@@ -566,17 +841,21 @@ def analyze_emba(
 @app.command()
 def analyze_emba_cves(
     filepath: str = typer.Option(..., help="Pfad zur index.html oder f17_cve_bin_tool.html"),
-    export: Optional[str] = typer.Option(None, help="Exportpfad für CSV"),
+    export: Optional[str] = typer.Option(None, help="Exportpfad (.csv oder .xlsx mit Komponenten- und Zusammenfassungsblatt)"),
     min_cves: int = typer.Option(0, help="Minimale Anzahl CVEs für Filterung"),
-    min_exploits: int = typer.Option(0, help="Minimale Anzahl Exploits für Filterung")
+    min_exploits: int = typer.Option(0, help="Minimale Anzahl Exploits für Filterung"),
+    risk_rules: Optional[str] = typer.Option(None, help="JSON-Datei mit Risikoregeln (Standard: config/risk_rules.json)"),
+    cve_index: Optional[str] = typer.Option(None, help="Offline-CVE-Index (import-cve-feed) zur Anreicherung der Komponenten")
 ):
     """
     Extrahiert Komponenten-CVEs + Zusammenfassung aus EMBA HTML.
     Optional filterbar nach minimaler Anzahl an CVEs und Exploits.
     """
     from src.emba_parser import extract_cves_auto, assign_risk_level, plot_risk_level_distribution
+    from src.risk_rules import load_risk_rules
     from src.file_writer import export_to_csv
 
+    rules = load_risk_rules(risk_rules)
     components_df, summary_df = extract_cves_auto(filepath)
 
     # 🔍 Filter anwenden
@@ -585,18 +864,120 @@ def analyze_emba_cves(
         (components_df["exploits"] >= min_exploits)
     ]
 
-    filtered_df = assign_risk_level(filtered_df)
+    index = None
+    if cve_index:
+        from src.cve_feed import CveFeedIndex
+        index = CveFeedIndex.load(cve_index)
+
+    filtered_df = assign_risk_level(filtered_df, rules, cve_index=index)
     plot_risk_level_distribution(filtered_df)
     #print("\n🔸 Risikostufenverteilung:\n")
 
     print("🔹 Gefilterte Komponenten mit CVEs und Risikostufenverteilung:\n", filtered_df.head())
     #print("\n🔸 CVE-Zusammenfassung:\n", summary_df.to_string(index=False))
 
-    if export:
+    if export and export.endswith(".xlsx"):
+        from src.file_writer import export_to_xlsx
+        export_to_xlsx({"components": filtered_df, "summary": summary_df}, export)
+    elif export:
         export_to_csv(filtered_df, export)
         
 
 
+@app.command()
+def analyze_emba_tree(
+    report_dir: list[str] = typer.Option(..., "--report-dir", "-r", help="EMBA html-report-Verzeichnis (mehrfach angebbar)"),
+    export: Optional[str] = typer.Option(None, help="Exportpfad für die konsolidierte Komponententabelle (CSV)"),
+    workers: int = typer.Option(os.cpu_count() or 1, help="Anzahl paralleler Worker-Prozesse"),
+    cache_dir: str = typer.Option("./.cache/emba", help="Cache-Verzeichnis für geparste Komponententabellen"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Cache weder lesen noch schreiben")
+):
+    """
+    Wertet alle relevanten EMBA-Seiten mehrerer Reportverzeichnisse parallel aus (mit Cache pro Datei-Hash).
+    """
+    from src.emba_batch import analyze_emba_tree as run_tree
+    from src.file_writer import export_to_csv
+
+    missing = [d for d in report_dir if not os.path.isdir(d)]
+    if missing:
+        typer.echo(f"❌ Fehler: Verzeichnis nicht gefunden: {', '.join(missing)}")
+        raise typer.Exit(code=1)
+
+    components_df, stats = run_tree(report_dir, workers=workers, cache_dir=None if no_cache else cache_dir)
+    print(f"🔎 {stats['pages']} Seiten aus {stats['firmware_images']} Firmware-Reports, "
+          f"{stats['cache_hits']} aus dem Cache, {stats['components']} Komponenten.")
+
+    if components_df.empty:
+        print("⚠️ Keine Komponenten mit CVE-Angaben gefunden.")
+        return
+
+    per_firmware = components_df.groupby("firmware").agg(
+        components=("component", "count"), cves=("cves", "sum"), exploits=("exploits", "sum")
+    ).reset_index()
+    print(per_firmware.to_string(index=False))
+
+    if export:
+        export_to_csv(components_df, export)
+
+
+@app.command()
+def import_cve_feed(
+    feed: list[str] = typer.Option(..., "--feed", "-f", help="NVD-JSON-Feed (.json/.json.gz) oder Verzeichnis, mehrfach angebbar"),
+    index: str = typer.Option("./.cache/cve_index.json.gz", help="Zielpfad des Offline-CVE-Index")
+):
+    """
+    Erstellt aus lokal gespiegelten NVD-JSON-Feeds einen kompakten Offline-CVE-Index.
+    """
+    from src.cve_feed import CveFeedIndex
+
+    missing = [path for path in feed if not os.path.exists(path)]
+    if missing:
+        print(f"❌ Datei nicht gefunden: {', '.join(missing)}")
+        raise typer.Exit(code=1)
+
+    cve_index = CveFeedIndex.from_feeds(feed)
+    cve_index.save(index)
+    print(f"✅ CVE-Index gespeichert unter: {index} ({len(cve_index.cves)} CVEs, {len(cve_index.products)} Produkte)")
+
+
+@app.command()
+def diff_emba(
+    old: str = typer.Option(..., help="EMBA-Report (HTML) oder Komponenten-CSV der Vorgängerversion"),
+    new: str = typer.Option(..., help="EMBA-Report (HTML) oder Komponenten-CSV der neuen Version"),
+    export: Optional[str] = typer.Option(None, help="Exportpfad für die Differenztabelle (CSV)"),
+    show_unchanged: bool = typer.Option(False, "--show-unchanged", help="Unveränderte Komponenten mit ausgeben"),
+    risk_rules: Optional[str] = typer.Option(None, help="JSON-Datei mit Risikoregeln (Standard: config/risk_rules.json)")
+):
+    """
+    Vergleicht die Komponenten zweier Firmware-Releases: neu, entfernt, Versionssprünge, CVE-/Exploit- und Risiko-Deltas.
+    """
+    from src.emba_diff import load_emba_components, diff_emba_components, summarize_diff
+    from src.risk_rules import load_risk_rules
+    from src.file_writer import export_to_csv
+
+    for path in [old, new]:
+        if not os.path.exists(path):
+            print(f"❌ Datei nicht gefunden: {path}")
+            raise typer.Exit(code=1)
+
+    diff_df = diff_emba_components(load_emba_components(old), load_emba_components(new), load_risk_rules(risk_rules))
+    summary = summarize_diff(diff_df)
+
+    console = Console()
+    console.print(f"\n🔀 [bold]Firmware-Differenz[/bold]: {os.path.basename(old)} → {os.path.basename(new)}")
+    console.print(f"   neu: {summary['added']}, entfernt: {summary['removed']}, Versionswechsel: {summary['version_changed']}, "
+                  f"geänderte Zahlen: {summary['counts_changed']}, unverändert: {summary['unchanged']}")
+    console.print(f"   Δ CVEs: {summary['cves_delta']:+d}, Δ Exploits: {summary['exploits_delta']:+d}, "
+                  f"geänderte Risikostufen: {summary['risk_changed']}")
+
+    shown = diff_df if show_unchanged else diff_df[diff_df["change"] != "unchanged"]
+    if not shown.empty:
+        print(shown.to_string(index=False))
+
+    if export:
+        export_to_csv(diff_df, export)
+
+
 """
 @app.command()
 def generate_emba_report(
@@ -616,6 +997,8 @@ def generate_emba_report(
 @app.command()
 def generate_emba_report_full(
     filepath: str = typer.Option(..., help="Pfad zur EMBA index.html"),
+    risk_rules: Optional[str] = typer.Option(None, help="JSON-Datei mit Risikoregeln (Standard: config/risk_rules.json)"),
+    max_rows: int = typer.Option(1000, help="Maximale Anzahl einzeln aufgeführter Komponenten (0 = alle)")
 ):
     """
     Erstellt einen vollständigen PDF-Report mit Chart, CVE-Summary und Komponententabelle.
@@ -624,19 +1007,23 @@ def generate_emba_report_full(
     from src.emba_parser import extract_cves_auto, assign_risk_level, plot_top_cve_components, plot_risk_level_distribution
     from src.error_visualizer import export_emba_report_to_pdf
     
+    from src.risk_rules import load_risk_rules
+
     components_df, summary_df = extract_cves_auto(filepath)
-    components_df = assign_risk_level(components_df)
+    components_df = assign_risk_level(components_df, load_risk_rules(risk_rules))
 
     plot_top_cve_components(components_df)
     plot_risk_level_distribution(components_df)
 
     chart_path = "./charts/emba_top_cves.png"
     pdf_path = "./charts/errors/emba_report_full.pdf"
-    export_emba_report_to_pdf(summary_df, chart_path, components_df, pdf_path)
+    export_emba_report_to_pdf(summary_df, chart_path, components_df, pdf_path, max_detail_rows=max_rows or None)
 
 @app.command()
 def zip_emba_report(
-    basepath: str = typer.Option("./charts/errors", help="Verzeichnis mit EMBA-Reportdaten")
+    basepath: str = typer.Option("./charts/errors", help="Verzeichnis mit EMBA-Reportdaten"),
+    compression: str = typer.Option("deflated", help="ZIP-Kompression: stored, deflated, bzip2 oder lzma"),
+    level: int = typer.Option(6, help="Kompressionsstufe (deflated: 0-9, bzip2: 1-9)")
 ):
     """
     Packt PDF, Chart und ggf. CSV-Dateien des EMBA-Reports in ein ZIP.
@@ -649,7 +1036,7 @@ def zip_emba_report(
         "emba_components.csv",
         "emba_components_summary.csv"
     ]
-    export_emba_report_zip(files)
+    export_emba_report_zip(files, compression=compression, compresslevel=level)
 
 
 @app.command()
@@ -686,8 +1073,7 @@ def visualize_structured(filepath: str):
         print(f"❌ Datei nicht gefunden: {filepath}")
         raise typer.Exit()
 
-    with open(filepath, encoding="utf-8") as f:
-        text = f.read()
+    text = _read_log(filepath).decode("utf-8", errors="replace")
 
     df = parse_log_to_dataframe(text, classify=True)
 
@@ -706,11 +1092,14 @@ def visualize_structured(filepath: str):
 
 
 @app.command()
-def compare_custom(directory: str = "./data"):
+def compare_custom(
+    directory: str = "./data",
+    workers: int = typer.Option(1, help="Parallele Prozesse für die Map-Phase (lohnt ab einigen hundert Dateien)")
+):
     """
     Vergleicht benutzerdefinierte Fehlerarten über alle Logdateien im Verzeichnis.
     """
-    df = compare_custom_error_logs(directory)
+    df = compare_custom_error_logs(directory, workers=workers)
     if df.empty:
         print("⚠️ Keine Fehlerdaten erkannt.")
         return
@@ -778,8 +1167,7 @@ def show_log_summary(filepath: str):
         print(f"❌ Datei nicht gefunden: {filepath}")
         raise typer.Exit()
 
-    with open(filepath, encoding="utf-8") as f:
-        text = f.read()
+    text = _read_log(filepath).decode("utf-8", errors="replace")
 
     df = parse_log_to_dataframe(text, classify=False)
 
@@ -817,6 +1205,118 @@ def generate_custom_patterns(
     generate_py_module(patterns, output_file)
 
 
+@app.command()
+def serve(
+    socket_path: str = typer.Option("./.cache/analyzer.sock", "--socket", help="Adresse: Unix-Socket-Pfad oder tcp://127.0.0.1:PORT (nur Loopback)"),
+    workers: int = typer.Option(os.cpu_count() or 1, help="Anzahl vorgewärmter Worker-Prozesse")
+):
+    """
+    Startet den lokalen Analyse-Server (check-firmware-status und analyze mit --server nutzen ihn).
+    Läuft bis Strg+C, SIGTERM oder einer 'shutdown'-Anfrage.
+    """
+    import asyncio
+    from src.analysis_server import run_server
+
+    def ready(server):
+        print(f"🚀 Analyse-Server bereit: {server.address} ({server.workers} Worker)")
+
+    try:
+        asyncio.run(run_server(socket_path, workers, ready=ready))
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise typer.Exit(code=1)
+    print("🛑 Analyse-Server beendet.")
+
+
+# Benchmarks: Historie und Regressionsprüfung
+bench_app = typer.Typer(help="Benchmarks ausführen, speichern und gegen eine Baseline vergleichen.")
+app.add_typer(bench_app, name="bench")
+
+
+@bench_app.command("run")
+def bench_run(
+    size: str = typer.Option("1MB", help="Größe des synthetischen Logs (z. B. 1MB, 1GB)"),
+    repeat: int = typer.Option(5, help="Messwiederholungen pro Benchmark"),
+    only: Optional[list[str]] = typer.Option(None, "--only", help="Nur diesen Benchmark (mehrfach angebbar)"),
+    history: str = typer.Option("./.cache/bench/history.jsonl", help="Historiendatei (JSON Lines)"),
+    output: Optional[str] = typer.Option(None, help="Ergebnisse zusätzlich als JSON-Datei speichern")
+):
+    """Führt die Benchmark-Suite aus und speichert das Ergebnis mit Commit und Host-Fingerprint."""
+    import json
+    from benchmarks.suite import run_suite
+    from benchmarks.history import append_history
+
+    record = append_history(run_suite(size, repeat, only or None), history)
+    for name, result in record["results"].items():
+        print(f"⏱️ {name}: {result['lines_per_s']:,.0f} Zeilen/s, {result['mb_per_s']:.2f} MB/s, "
+              f"Spitzen-RSS {result['peak_rss_mb']} MB")
+        if "frame_memory" in result:
+            memory = result["frame_memory"]
+            print(f"   🧮 DataFrame ({memory['rows']:,} Zeilen): {memory['object_mb']} MB als Objekt-Strings → "
+                  f"{memory['compact_mb']} MB kompakt ({memory['saving']:.0%} weniger)")
+    print(f"💾 Gespeichert in {history} (Commit {record['commit']}, Host {record['host_fingerprint']})")
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+
+
+@bench_app.command("compare")
+def bench_compare(
+    size: str = typer.Option("1MB", help="Größe des synthetischen Logs (muss zur Baseline passen)"),
+    repeat: int = typer.Option(5, help="Messwiederholungen pro Benchmark"),
+    track: Optional[list[str]] = typer.Option(None, "--track", help="Verfolgter Hot Path (mehrfach; Standard: Klassifikation, Parser, EMBA)"),
+    tolerance: float = typer.Option(0.10, help="Erlaubte Verlangsamung (0.10 = 10 %)"),
+    baseline: Optional[str] = typer.Option(None, help="Commit (Präfix) der Baseline; Standard: letzter passender bench run"),
+    history: str = typer.Option("./.cache/bench/history.jsonl", help="Historiendatei (JSON Lines)"),
+    save: bool = typer.Option(False, "--save/--no-save", help="Lauf ohne Regression in der Historie vermerken (nie als Baseline)")
+):
+    """
+    Misst die verfolgten Hot Paths erneut und vergleicht sie mit einer Baseline aus `bench run`.
+    Beendet sich mit Exit-Code 1, wenn ein Benchmark signifikant langsamer als die Toleranz ist
+    oder keine Baseline mit allen verfolgten Benchmarks vorliegt.
+    """
+    from benchmarks.suite import BENCHMARKS, run_suite, host_info
+    from benchmarks.history import (DEFAULT_TRACKED, append_history, compare_reports, find_baseline, git_commit,
+                                    host_fingerprint, load_history)
+
+    tracked = tuple(track) if track else DEFAULT_TRACKED
+    unknown = [name for name in tracked if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unbekannte Benchmarks: {', '.join(unknown)} (verfügbar: {', '.join(BENCHMARKS)})")
+        raise typer.Exit(code=1)
+    fingerprint = host_fingerprint(host_info())
+    base = find_baseline(load_history(history), fingerprint, size, "mixed", baseline, tracked)
+    if base is None:
+        commit_hint = f" für Commit {baseline}" if baseline else ""
+        print(f"❌ Keine Baseline{commit_hint} mit {', '.join(tracked)} auf diesem Host ({fingerprint}) und Größe "
+              f"{size} gefunden – zuerst `bench run --size {size}` ausführen.")
+        raise typer.Exit(code=1)
+
+    current = run_suite(size, repeat, list(tracked))
+    comparison = compare_reports(base, current, tracked, tolerance)
+    table = Table(title=f"Benchmark-Vergleich {base['commit']} → {git_commit()} "
+                        f"(Toleranz {tolerance:.0%}, 95-%-KI)", header_style="bold cyan")
+    for column in ["Benchmark", "Baseline [s]", "Aktuell [s]", "Änderung", "95-%-KI", "Status"]:
+        table.add_column(column, justify="right" if column not in ("Benchmark", "Status") else "left")
+    styles = {"regression": "[bold red]❌ Regression[/]", "improvement": "[green]🚀 schneller[/]", "ok": "✅ ok"}
+    for name, result in comparison.items():
+        table.add_row(
+            name,
+            f"{result['baseline_mean_s']:.4f} ± {result['baseline_ci_s']:.4f}",
+            f"{result['current_mean_s']:.4f} ± {result['current_ci_s']:.4f}",
+            f"{result['change']:+.1%}",
+            f"{result['change_low']:+.1%} … {result['change_high']:+.1%}",
+            styles[result["status"]],
+        )
+    Console().print(table)
+
+    regressions = [name for name, result in comparison.items() if result["status"] == "regression"]
+    if regressions:
+        print(f"❌ Regression über {tolerance:.0%} in: {', '.join(regressions)}")
+        raise typer.Exit(code=1)
+    if save:
+        append_history(current, history, source="compare")
+    print("✅ Keine Regression gegenüber der Baseline.")
 
 
 if __name__ == "__main__":
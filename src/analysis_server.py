@@ -0,0 +1,219 @@
+# src/analysis_server.py – Lokaler Analyse-Server mit warmem Worker-Pool
+#
+# python main.py serve --socket ./.cache/analyzer.sock --workers 4
+# python main.py check-firmware-status --filepath log.txt --server ./.cache/analyzer.sock
+#
+# Protokoll: eine JSON-Zeile pro Anfrage, eine JSON-Zeile als Antwort ({"ok": true, "result": …} bzw.
+# {"ok": false, "error": "…"}). Die Ereignisschleife nimmt nur Verbindungen an und parst JSON; die eigentliche
+# Analyse läuft im ProcessPoolExecutor, dessen Worker Module, Regex und Klassifizierungs-Cache einmal beim Start
+# laden und über Anfragen hinweg behalten. Kennzahlen der Worker werden im Server-Prozess verbucht.
+# Adressen: Pfad → Unix-Socket (Modus 0600), "tcp://127.0.0.1:8765" → TCP. Der Server liest beliebige Pfade und
+# schreibt Exporte mit den eigenen Rechten und hat keine Authentifizierung: TCP bindet daher nur an Loopback.
+
+import os
+import json
+import ipaddress
+import socket
+import signal
+import tempfile
+import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+DEFAULT_ADDRESS = "./.cache/analyzer.sock"
+# Obergrenze für eine Anfragezeile (Pfade und Optionen, keine Logdaten)
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+class ServerError(RuntimeError):
+    """Fehlerantwort des Servers oder keine Verbindung möglich."""
+
+
+def parse_address(address: str) -> tuple[str, object]:
+    """'tcp://host:port' → ('tcp', (host, port)); alles andere ist ein Unix-Socket-Pfad."""
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        return "tcp", (host.strip("[]") or "127.0.0.1", int(port))
+    return "unix", address
+
+
+def check_loopback(host: str) -> None:
+    """ValueError, wenn host nicht ausschließlich auf Loopback-Adressen auflöst (z. B. 0.0.0.0 oder eine LAN-IP)."""
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)}
+    except socket.gaierror as e:
+        raise ValueError(f"Adresse {host} nicht auflösbar: {e}") from e
+    remote = sorted(address for address in addresses if not ipaddress.ip_address(address.split("%")[0]).is_loopback)
+    if remote:
+        raise ValueError(f"Analyse-Server bindet nur an Loopback (127.0.0.1, ::1, localhost), nicht an {host} "
+                         f"({', '.join(remote)}): keine Authentifizierung, Zugriff auf beliebige Pfade")
+
+
+def _warm_worker() -> None:
+    """Initialisiert einen Worker: Importe und Klassifizierungs-Cache einmalig statt pro Anfrage."""
+    import src.analysis_tasks  # noqa: F401  (zieht pandas, Parser und Metriken nach)
+    from src.error_timeparser import build_error_dataframe
+
+    build_error_dataframe(["2025-01-01 00:00:00 [ERROR] warmup"])
+
+
+def _run_task(request: dict) -> dict:
+    """Führt eine Anfrage im Worker aus (muss importierbar bleiben, da per Pickle übertragen)."""
+    from src.analysis_tasks import analyze_task, check_firmware_file
+
+    command = request.get("command")
+    if command == "check-firmware-status":
+        return check_firmware_file(request["filepath"], request.get("full_scan", False))
+    if command == "analyze":
+        return analyze_task(request["dir"], request.get("export"), request.get("format", "csv"),
+                            dedupe=request.get("dedupe", False))
+    raise ValueError(f"Unbekannter Befehl: {command}")
+
+
+def _record_result(command: str, result: dict) -> None:
+    """Verbucht Worker-Kennzahlen in der Registry des Server-Prozesses."""
+    from src.analysis_tasks import record_task_metrics
+    from src.metrics import DEPLOYMENT_DECISIONS
+
+    record_task_metrics(result)
+    if command == "check-firmware-status":
+        DEPLOYMENT_DECISIONS.labels("accepted" if result["status"] else "blocked").value += 1
+
+
+class AnalysisServer:
+    """asyncio-Server; CPU-lastige Aufgaben gehen an einen Prozess-Pool mit vorgewärmten Workern."""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, workers: Optional[int] = None):
+        self.address = address
+        self.workers = workers or os.cpu_count() or 1
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        kind, target = parse_address(self.address)
+        if kind == "tcp":
+            check_loopback(target[0])
+        self._stopped = asyncio.Event()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        if kind == "tcp":
+            self._server = await asyncio.start_server(self._handle, *target, limit=MAX_REQUEST_BYTES)
+        else:
+            self._server = await self._start_unix(target)
+
+    async def _start_unix(self, target: str) -> asyncio.AbstractServer:
+        """
+        Bindet den Socket in einem privaten Verzeichnis (0700), setzt 0600 und benennt ihn erst dann um:
+        zwischen bind und chmod kann sich so niemand sonst verbinden. Ersetzt Überbleibsel abgebrochener Läufe.
+        """
+        parent = os.path.dirname(os.path.abspath(target))
+        os.makedirs(parent, exist_ok=True)
+        private = tempfile.mkdtemp(prefix=".ffa-", dir=parent)
+        staging = os.path.join(private, "sock")
+        try:
+            server = await asyncio.start_unix_server(self._handle, staging, limit=MAX_REQUEST_BYTES)
+            os.chmod(staging, 0o600)  # nur der startende Benutzer darf Anfragen stellen
+            os.replace(staging, target)
+        except BaseException:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            raise
+        finally:
+            os.rmdir(private)
+        return server
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def serve_forever(self) -> None:
+        """Läuft bis stop() (Anfrage 'shutdown', SIGINT oder SIGTERM); räumt Socket und Pool auf."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):  # Windows bzw. nicht im Haupt-Thread
+                pass
+        try:
+            await self._stopped.wait()
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            kind, target = parse_address(self.address)
+            if kind == "unix" and os.path.exists(target):
+                os.unlink(target)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                response = await self._dispatch(line)
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+            command = request.get("command")
+            if command == "ping":
+                return {"ok": True, "result": {"pid": os.getpid(), "workers": self.workers}}
+            if command == "shutdown":
+                self.stop()
+                return {"ok": True, "result": None}
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.pool, functools.partial(_run_task, request))
+            _record_result(command, result)
+            return {"ok": True, "result": result}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+async def run_server(address: str = DEFAULT_ADDRESS, workers: Optional[int] = None, ready=None) -> None:
+    """Startet den Server und blockiert bis zum Herunterfahren; ready() wird nach dem Binden aufgerufen."""
+    server = AnalysisServer(address, workers)
+    await server.start()
+    if ready is not None:
+        ready(server)
+    await server.serve_forever()
+
+
+def send_request(address: str, request: dict, timeout: Optional[float] = None) -> dict:
+    """Schickt eine Anfrage (blockierend) und gibt die rohe Antwort {"ok": …} zurück."""
+    kind, target = parse_address(address)
+    try:
+        with _connect(kind, target, timeout) as sock:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError as e:
+        raise ServerError(f"Analyse-Server nicht erreichbar ({address}): {e}") from e
+    if not line:
+        raise ServerError(f"Analyse-Server hat die Verbindung ohne Antwort geschlossen ({address})")
+    return json.loads(line)
+
+
+def _connect(kind: str, target, timeout: Optional[float]) -> socket.socket:
+    """Verbindung zum Server; TCP über create_connection, damit auch IPv6-Loopback (::1) funktioniert."""
+    if kind == "tcp":
+        return socket.create_connection(target, timeout)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(target)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def submit(address: str, request: dict, timeout: Optional[float] = None) -> dict:
+    """Wie send_request, liefert aber direkt das Ergebnis und wirft ServerError bei Fehlerantworten."""
+    response = send_request(address, request, timeout)
+    if not response.get("ok"):
+        raise ServerError(response.get("error", "unbekannter Fehler"))
+    return response["result"]
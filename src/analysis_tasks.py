@@ -0,0 +1,124 @@
+# src/analysis_tasks.py – Analyseaufgaben für CLI und Analyse-Server (gleiche Logik lokal und im Worker)
+
+import os
+import time
+from typing import Optional
+import numpy as np
+import pandas as pd
+from src.error_timeparser import build_error_dataframe, build_error_dataframe_bytes, line_bounds, split_lines
+from src.file_reader import count_invalid_bytes, iter_text_lines, read_log_bytes
+from src.emba_parser import evaluate_firmware_acceptance, evaluate_firmware_acceptance_stream
+from src.metrics import ERROR_EVENTS, record_file
+from src.event_schema import concat_events, observed_counts
+from src.dedupe import LineDeduplicator
+
+
+def check_firmware_file(filepath: str, full_scan: bool = False) -> dict:
+    """
+    Bewertet eine Logdatei für das Deployment.
+    Standardmäßig gestreamt mit Abbruch, sobald die Entscheidung feststeht (evaluate_firmware_acceptance_stream);
+    full_scan=True liest das ganze Log und nutzt evaluate_firmware_acceptance. Beide lesen tolerant (ungültige
+    UTF-8-Bytes → U+FFFD) und trennen Zeilen wie str.splitlines().
+    Gibt Entscheidung, Begründung sowie Kennzahlen (gelesene Zeilen, tatsächlich von der Platte gelesene Bytes,
+    Dauer, Fehler pro Art) zurück.
+    """
+    started = time.perf_counter()
+    if full_scan:
+        data = read_log_bytes(filepath)
+        lines = data.decode("utf-8", errors="replace").splitlines()
+        df = build_error_dataframe(lines)
+        status, reason = evaluate_firmware_acceptance(df)
+        counts = observed_counts(df["error_type"]).to_dict() if not df.empty else {}
+        line_count, bytes_read, early_exit = len(lines), len(data), False
+    else:
+        with open(filepath, "rb", buffering=0) as f:  # ungepuffert: tell() = Summe der gelesenen Blöcke
+            status, reason, stats = evaluate_firmware_acceptance_stream(iter_text_lines(f))
+            bytes_read = f.tell()
+        counts, line_count, early_exit = stats["error_counts"], stats["lines"], stats["early_exit"]
+    return {
+        "filepath": filepath,
+        "status": bool(status),
+        "reason": reason,
+        "events": int(sum(counts.values())),
+        "early_exit": early_exit,
+        "error_counts": {str(k): int(v) for k, v in counts.items()},
+        "files": [{"bytes": bytes_read, "lines": line_count, "seconds": time.perf_counter() - started}],
+    }
+
+
+def analyze_directory(directory: str, files: Optional[list[str]] = None,
+                      dedupe: bool = False) -> tuple[pd.DataFrame, dict]:
+    """
+    Baut den Fehler-DataFrame aller .txt-Dateien eines Verzeichnisses (Spalte source_file), Dateien nach Namen
+    sortiert; mit files nur diese Dateinamen (z. B. aus einem Shard-Manifest).
+    Dateien werden binär gelesen und auf Bytes ausgewertet; ungültige UTF-8-Bytes zählt die Kennzahl invalid_bytes.
+    dedupe=True übernimmt dateiübergreifend doppelte Ereignisse nur beim ersten Vorkommen (Kennzahl "dedupe").
+    Gibt (DataFrame, Kennzahlen) zurück; der DataFrame ist leer, wenn keine Fehler gefunden wurden.
+    """
+    deduplicator = LineDeduplicator() if dedupe else None
+    frames = []
+    file_stats = []
+    counts = {}
+    if files is None:
+        files = [fname for fname in os.listdir(directory) if fname.endswith(".txt")]
+    for fname in sorted(files):
+        path = os.path.join(directory, fname)
+        started = time.perf_counter()
+        data = read_log_bytes(path)
+        line_count = len(line_bounds(data)[0])
+        content = data if deduplicator is None else b"\n".join(deduplicator.filter(split_lines(data)))
+        error_df = build_error_dataframe_bytes(content)
+        file_stats.append({"bytes": len(data), "lines": line_count, "invalid_bytes": count_invalid_bytes(data),
+                           "seconds": time.perf_counter() - started})
+        if error_df.empty:
+            continue
+        for error_type, count in observed_counts(error_df["error_type"]).items():
+            counts[str(error_type)] = counts.get(str(error_type), 0) + int(count)
+        error_df["source_file"] = pd.Categorical.from_codes(np.zeros(len(error_df), dtype="int8"), categories=[fname])
+        frames.append(error_df)
+
+    result_df = concat_events(frames)
+    stats = {"files": file_stats, "error_counts": counts, "events": len(result_df)}
+    if deduplicator is not None:
+        stats["dedupe"] = deduplicator.stats()
+    return result_df, stats
+
+
+def record_task_metrics(stats: dict) -> None:
+    """Überträgt Datei- und Fehlerkennzahlen eines Aufgabenergebnisses in die Metrik-Registry."""
+    for entry in stats.get("files", []):
+        record_file(entry["bytes"], entry["lines"], entry["seconds"], entry.get("invalid_bytes", 0))
+    ERROR_EVENTS.inc_by_label(stats.get("error_counts", {}))
+
+
+def export_events(result_df: pd.DataFrame, export: str, format: str = "csv") -> bool:
+    """Exportiert den Fehler-DataFrame von analyze im gewünschten Format; False bei unbekanntem Format."""
+    from src.file_writer import export_to_csv, export_to_json, export_to_jsonl, export_to_xlsx
+
+    export_dir = os.path.dirname(export)
+    if export_dir:
+        os.makedirs(export_dir, exist_ok=True)
+    if format == "csv":
+        export_to_csv(result_df, export)
+    elif format == "json":
+        export_to_json(result_df, export)
+    elif format == "jsonl":
+        export_to_jsonl(result_df, export)
+    elif format == "xlsx":
+        per_file = result_df.groupby("source_file", observed=True).size().reset_index(name="errors")
+        export_to_xlsx({"events": result_df, "file_stats": per_file}, export)
+    else:
+        print(f"❌ Unbekanntes Format: {format}")
+        return False
+    print(f"✅ {format.upper()} exportiert: {export}")
+    return True
+
+
+def analyze_task(directory: str, export: str | None = None, format: str = "csv", preview_rows: int = 5,
+                 dedupe: bool = False) -> dict:
+    """analyze als Server-Aufgabe: Export erfolgt im Worker, zurück gehen Kennzahlen und eine Vorschau."""
+    result_df, stats = analyze_directory(directory, dedupe=dedupe)
+    exported = bool(export) and not result_df.empty and export_events(result_df, export, format)
+    stats["preview"] = result_df.head(preview_rows).to_string() if not result_df.empty else ""
+    stats["exported"] = export if exported else None
+    return stats
@@ -0,0 +1,127 @@
+# src/batch_report.py – Fehlerreports für ganze Verzeichnisse (parallel, isoliert pro Datei)
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from src.error_timeparser import build_error_dataframe_bytes, line_bounds
+from src.file_reader import count_invalid_bytes, read_log_bytes
+from src.error_visualizer import (plot_error_timecourse, plot_error_heatmap,
+                                  export_error_report_to_pdf, export_report_as_zip)
+from src.data_analysis import save_dataframe
+from src.metrics import ERROR_EVENTS, record_file
+from src.event_schema import observed_counts
+
+
+def generate_report_for_file(filepath: str, output_dir: str = "./charts", create_zip: bool = False) -> dict:
+    """
+    Erstellt den vollständigen Fehlerreport (Charts, PDF, optional ZIP) für eine Logdatei.
+    Alle Ausgaben landen unter <output_dir>/errors, damit parallele Läufe sich nicht überschreiben.
+    Gibt einen Eintrag für den Summary-Index zurück.
+    """
+    start = time.perf_counter()
+    report_dir = os.path.join(output_dir, "errors")
+    entry = {
+        "filename": os.path.basename(filepath),
+        "status": "ok",
+        "events": 0,
+        "error_types": "",
+        "pdf_path": "",
+        "zip_path": "",
+        "message": "",
+        "duration_s": 0.0,
+        "invalid_bytes": 0,
+    }
+
+    try:
+        # binär lesen: ungültige UTF-8-Bytes (abgeschnittene serielle Logs) brechen den Report nicht ab
+        data = read_log_bytes(filepath)
+        entry["lines"] = len(line_bounds(data)[0])
+        entry["bytes"] = len(data)
+        entry["invalid_bytes"] = count_invalid_bytes(data)
+
+        df = build_error_dataframe_bytes(data)
+        if df.empty or "error_type" not in df.columns:
+            entry["status"] = "empty"
+            entry["message"] = "Keine Fehlerdaten erkannt"
+            return entry
+
+        df = df[df["error_type"] != "info"]
+        entry["events"] = len(df)
+        counts = observed_counts(df["error_type"])
+        entry["error_counts"] = counts.to_dict()
+        entry["error_types"] = ", ".join(f"{k}={v}" for k, v in counts.items())
+
+        plot_error_timecourse(df, output_dir=output_dir)
+        plot_error_heatmap(df, output_dir=output_dir)
+        pdf_path = os.path.join(report_dir, "fehlerreport.pdf")
+        export_error_report_to_pdf(df, output_path=pdf_path)
+        entry["pdf_path"] = pdf_path
+
+        if create_zip:
+            export_report_as_zip(output_dir=report_dir)
+            entry["zip_path"] = os.path.join(report_dir, "error_report_bundle.zip")
+    except Exception as e:
+        entry["status"] = "error"
+        entry["message"] = str(e)
+    finally:
+        entry["duration_s"] = round(time.perf_counter() - start, 3)
+
+    return entry
+
+
+def collect_log_files(directory: str) -> list[str]:
+    """Liefert alle .txt-Dateien eines Verzeichnisses in stabiler Reihenfolge."""
+    return sorted(
+        os.path.join(directory, fname)
+        for fname in os.listdir(directory)
+        if fname.endswith(".txt")
+    )
+
+
+def generate_batch_reports(
+    directory: str,
+    output_root: str = "./charts/batch",
+    workers: int = os.cpu_count() or 1,
+    create_zip: bool = False,
+) -> pd.DataFrame:
+    """
+    Erzeugt für jede Logdatei im Verzeichnis einen eigenen Report unter <output_root>/<dateiname>/.
+    Die Dateien werden in parallelen Worker-Prozessen verarbeitet.
+    Am Ende wird ein Summary-Index (index.csv + index.json) in output_root geschrieben.
+    """
+    files = collect_log_files(directory)
+    os.makedirs(output_root, exist_ok=True)
+
+    def target_dir(path):
+        return os.path.join(output_root, os.path.splitext(os.path.basename(path))[0])
+
+    entries = []
+    if workers <= 1 or len(files) <= 1:
+        for path in files:
+            entries.append(generate_report_for_file(path, target_dir(path), create_zip))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(generate_report_for_file, path, target_dir(path), create_zip): path
+                for path in files
+            }
+            for future in as_completed(futures):
+                entries.append(future.result())
+
+    # Kennzahlen im Elternprozess erfassen (Worker-Prozesse haben eigene Registries)
+    for entry in entries:
+        if "lines" in entry:
+            record_file(entry["bytes"], entry["lines"], entry["duration_s"], entry["invalid_bytes"])
+        ERROR_EVENTS.inc_by_label(entry.get("error_counts", {}))
+
+    index_df = pd.DataFrame(entries, columns=[
+        "filename", "status", "events", "error_types", "pdf_path", "zip_path", "message", "duration_s", "invalid_bytes"
+    ])
+    index_df = index_df.sort_values("filename").reset_index(drop=True)
+
+    if not index_df.empty:
+        save_dataframe(index_df, os.path.join(output_root, "index.csv"))
+        save_dataframe(index_df, os.path.join(output_root, "index.json"))
+
+    return index_df
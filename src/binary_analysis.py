@@ -0,0 +1,174 @@
+# src/binary_analysis.py – Entropie-Profil von Firmware-Images (z. B. die .bin-Dateien für EMBA)
+#
+# Das Image wird per mmap eingeblendet und als np.frombuffer-Sicht ausgewertet, ohne Kopie und ohne Schleife
+# pro Byte: Byte-Histogramme je Block (step Bytes) entstehen mit einem np.bincount pro Abschnitt, Fenster
+# (window Bytes = mehrere Blöcke) als Summe benachbarter Block-Histogramme, die Shannon-Entropie über eine
+# Tabelle -p·log2(p) für alle möglichen Zählwerte. Der Speicherbedarf hängt nur von der Abschnittsgröße ab.
+#
+# Hohe Entropie (nahe 8 Bit/Byte) deutet auf komprimierte oder verschlüsselte Bereiche, sehr niedrige auf
+# Füllbereiche (0x00/0xFF) hin. Beides lässt sich ohne Kenntnis des Formats nur als Hinweis werten.
+
+import os
+import mmap
+import time
+from typing import Optional
+import numpy as np
+from src.profiling import profiled
+
+DEFAULT_WINDOW = 4096
+DEFAULT_STEP = 1024
+HIGH_ENTROPY = 7.2  # Bit/Byte: komprimiert oder verschlüsselt
+LOW_ENTROPY = 1.0   # Bit/Byte: Füllbereich
+MIN_REGION_BYTES = 16 * 1024
+# Fenster pro Abschnitt (Speicherbedarf ~ Blöcke × (step + 256) × 8 Byte)
+CHUNK_BLOCKS = 1024
+
+
+def _entropy_table(window: int) -> np.ndarray:
+    """-p·log2(p) für p = c / window, c = 0 … window (Beitrag eines Bytewerts zur Entropie)."""
+    p = np.arange(window + 1, dtype=np.float64) / window
+    table = np.zeros(window + 1)
+    table[1:] = -p[1:] * np.log2(p[1:])
+    return table
+
+
+def _block_counts(blocks: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """
+    Histogramm (Blöcke × 256) für ein 2D-Array aus Blöcken zu je step Bytes mit einem bincount für alle Blöcke:
+    Byte b in Block i zählt in Fach i·256 + b. index ist ein wiederverwendeter Puffer (mindestens so groß wie blocks).
+    """
+    n = len(blocks)
+    out = index[:n]
+    np.add(blocks, np.arange(n, dtype=np.intp)[:, None] * 256, out=out)
+    return np.bincount(out.ravel(), minlength=n * 256).reshape(n, 256)
+
+
+def _window_counts(counts: np.ndarray, blocks_per_window: int) -> np.ndarray:
+    """Histogramme aller Fenster aus je blocks_per_window aufeinanderfolgenden Block-Histogrammen."""
+    num_windows = len(counts) - blocks_per_window + 1
+    if blocks_per_window <= 16:  # wenige Blöcke pro Fenster: verschobene Summen sind billiger als cumsum
+        windows = counts[:num_windows].copy()
+        for shift in range(1, blocks_per_window):
+            windows += counts[shift:shift + num_windows]
+        return windows
+    cumulative = np.zeros((len(counts) + 1, 256), dtype=np.int64)
+    np.cumsum(counts, axis=0, out=cumulative[1:])
+    return cumulative[blocks_per_window:] - cumulative[:-blocks_per_window]
+
+
+def _check_window(window: int, step: int) -> None:
+    if step <= 0 or window <= 0 or window % step:
+        raise ValueError(f"window ({window}) muss ein positives Vielfaches von step ({step}) sein")
+
+
+def entropy_profile(buf: np.ndarray, window: int = DEFAULT_WINDOW, step: int = DEFAULT_STEP) -> dict:
+    """
+    Shannon-Entropie (Bit/Byte) gleitender Fenster über buf (uint8).
+    Fenster i deckt [i·step, i·step + window) ab; window muss ein Vielfaches von step sein.
+    Ist buf kleiner als ein Fenster, gibt es genau ein Fenster über alle Bytes.
+    """
+    _check_window(window, step)
+    size = len(buf)
+    blocks_per_window = window // step
+    num_blocks = size // step
+    num_windows = num_blocks - blocks_per_window + 1
+    totals = np.zeros(256, dtype=np.int64)
+
+    if size == 0:
+        return {"offsets": np.zeros(0, dtype=np.int64), "entropy": np.zeros(0), "histogram": totals,
+                "window": window, "step": step}
+    if num_windows < 1:
+        totals += np.bincount(buf, minlength=256)
+        return {"offsets": np.zeros(1, dtype=np.int64), "entropy": np.array([_entropy(totals)]),
+                "histogram": totals, "window": size, "step": step}
+
+    blocks = buf[:num_blocks * step].reshape(num_blocks, step)
+    table = _entropy_table(window)
+    entropy = np.empty(num_windows)
+    # Ein Indexpuffer für alle Abschnitte: klein genug für den Cache, keine neuen Seiten pro Abschnitt
+    index = np.empty((min(CHUNK_BLOCKS, num_windows) + blocks_per_window - 1, step), dtype=np.intp)
+    for first in range(0, num_windows, CHUNK_BLOCKS):
+        last = min(first + CHUNK_BLOCKS, num_windows)  # Fenster first … last-1
+        counts = _block_counts(blocks[first:last + blocks_per_window - 1], index)
+        totals += counts[:last - first].sum(axis=0) if last < num_windows else counts.sum(axis=0)
+        entropy[first:last] = table[_window_counts(counts, blocks_per_window)].sum(axis=1)
+    totals += np.bincount(buf[num_blocks * step:], minlength=256)
+    return {"offsets": np.arange(num_windows, dtype=np.int64) * step, "entropy": entropy, "histogram": totals,
+            "window": window, "step": step}
+
+
+def _entropy(counts: np.ndarray) -> float:
+    total = counts.sum()
+    if not total:
+        return 0.0
+    p = counts[counts > 0] / total
+    return float(-(p * np.log2(p)).sum())
+
+
+def find_regions(profile: dict, high: float = HIGH_ENTROPY, low: float = LOW_ENTROPY,
+                 min_bytes: int = MIN_REGION_BYTES) -> list[dict]:
+    """
+    Zusammenhängende Fenster über high (kind "high": komprimiert/verschlüsselt) bzw. unter low
+    (kind "low": Füllbereich) als Bereiche [start, end) mit mittlerer Entropie; kürzere als min_bytes entfallen.
+    """
+    entropy, offsets = profile["entropy"], profile["offsets"]
+    regions = []
+    for kind, mask in (("high", entropy >= high), ("low", entropy <= low)):
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+        for first, last in zip(edges[::2], edges[1::2]):  # Fenster first … last-1
+            start, end = int(offsets[first]), int(offsets[last - 1]) + profile["window"]
+            if end - start >= min_bytes:
+                regions.append({"kind": kind, "start": start, "end": end, "bytes": end - start,
+                                "mean_entropy": round(float(entropy[first:last].mean()), 3)})
+    return sorted(regions, key=lambda region: region["start"])
+
+
+@profiled("parse")
+def analyze_binary_file(path: str, window: int = DEFAULT_WINDOW, step: int = DEFAULT_STEP,
+                        high: float = HIGH_ENTROPY, low: float = LOW_ENTROPY,
+                        min_bytes: int = MIN_REGION_BYTES) -> dict:
+    """Entropie-Profil und auffällige Bereiche eines Images (per mmap gelesen, nicht in den Speicher kopiert)."""
+    _check_window(window, step)  # vor dem mmap: eine Ausnahme mit Sicht auf das mmap verhindert dessen Schließen
+    started = time.perf_counter()
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if size == 0:
+            profile = entropy_profile(np.zeros(0, dtype=np.uint8), window, step)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                buf = np.frombuffer(mapped, dtype=np.uint8)
+                try:
+                    profile = entropy_profile(buf, window, step)
+                finally:
+                    del buf  # Sicht freigeben, sonst lässt sich das mmap nicht schließen
+    profile.update({
+        "path": path,
+        "size": size,
+        "overall_entropy": _entropy(profile["histogram"]),
+        "regions": find_regions(profile, high, low, min_bytes),
+        "thresholds": {"high": high, "low": low},
+        "seconds": time.perf_counter() - started,
+    })
+    return profile
+
+
+def region_rows(profile: dict) -> list[dict]:
+    """Bereiche für Export/Ausgabe mit hexadezimalen Offsets."""
+    return [{"kind": region["kind"], "start": f"0x{region['start']:08x}", "end": f"0x{region['end']:08x}",
+             "bytes": region["bytes"], "mean_entropy": region["mean_entropy"]}
+            for region in profile["regions"]]
+
+
+def describe_region(region: dict) -> str:
+    label = "komprimiert/verschlüsselt" if region["kind"] == "high" else "Füllbereich"
+    return (f"0x{region['start']:08x}–0x{region['end']:08x} ({region['bytes'] / 1024:.0f} KB, "
+            f"Ø {region['mean_entropy']:.2f} Bit/Byte): {label}")
+
+
+def synthetic_image(size: int, seed: Optional[int] = 0) -> bytes:
+    """Testimage: Füllbereich, Text/Code-ähnlicher Bereich und Zufallsbytes (wie komprimierte Daten) je ein Drittel."""
+    rng = np.random.default_rng(seed)
+    third = size // 3
+    text = np.frombuffer(b"firmware init ok; sensor loop; " * (third // 31 + 1), dtype=np.uint8)[:third]
+    random = rng.integers(0, 256, size - 2 * third, dtype=np.uint8)
+    return bytes(third) + text.tobytes() + random.tobytes()
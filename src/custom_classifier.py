@@ -1,6 +1,7 @@
 # custom_classifier.py – dynamische Fehlerklassifikation mit Regex
 
 import re
+from src.metrics import CLASSIFICATION_CACHE_HITS, CLASSIFICATION_CACHE_MISSES
 
 # Basis-CUSTOM_PATTERNS – manuell gepflegt oder Standard
 CUSTOM_PATTERNS = {
@@ -19,15 +20,36 @@ try:
 except ImportError:
     print("⚠️ Keine automatisch generierten CUSTOM_PATTERNS gefunden.")
 
+# Ergebnis-Cache: identische Meldungen werden nur einmal gegen alle Muster geprüft
+_CLASSIFICATION_CACHE: dict[str, str] = {}
+CLASSIFICATION_CACHE_MAX = 100_000
+
+
+def _match_custom_pattern(message: str) -> str | None:
+    for label, pattern in CUSTOM_PATTERNS.items():
+        if re.search(pattern, message, re.IGNORECASE):
+            return label
+    return None
+
+
 def classify_custom_error(message: str) -> str:
     """
     Klassifiziert eine Fehlermeldung anhand definierter Regex-Muster.
     Gibt den Klassennamen zurück oder 'generic_error'.
     """
-    for label, pattern in CUSTOM_PATTERNS.items():
-        if re.search(pattern, message, re.IGNORECASE):
-            print(f"{message} → {label}")
-            return label
+    label = _CLASSIFICATION_CACHE.get(message)
+    if label is None:
+        CLASSIFICATION_CACHE_MISSES.value += 1
+        label = _match_custom_pattern(message) or ""
+        if len(_CLASSIFICATION_CACHE) >= CLASSIFICATION_CACHE_MAX:
+            _CLASSIFICATION_CACHE.clear()
+        _CLASSIFICATION_CACHE[message] = label
+    else:
+        CLASSIFICATION_CACHE_HITS.value += 1
+
+    if label:
+        print(f"{message} → {label}")
+        return label
     return "generic_error"
 
 """
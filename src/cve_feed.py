@@ -0,0 +1,209 @@
+# src/cve_feed.py – Offline-CVE-Index aus lokal gespiegelten NVD-JSON-Feeds
+
+import os
+import re
+import gzip
+import json
+import glob
+import pandas as pd
+
+INDEX_FORMAT_VERSION = 1
+DEFAULT_INDEX_PATH = "./.cache/cve_index.json.gz"
+SEVERITY_ORDER = {"": 0, "LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+VERSION_TOKEN_PATTERN = re.compile(r"\d+|[a-z]+")
+
+
+def normalize_product(name: str) -> str:
+    """Vereinheitlicht Produktnamen aus CPE und EMBA (z. B. 'Dropbear-SSH' → 'dropbear_ssh')."""
+    return re.sub(r"[\s\-]+", "_", str(name).strip().lower())
+
+
+def version_key(version: str) -> tuple:
+    """
+    Zerlegt eine Versionsangabe in vergleichbare Token (Zahlen numerisch, Buchstaben lexikalisch).
+    Abschließende Nullen werden entfernt, damit '4.14' und '4.14.0' gleich sind.
+    """
+    tokens = [(1, int(t), "") if t.isdigit() else (0, 0, t) for t in VERSION_TOKEN_PATTERN.findall(str(version).lower())]
+    while tokens and tokens[-1] == (1, 0, ""):
+        tokens.pop()
+    return tuple(tokens)
+
+
+def _open_feed(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _iter_cpe_matches_v11(nodes: list):
+    for node in nodes:
+        yield from node.get("cpe_match", [])
+        yield from _iter_cpe_matches_v11(node.get("children", []))
+
+
+def _parse_feed_v11(data: dict):
+    """NVD-JSON-Feed 1.1 (nvdcve-1.1-<jahr>.json)."""
+    for item in data.get("CVE_Items", []):
+        cve_id = item["cve"]["CVE_data_meta"]["ID"]
+        impact = item.get("impact", {})
+        if "baseMetricV3" in impact:
+            cvss = impact["baseMetricV3"]["cvssV3"]
+            score, severity = cvss.get("baseScore"), cvss.get("baseSeverity", "")
+        elif "baseMetricV2" in impact:
+            score = impact["baseMetricV2"]["cvssV2"].get("baseScore")
+            severity = impact["baseMetricV2"].get("severity", "")
+        else:
+            score, severity = None, ""
+        matches = []
+        for match in _iter_cpe_matches_v11(item.get("configurations", {}).get("nodes", [])):
+            matches.append((match.get("vulnerable", True), match.get("cpe23Uri", ""), match))
+        yield cve_id, score, severity, matches
+
+
+def _parse_feed_v20(data: dict):
+    """NVD-API 2.0 (Feld 'vulnerabilities')."""
+    for entry in data.get("vulnerabilities", []):
+        cve = entry["cve"]
+        metrics = cve.get("metrics", {})
+        score, severity = None, ""
+        for key in ("cvssMetricV31", "cvssMetricV30", "cvssMetricV2"):
+            if metrics.get(key):
+                metric = metrics[key][0]
+                score = metric["cvssData"].get("baseScore")
+                severity = metric["cvssData"].get("baseSeverity", metric.get("baseSeverity", ""))
+                break
+        matches = []
+        for config in cve.get("configurations", []):
+            for node in config.get("nodes", []):
+                for match in node.get("cpeMatch", []):
+                    matches.append((match.get("vulnerable", True), match.get("criteria", ""), match))
+        yield cve["id"], score, severity, matches
+
+
+class CveFeedIndex:
+    """
+    Kompakter Index: CVE-Tabelle + Liste betroffener Versionsbereiche je normalisiertem Produktnamen.
+    Ein Bereichseintrag ist [cve_nr, exakte_version, start, start_inkl, ende, ende_inkl].
+    """
+
+    def __init__(self, cves: list, products: dict):
+        self.cves = cves
+        self.products = products
+        self._parsed = {}
+        self._lookup_cache = {}
+
+    @classmethod
+    def from_feeds(cls, feed_paths: list[str]) -> "CveFeedIndex":
+        """Importiert NVD-Feeds (.json/.json.gz, Dateien oder Verzeichnisse) in einen neuen Index."""
+        files = []
+        for path in feed_paths:
+            if os.path.isdir(path):
+                files += sorted(glob.glob(os.path.join(path, "*.json")) + glob.glob(os.path.join(path, "*.json.gz")))
+            else:
+                files.append(path)
+
+        cves, products, seen = [], {}, {}
+        for path in files:
+            with _open_feed(path) as f:
+                data = json.load(f)
+            parser = _parse_feed_v20 if "vulnerabilities" in data else _parse_feed_v11
+            for cve_id, score, severity, matches in parser(data):
+                if cve_id in seen:
+                    continue
+                cve_nr = seen[cve_id] = len(cves)
+                cves.append([cve_id, score, (severity or "").upper()])
+                for vulnerable, cpe, match in matches:
+                    parts = cpe.split(":")
+                    if not vulnerable or len(parts) < 6:
+                        continue
+                    exact = parts[5] if parts[5] not in ("*", "-", "") else None
+                    products.setdefault(normalize_product(parts[4]), []).append([
+                        cve_nr, exact,
+                        match.get("versionStartIncluding", match.get("versionStartExcluding")),
+                        "versionStartIncluding" in match,
+                        match.get("versionEndIncluding", match.get("versionEndExcluding")),
+                        "versionEndIncluding" in match,
+                    ])
+        return cls(cves, products)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> "CveFeedIndex":
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Datei nicht gefunden: {path}")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unbekanntes Indexformat in {path} – bitte mit import-cve-feed neu erzeugen.")
+        return cls(data["cves"], data["products"])
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """Schreibt den Index als gzip-komprimiertes JSON (atomar)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({"format": INDEX_FORMAT_VERSION, "cves": self.cves, "products": self.products},
+                      f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def _ranges(self, product: str) -> list:
+        """Bereichseinträge eines Produkts mit vorab zerlegten Versionen (lazy, einmal pro Produkt)."""
+        if product not in self._parsed:
+            self._parsed[product] = [
+                (cve_nr,
+                 version_key(exact) if exact else None,
+                 version_key(start) if start else None, start_incl,
+                 version_key(end) if end else None, end_incl)
+                for cve_nr, exact, start, start_incl, end, end_incl in self.products.get(product, [])
+            ]
+        return self._parsed[product]
+
+    def lookup(self, product: str, version: str) -> list[tuple]:
+        """Liefert (cve_id, cvss_score, severity) aller CVEs, die die Produktversion betreffen."""
+        cache_key = (product, version)
+        if cache_key in self._lookup_cache:
+            return self._lookup_cache[cache_key]
+
+        key = version_key(version) if version and str(version) != "nan" else None
+        hits = set()
+        for cve_nr, exact, start, start_incl, end, end_incl in self._ranges(normalize_product(product)):
+            if exact is not None:
+                if exact == key:
+                    hits.add(cve_nr)
+                continue
+            if key is None:
+                if start is None and end is None:
+                    hits.add(cve_nr)
+                continue
+            if start is not None and (key < start or (key == start and not start_incl)):
+                continue
+            if end is not None and (key > end or (key == end and not end_incl)):
+                continue
+            hits.add(cve_nr)
+
+        result = [tuple(self.cves[nr]) for nr in sorted(hits)]
+        self._lookup_cache[cache_key] = result
+        return result
+
+
+def enrich_components(df: pd.DataFrame, index: CveFeedIndex, max_ids: int = 20) -> pd.DataFrame:
+    """
+    Ergänzt Komponenten um Daten aus dem Offline-Feed: feed_cves, max_cvss, feed_severity, cve_ids.
+    Jede (Komponente, Version)-Kombination wird nur einmal nachgeschlagen.
+    """
+    df = df.copy()
+    pairs = list(zip(df["component"].astype(str), df["version"].astype(str)))
+    results = {pair: index.lookup(*pair) for pair in set(pairs)}
+
+    def summarize(hits):
+        scores = [score for _, score, _ in hits if score is not None]
+        severity = max((sev for _, _, sev in hits), key=lambda s: SEVERITY_ORDER.get(s, 0), default="")
+        return (len(hits), max(scores) if scores else 0.0, severity,
+                ", ".join(cve_id for cve_id, _, _ in hits[:max_ids]))
+
+    summaries = {pair: summarize(hits) for pair, hits in results.items()}
+    rows = [summaries[pair] for pair in pairs]
+    df["feed_cves"] = [row[0] for row in rows]
+    df["max_cvss"] = [row[1] for row in rows]
+    df["feed_severity"] = [row[2] for row in rows]
+    df["cve_ids"] = [row[3] for row in rows]
+    return df
@@ -2,10 +2,15 @@
 
 import pandas as pd
 import re
-from datetime import datetime
+from typing import Optional
 from src.custom_classifier import classify_custom_error
+from src.profiling import profiled
+from src.event_buffer import EventBuffer, epoch_seconds
+from src.file_writer import (stream_dataframe_to_csv, stream_dataframe_to_json, stream_dataframe_to_jsonl,
+                             stream_tables_to_xlsx)
 
 
+@profiled("pandas")
 def build_enhanced_dataframe(data):
     """Erstellt einen erweiterten DataFrame mit zusätzlichen Kennzahlen."""
     df = pd.DataFrame(data)
@@ -24,14 +29,23 @@ def build_enhanced_dataframe(data):
 
     return df
 
+@profiled("export")
 def save_dataframe(df, output_path):
-    """Speichert den DataFrame als CSV oder JSON."""
-    if output_path.endswith(".csv"):
-        df.to_csv(output_path, index=False)
-    elif output_path.endswith(".json"):
-        df.to_json(output_path, orient="records", indent=2)
+    """
+    Speichert den DataFrame blockweise als CSV, JSON oder JSON Lines (jeweils optional mit .gz) oder XLSX.
+    In JSON/JSON Lines bleiben Zeitstempel Epoch-Millisekunden wie beim früheren df.to_json.
+    """
+    base_path = output_path[:-3] if output_path.endswith(".gz") else output_path
+    if base_path.endswith(".csv"):
+        stream_dataframe_to_csv(df, output_path)
+    elif base_path.endswith(".jsonl"):
+        stream_dataframe_to_jsonl(df, output_path, dates="epoch_ms")
+    elif base_path.endswith(".json"):
+        stream_dataframe_to_json(df, output_path, dates="epoch_ms")
+    elif output_path.endswith(".xlsx"):
+        stream_tables_to_xlsx({"data": df}, output_path)
     else:
-        raise ValueError("Nur .csv oder .json Formate sind erlaubt.")
+        raise ValueError("Nur .csv, .json, .jsonl oder .xlsx Formate sind erlaubt.")
 
     print(f"✅ Exportiert: {output_path}")
    
@@ -98,49 +112,71 @@ def detect_voltage_warnings(text):
     return {"low_voltage_warning": low_voltage_count}
 
 
+LOG_LINE_PATTERN = re.compile(
+    r"\[?(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]?\s+(?P<level>\w+)\s+(?P<message>.+)"
+)
+
+LOG_ERROR_PATTERNS = {
+    "sensor_error": re.compile(r"sensor (array failure|timeout|error|disconnected)"),
+    "voltage_warning": re.compile(r"voltage (fluctuation|drop|issue)"),
+    "communication_error": re.compile(r"(communication link failure|disconnect|link error)"),
+    "firmware_issue": re.compile(r"firmware (update failed|error)"),
+    "collision_error": re.compile(r"(obstacle detected|collision detected)"),
+}
+
+
+def parse_log_events(lines, classify: bool = True, events: Optional[EventBuffer] = None) -> EventBuffer:
+    """
+    Hängt Logzeilen als Ereignisse (timestamp, level, message, error_type) an einen EventBuffer an
+    (neu angelegt, falls keiner übergeben wird). Zeilen ohne gültigen Zeitstempel werden übersprungen;
+    ohne classify bleibt error_type leer.
+    """
+    if events is None:
+        events = EventBuffer(levels=True, messages=True)
+    for line in lines:
+        match = LOG_LINE_PATTERN.search(line.strip())
+        if not match:
+            continue
+        timestamp, level, message = match.group("timestamp", "level", "message")
+        epoch = epoch_seconds(timestamp)
+        if epoch is None:
+            continue
+        error_type = ""
+        if classify:
+            msg = message.lower()
+            for candidate, regex in LOG_ERROR_PATTERNS.items():
+                if regex.search(msg):
+                    error_type = candidate
+                    break
+            else:
+                error_type = classify_custom_error(message)
+        events.append(epoch, error_type, level, message)
+    return events
+
+
+def suggest_classes(messages: pd.Series, top: int = 10) -> pd.Series:
+    """Häufigste Nachrichtenanfänge (nur Buchstaben, Leerzeichen, Bindestriche) als Kandidaten für neue Fehlerklassen."""
+    return messages.str.lower().str.extract(r"([a-z\- ]+)")[0].value_counts().head(top)
+
+
+@profiled("parse")
 def parse_log_to_dataframe(text, classify: bool = True):
     """
     Extrahiert Logzeilen in strukturierter Form (timestamp, level, message)
     und gibt einen DataFrame zurück.
     """
-
-    pattern = re.compile(
-        r"\[?(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]?\s+(?P<level>\w+)\s+(?P<message>.+)"
-    )
-
-    
-    records = []
-    error_patterns = {
-        "sensor_error": r"sensor (array failure|timeout|error|disconnected)",
-        "voltage_warning": r"voltage (fluctuation|drop|issue)",
-        "communication_error": r"(communication link failure|disconnect|link error)",
-        "firmware_issue": r"firmware (update failed|error)",
-        "collision_error": r"(obstacle detected|collision detected)"
-    } if classify else {}
-    for line in text.splitlines():
-        line = line.strip()
-        match = pattern.search(line)
-        if match:
-            data = match.groupdict()
-            try:
-                data["timestamp"] = datetime.strptime(data["timestamp"], "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                continue
-            if classify:
-                msg = data["message"].lower()
-                for error_type, regex in error_patterns.items():
-                    if re.search(regex, msg):
-                        data["error_type"] = error_type
-                        break
-                else:
-                    data["error_type"] = classify_custom_error(data["message"])
-            records.append(data)
-    df = pd.DataFrame(records)
+    events = parse_log_events(text.splitlines(), classify)
+    if not len(events):
+        df = pd.DataFrame()
+    else:
+        df = events.to_frame()
+        if not classify:
+            df = df.drop(columns="error_type")
 
     # Wenn keine Klassifikation: typische Phrasen auswerten
     if not classify and not df.empty:
         df["message_key"] = df["message"].str.lower().str.extract(r"([a-z\- ]+)")
-        top_phrases = df["message_key"].value_counts().head(10)
+        top_phrases = suggest_classes(df["message"])
         print("\n🔍 Häufigste Nachrichtentypen (Top 10):")
         print(top_phrases)
         df.attrs["suggested_classes"] = top_phrases
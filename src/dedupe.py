@@ -0,0 +1,201 @@
+# src/dedupe.py – Doppelte Logzeilen über Dateigrenzen hinweg erkennen
+#
+# Sammler liefern oft überlappende Logabschnitte (vgl. data/log_alpha.txt, log_beta.txt, log_gamma.txt):
+# Ohne Deduplizierung werden dieselben Fehler mehrfach gezählt. Schlüssel einer Zeile ist ein 64-Bit-Hash
+# (blake2b) aus Zeitstempel und normalisierter Zeile – "[2025-04-27 08:36:00] X" und "2025-04-27 08:36:00  X"
+# gelten als dasselbe Ereignis. Zeilen ohne Zeitstempel werden nie als Duplikat verworfen.
+#
+# Bis max_exact Schlüssel liegen die Hashes in einem Python-Set (exakt, ~70 Byte pro Zeile); danach wechselt
+# LineDeduplicator auf einen Bloom-Filter fester Größe. Der kann Zeilen fälschlich als bereits gesehen melden
+# (nie umgekehrt); die geschätzte Falsch-Positiv-Rate steht in stats(). Im Bloom-Modus prüft filter() die Zeilen
+# blockweise (FILTER_BATCH) mit numpy statt Schlüssel für Schlüssel.
+
+import re
+import math
+import hashlib
+import itertools
+from typing import Iterable, Iterator, Optional, Union
+import numpy as np
+from src.event_buffer import TIMESTAMP_RE
+
+DEFAULT_MAX_EXACT = 500_000
+DEFAULT_BLOOM_CAPACITY = 10_000_000
+DEFAULT_FP_RATE = 1e-4
+# Zeilen je numpy-Block im Bloom-Modus von LineDeduplicator.filter()
+FILTER_BATCH = 65_536
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def line_key(line: Union[str, bytes]) -> Optional[int]:
+    """64-Bit-Schlüssel aus (Zeitstempel, normalisierte Zeile); None für Zeilen ohne Zeitstempel."""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    match = TIMESTAMP_RE.search(line)
+    if not match:
+        return None
+    rest = (line[:match.start()].rstrip().rstrip("[") + " " + line[match.end():].lstrip().lstrip("]")).strip()
+    normalized = _WHITESPACE_RE.sub(" ", rest)
+    data = f"{match.group(1)} {match.group(2)}:{match.group(3)}:{match.group(4)}\x00{normalized}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class BloomFilter:
+    """
+    Bitfeld mit k Hashpositionen je Schlüssel (Doppel-Hashing aus den beiden 32-Bit-Hälften).
+    Einzelne Schlüssel arbeiten auf dem bytearray (keine numpy-Skalare), add_many auf einer numpy-Sicht darauf.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BLOOM_CAPACITY, fp_rate: float = DEFAULT_FP_RATE):
+        self.capacity = max(int(capacity), 1)
+        self.size = max(int(math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2)), 64)
+        self.hashes = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self._array = np.frombuffer(self.bits, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, key: int) -> Iterator[int]:
+        size = self.size
+        pos, step = (key & 0xFFFFFFFF) % size, ((key >> 32) | 1) % size
+        for _ in range(self.hashes):
+            yield pos
+            pos += step
+            if pos >= size:
+                pos -= size
+
+    def __contains__(self, key: int) -> bool:
+        bits = self.bits
+        for pos in self._positions(key):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add(self, key: int) -> bool:
+        """Fügt key hinzu; True, wenn key (vermutlich) schon enthalten war."""
+        bits = self.bits
+        present = True
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                present = False
+                bits[pos >> 3] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def add_many(self, keys: np.ndarray) -> np.ndarray:
+        """
+        add() für ein uint64-Array; liefert je Schlüssel, ob er (vermutlich) schon enthalten war.
+        Innerhalb des Blocks gilt nur derselbe Schlüssel als Duplikat, Bitüberschneidungen verschiedener neuer
+        Schlüssel nicht – das senkt die Falsch-Positiv-Rate leicht, falsch-negative Ergebnisse gibt es weiterhin nicht.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        size = np.uint64(self.size)
+        low = (keys & np.uint64(0xFFFFFFFF)) % size
+        step = ((keys >> np.uint64(32)) | np.uint64(1)) % size
+        positions = (low[:, None] + np.arange(self.hashes, dtype=np.uint64)[None, :] * step[:, None]) % size
+        byte = (positions >> np.uint64(3)).astype(np.intp)
+        mask = np.left_shift(1, (positions & np.uint64(7)).astype(np.uint8)).astype(np.uint8)
+        present = (self._array[byte] & mask).all(axis=1)
+        _, first = np.unique(keys, return_index=True)
+        repeated = np.ones(len(keys), dtype=bool)
+        repeated[first] = False
+        present |= repeated
+        np.bitwise_or.at(self._array, byte[~present].ravel(), mask[~present].ravel())
+        self.count += int((~present).sum())
+        return present
+
+    def false_positive_rate(self) -> float:
+        """Geschätzte Falsch-Positiv-Rate beim aktuellen Füllstand: (1 - e^(-k·n/m))^k."""
+        return (1.0 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+
+class LineDeduplicator:
+    """
+    Merkt sich gesehene Zeilen über mehrere Dateien hinweg (eine Instanz pro Lauf).
+    Speicherbegrenzt: exaktes Set bis max_exact Schlüssel, danach Bloom-Filter (bloom_capacity, fp_rate).
+    """
+
+    def __init__(self, max_exact: int = DEFAULT_MAX_EXACT, bloom_capacity: int = DEFAULT_BLOOM_CAPACITY,
+                 fp_rate: float = DEFAULT_FP_RATE):
+        self.max_exact = max_exact
+        self.bloom_capacity = bloom_capacity
+        self.fp_rate = fp_rate
+        self._exact: Optional[set[int]] = set()
+        self._bloom: Optional[BloomFilter] = None
+        self.lines = 0
+        self.duplicates = 0
+
+    def is_duplicate(self, line: Union[str, bytes]) -> bool:
+        """True, wenn das Ereignis schon gesehen wurde; sonst wird es vermerkt."""
+        self.lines += 1
+        key = line_key(line)
+        if key is None:
+            return False
+        if self._bloom is not None:
+            duplicate = self._bloom.add(key)
+        else:
+            duplicate = key in self._exact
+            if not duplicate:
+                self._exact.add(key)
+                if len(self._exact) > self.max_exact:
+                    self._switch_to_bloom()
+        if duplicate:
+            self.duplicates += 1
+        return duplicate
+
+    def _switch_to_bloom(self) -> None:
+        self._bloom = BloomFilter(max(self.bloom_capacity, 2 * len(self._exact)), self.fp_rate)
+        for key in self._exact:
+            self._bloom.add(key)
+        self._exact = None
+
+    def filter(self, lines: Iterable[str]) -> Iterator[str]:
+        """Nur noch nicht gesehene Zeilen (Zeilen ohne Zeitstempel immer)."""
+        lines = iter(lines)
+        while self._bloom is None:
+            line = next(lines, None)
+            if line is None:
+                return
+            if not self.is_duplicate(line):
+                yield line
+        while batch := list(itertools.islice(lines, FILTER_BATCH)):
+            yield from self._filter_bloom(batch)
+
+    def _filter_bloom(self, batch: list) -> list:
+        """filter() für einen Block im Bloom-Modus: Schlüssel einzeln, Bitprüfung gemeinsam per add_many."""
+        keys = [line_key(line) for line in batch]
+        timed = [i for i, key in enumerate(keys) if key is not None]
+        duplicate = np.zeros(len(batch), dtype=bool)
+        if timed:
+            duplicate[timed] = self._bloom.add_many(np.array([keys[i] for i in timed], dtype=np.uint64))
+        self.lines += len(batch)
+        self.duplicates += int(duplicate.sum())
+        return [line for line, dup in zip(batch, duplicate.tolist()) if not dup]
+
+    def filter_text(self, text: str) -> str:
+        """filter() für einen ganzen Dateiinhalt; Zeilenenden bleiben erhalten."""
+        return "".join(self.filter(text.splitlines(keepends=True)))
+
+    def stats(self) -> dict:
+        if self._bloom is not None:
+            return {"lines": self.lines, "duplicates": self.duplicates, "mode": "bloom",
+                    "false_positive_rate": self._bloom.false_positive_rate(), "memory_bytes": self._bloom.nbytes}
+        return {"lines": self.lines, "duplicates": self.duplicates, "mode": "exact",
+                "false_positive_rate": 0.0, "keys": len(self._exact)}
+
+    def summary(self) -> str:
+        return describe_stats(self.stats())
+
+
+def describe_stats(stats: dict) -> str:
+    """Einzeilige Zusammenfassung von LineDeduplicator.stats() für die CLI."""
+    text = f"🧹 Duplikate entfernt: {stats['duplicates']} von {stats['lines']} Zeilen"
+    if stats["mode"] == "bloom":
+        text += (f" (Bloom-Filter {stats['memory_bytes'] / 1024 / 1024:.1f} MB, geschätzte Falsch-Positiv-Rate "
+                 f"{stats['false_positive_rate']:.2e})")
+    return text
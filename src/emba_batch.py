@@ -0,0 +1,118 @@
+# src/emba_batch.py – Batch-Auswertung kompletter EMBA html-report-Verzeichnisse mit Parse-Cache
+
+import os
+import fnmatch
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from src.emba_parser import PARSER_VERSION, extract_cves_streaming
+
+# EMBA-Modulseiten, die Komponenten- bzw. CVE-Zusammenfassungen enthalten
+DEFAULT_PAGE_PATTERNS = ("f17_*.html", "f20_*.html", "index.html")
+DEFAULT_CACHE_DIR = "./.cache/emba"
+COMPONENT_COLUMNS = ["firmware", "page", "component", "version", "cves", "exploits"]
+
+
+def discover_emba_pages(report_dirs: list[str], patterns: tuple = DEFAULT_PAGE_PATTERNS) -> list[tuple[str, str]]:
+    """
+    Sucht alle relevanten HTML-Seiten unterhalb der angegebenen EMBA-Reportverzeichnisse.
+    Gibt (firmware_name, pfad) zurück; der Firmware-Name ist der Name des Reportverzeichnisses.
+    """
+    pages = []
+    for report_dir in report_dirs:
+        firmware = firmware_name_for(report_dir)
+        for root, _, filenames in os.walk(report_dir):
+            for filename in sorted(filenames):
+                if any(fnmatch.fnmatch(filename, pattern) for pattern in patterns):
+                    pages.append((firmware, os.path.join(root, filename)))
+    return sorted(pages)
+
+
+def firmware_name_for(report_dir: str) -> str:
+    """Leitet den Firmware-Namen aus dem Reportpfad ab (…/<firmware>/html-report → <firmware>)."""
+    path = os.path.normpath(os.path.abspath(report_dir))
+    name = os.path.basename(path)
+    if name == "html-report":
+        name = os.path.basename(os.path.dirname(path))
+    return name
+
+
+def file_hash(path: str, chunk_size: int = 1024 * 1024, version: int = PARSER_VERSION) -> str:
+    """SHA-256 aus Parser-Version und Dateiinhalt (Cache-Schlüssel: ein Parser-Update verwirft alte Einträge)."""
+    digest = hashlib.sha256(f"emba-parser-v{version}\0".encode("ascii"))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_page_cached(path: str, cache_dir: str | None = DEFAULT_CACHE_DIR) -> tuple[pd.DataFrame, bool]:
+    """
+    Parst die Komponententabelle einer EMBA-Seite; Ergebnisse werden unter dem Hash aus Parser-Version und
+    Inhalt gecacht.
+    Gibt (components_df, cache_hit) zurück.
+    """
+    cache_path = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_path = os.path.join(cache_dir, f"{file_hash(path)}.pkl")
+        if os.path.exists(cache_path):
+            return pd.read_pickle(cache_path), True
+
+    components_df, _ = extract_cves_streaming(path)
+
+    if cache_path:
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        components_df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+    return components_df, False
+
+
+def _parse_task(args):
+    firmware, path, cache_dir = args
+    df, cache_hit = parse_page_cached(path, cache_dir)
+    return firmware, path, df, cache_hit
+
+
+def analyze_emba_tree(
+    report_dirs: list[str],
+    workers: int = os.cpu_count() or 1,
+    cache_dir: str | None = DEFAULT_CACHE_DIR,
+    patterns: tuple = DEFAULT_PAGE_PATTERNS,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Wertet alle EMBA-Seiten unterhalb mehrerer Reportverzeichnisse parallel aus.
+    Gibt einen konsolidierten Komponenten-DataFrame (mit Spalten firmware/page) und Statistiken zurück.
+    """
+    pages = discover_emba_pages(report_dirs, patterns)
+    tasks = [(firmware, path, cache_dir) for firmware, path in pages]
+
+    if workers <= 1 or len(tasks) <= 1:
+        results = [_parse_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_task, tasks))
+
+    frames = []
+    cache_hits = 0
+    for firmware, path, df, cache_hit in results:
+        cache_hits += cache_hit
+        if df.empty:
+            continue
+        df = df.copy()
+        df.insert(0, "page", os.path.basename(path))
+        df.insert(0, "firmware", firmware)
+        frames.append(df)
+
+    if frames:
+        combined = pd.concat(frames, ignore_index=True)
+    else:
+        combined = pd.DataFrame(columns=COMPONENT_COLUMNS)
+
+    stats = {
+        "pages": len(pages),
+        "firmware_images": len({firmware for firmware, _ in pages}),
+        "cache_hits": cache_hits,
+        "components": len(combined),
+    }
+    return combined, stats
@@ -0,0 +1,110 @@
+# src/emba_diff.py – CVE-Differenz zwischen zwei Firmware-Releases (Hash-Index auf Komponente + Version)
+
+from typing import Optional
+import pandas as pd
+from src.emba_parser import extract_cves_auto, assign_risk_level
+
+DIFF_COLUMNS = [
+    "component", "change", "old_version", "new_version",
+    "old_cves", "new_cves", "cves_delta",
+    "old_exploits", "new_exploits", "exploits_delta",
+    "old_risk_level", "new_risk_level", "risk_changed",
+]
+
+# Reihenfolge der Änderungsarten in der Ausgabe
+CHANGE_ORDER = {"added": 0, "removed": 1, "version_changed": 2, "counts_changed": 3, "unchanged": 4}
+
+
+def load_emba_components(path: str) -> pd.DataFrame:
+    """Lädt Komponenten aus einem EMBA-HTML-Report oder einem exportierten analyze-emba-cves-CSV."""
+    if path.lower().endswith(".csv"):
+        return pd.read_csv(path, dtype={"version": str})
+    components_df, _ = extract_cves_auto(path)
+    return components_df
+
+
+def _index(df: pd.DataFrame) -> tuple[dict, dict]:
+    """
+    Baut zwei Hash-Indizes in einem Durchlauf:
+    (component, version) → Kennzahlen und component → Versionen (in Auftrittsreihenfolge).
+    Doppelte Schlüssel behalten den ersten Eintrag.
+    """
+    by_key = {}
+    versions = {}
+    columns = zip(df["component"].astype(str), df["version"].astype(str), df["cves"], df["exploits"],
+                  df["risk_level"])
+    for component, version, cves, exploits, risk_level in columns:
+        key = (component, version)
+        if key in by_key:
+            continue
+        by_key[key] = (int(cves), int(exploits), risk_level)
+        versions.setdefault(component, []).append(version)
+    return by_key, versions
+
+
+def _row(component, change, old_version, new_version, old, new) -> tuple:
+    old_cves, old_exploits, old_level = old if old else (0, 0, None)
+    new_cves, new_exploits, new_level = new if new else (0, 0, None)
+    return (
+        component, change, old_version, new_version,
+        old_cves if old else None, new_cves if new else None, new_cves - old_cves,
+        old_exploits if old else None, new_exploits if new else None, new_exploits - old_exploits,
+        old_level, new_level, old_level != new_level,
+    )
+
+
+def diff_emba_components(old_df: pd.DataFrame, new_df: pd.DataFrame, rules: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Vergleicht die Komponentenlisten zweier Firmware-Versionen in linearer Zeit.
+    Erkennt neue und entfernte Komponenten, Versionssprünge sowie Änderungen der CVE-/Exploit-Zahlen
+    und der Risikostufe (assign_risk_level).
+    """
+    old_df = assign_risk_level(old_df, rules)
+    new_df = assign_risk_level(new_df, rules)
+    old_index, old_versions = _index(old_df)
+    new_index, new_versions = _index(new_df)
+
+    rows = []
+    for component, versions in new_versions.items():
+        previous = old_versions.get(component, [])
+        unmatched_new = []
+        for version in versions:
+            old = old_index.get((component, version))
+            if old is None:
+                unmatched_new.append(version)
+                continue
+            new = new_index[(component, version)]
+            change = "unchanged" if old[:2] == new[:2] else "counts_changed"
+            rows.append(_row(component, change, version, version, old, new))
+
+        unmatched_old = [version for version in previous if (component, version) not in new_index]
+        # Nicht zuordenbare Versionen paarweise als Versionssprung werten, Rest als neu/entfernt
+        for old_version, new_version in zip(unmatched_old, unmatched_new):
+            rows.append(_row(component, "version_changed", old_version, new_version,
+                             old_index[(component, old_version)], new_index[(component, new_version)]))
+        for new_version in unmatched_new[len(unmatched_old):]:
+            rows.append(_row(component, "added", None, new_version, None, new_index[(component, new_version)]))
+        for old_version in unmatched_old[len(unmatched_new):]:
+            rows.append(_row(component, "removed", old_version, None, old_index[(component, old_version)], None))
+
+    for component, versions in old_versions.items():
+        if component in new_versions:
+            continue
+        for version in versions:
+            rows.append(_row(component, "removed", version, None, old_index[(component, version)], None))
+
+    diff_df = pd.DataFrame(rows, columns=DIFF_COLUMNS)
+    count_columns = ["old_cves", "new_cves", "old_exploits", "new_exploits"]
+    diff_df[count_columns] = diff_df[count_columns].astype("Int64")
+    order = diff_df["change"].map(CHANGE_ORDER)
+    return diff_df.assign(_order=order).sort_values(["_order", "component"], kind="stable") \
+        .drop(columns="_order").reset_index(drop=True)
+
+
+def summarize_diff(diff_df: pd.DataFrame) -> dict:
+    """Kennzahlen der Differenz: Anzahl pro Änderungsart sowie Gesamtdelta der CVEs und Exploits."""
+    summary = {change: int((diff_df["change"] == change).sum()) for change in CHANGE_ORDER}
+    summary["cves_delta"] = int(diff_df["cves_delta"].sum())
+    summary["exploits_delta"] = int(diff_df["exploits_delta"].sum())
+    summary["risk_changed"] = int(diff_df["risk_changed"].sum())
+    return summary
@@ -2,9 +2,16 @@ from bs4 import BeautifulSoup
 import pandas as pd
 import re
 import os
+import html
 import matplotlib.pyplot as plt 
 import seaborn as sns
-from typing import Optional # Optional für Typannotationen
+from typing import Iterable, Optional # Optional für Typannotationen
+from src.metrics import DEPLOYMENT_DECISIONS
+from src.profiling import profiled
+from src.event_schema import observed_counts
+from src.event_buffer import epoch_seconds
+from src.error_timeparser import classify_error_type
+from src.risk_rules import load_risk_rules, compute_risk_scores, map_risk_levels, risk_level_order, levels_for_frame
 
 
 # Neue Funktion zur Deployment-Entscheidung basierend auf typischen Grenzwerten
@@ -13,24 +20,65 @@ def evaluate_firmware_acceptance(log_df: pd.DataFrame) -> tuple[bool, str]:
     Bewertet auf Basis der Fehlerarten, ob eine Firmware für das Deployment geeignet ist.
     Gibt zurück: (True/False, Begründung)
     """
+    status, reason = _firmware_acceptance_decision(log_df)
+    DEPLOYMENT_DECISIONS.labels("accepted" if status else "blocked").value += 1
+    return status, reason
+
+
+# Blockierende Fehlerarten in Prüfreihenfolge: (Grenzwert, Begründung)
+BLOCKING_RULES = {
+    "firmware_issue": (2, "Firmware enthält {count} kritische firmware_issue-Fehler."),
+    "voltage_warning": (3, "Mehr als {count} Spannungseinbrüche erkannt."),
+    "sensor_error": (3, "Mehr als {count} Sensorausfälle festgestellt."),
+}
+
+
+def _firmware_acceptance_decision(log_df: pd.DataFrame) -> tuple[bool, str]:
     if log_df.empty or "error_type" not in log_df.columns:
         return True, "Kein Fehlerprotokoll erkannt – Deployment möglich."
+    return _decision_from_counts(observed_counts(log_df["error_type"]).to_dict())
 
-    counts = log_df["error_type"].value_counts().to_dict()
-    firmware_issues = counts.get("firmware_issue", 0)
-    voltage_issues = counts.get("voltage_warning", 0)
-    sensor_errors = counts.get("sensor_error", 0)
-
-    if firmware_issues >= 2:
-        return False, f"Firmware enthält {firmware_issues} kritische firmware_issue-Fehler."
-    if voltage_issues >= 3:
-        return False, f"Mehr als {voltage_issues} Spannungseinbrüche erkannt."
-    if sensor_errors >= 3:
-        return False, f"Mehr als {sensor_errors} Sensorausfälle festgestellt."
 
+def _decision_from_counts(counts: dict) -> tuple[bool, str]:
+    if not counts:
+        return True, "Kein Fehlerprotokoll erkannt – Deployment möglich."
+    for error_type, (limit, reason) in BLOCKING_RULES.items():
+        count = counts.get(error_type, 0)
+        if count >= limit:
+            return False, reason.format(count=count)
     return True, "✅ Firmwarefreigabe möglich – keine kritischen Fehler detektiert."
 
 
+def evaluate_firmware_acceptance_stream(lines: Iterable[str]) -> tuple[bool, str, dict]:
+    """
+    Streaming-Variante von evaluate_firmware_acceptance: klassifiziert Zeile für Zeile (wie build_error_dataframe)
+    und hört auf zu lesen, sobald ein Grenzwert aus BLOCKING_RULES erreicht ist.
+    Gibt (Status, Begründung, Statistik mit lines, error_counts, early_exit) zurück.
+
+    Vorbehalt: Die Begründung nennt die Fehlerart, die ihren Grenzwert zuerst erreicht, und die Anzahl bis dahin.
+    Die Vollauswertung prüft dagegen in fester Reihenfolge über das ganze Log – bei blockierten Builds kann sie
+    daher eine andere Fehlerart bzw. höhere Anzahlen nennen. Die Entscheidung selbst ist identisch.
+    """
+    counts: dict[str, int] = {}
+    consumed = 0
+    for line in lines:
+        consumed += 1
+        error_type = classify_error_type(line)
+        if error_type == "info" or epoch_seconds(line) is None:
+            continue
+        count = counts[error_type] = counts.get(error_type, 0) + 1
+        rule = BLOCKING_RULES.get(error_type)
+        if rule is not None and count >= rule[0]:
+            status, reason, early_exit = False, rule[1].format(count=count), True
+            break
+    else:
+        (status, reason), early_exit = _decision_from_counts(counts), False
+
+    DEPLOYMENT_DECISIONS.labels("accepted" if status else "blocked").value += 1
+    return status, reason, {"lines": consumed, "error_counts": counts, "early_exit": early_exit}
+
+
+@profiled("parse")
 def extract_summary_from_index(filepath: str) -> pd.DataFrame:
     with open(filepath, "r", encoding="utf-8") as f:
         soup = BeautifulSoup(f, "html.parser")
@@ -61,6 +109,7 @@ def extract_summary_from_index(filepath: str) -> pd.DataFrame:
 
 # Unverändert: extract_cves_from_f17 und extract_cves_auto
 
+@profiled("parse")
 def extract_cves_from_f17(filepath: str) -> tuple[pd.DataFrame, pd.DataFrame]:
     with open(filepath, "r", encoding="utf-8") as f:
         soup = BeautifulSoup(f, "html.parser")
@@ -100,16 +149,103 @@ def extract_cves_from_f17(filepath: str) -> tuple[pd.DataFrame, pd.DataFrame]:
     return pd.DataFrame(components), pd.DataFrame(summary)
 
 
-def extract_cves_auto(filepath: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+# Streaming-Parser: liest das HTML blockweise und wertet jeden <pre>-Block genau einmal aus
+
+# Version des Parser-Ergebnisses (Spalten, Typen, Erkennung); fließt in den Cache-Schlüssel von src/emba_batch.py
+# ein. Bei jeder Änderung, die andere Komponententabellen liefert, erhöhen – sonst bleiben alte Ergebnisse im Cache.
+PARSER_VERSION = 1
+
+PRE_BLOCK_PATTERN = re.compile(r"<pre\b[^>]*>(.*?)</pre\s*>", re.IGNORECASE | re.DOTALL)
+PRE_OPEN_PATTERN = re.compile(r"<pre\b", re.IGNORECASE)
+TAG_PATTERN = re.compile(r"<[^>]*>")
+COMPONENT_PATTERN = re.compile(
+    r"component details:\s*(?P<component>[\w\-\.]+)\s*:\s*(?P<version>[^:]+?)\s*:\s*cves:\s*(?P<cves>\d+)\s*:\s*exploits:\s*(?P<exploits>\d+)",
+    re.IGNORECASE
+)
+SUMMARY_START_PATTERN = re.compile(r"identified.*cve entries", re.IGNORECASE)
+SUMMARY_END_PATTERN = re.compile(r"verified exploits", re.IGNORECASE)
+
+
+def iter_pre_blocks(filepath: str, chunk_size: int = 1024 * 1024):
+    """
+    Liefert den rohen Inhalt aller <pre>-Blöcke einer HTML-Datei, ohne die Datei komplett zu laden.
+    """
     with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
-    if re.search(r"component\s+details", content, re.IGNORECASE):
-        return extract_cves_from_f17(filepath)
-    else:
-        dummy = pd.DataFrame(columns=["component", "version", "cves", "exploits"])
-        return dummy, extract_summary_from_index(filepath)
+        buffer = ""
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            pos = 0
+            for match in PRE_BLOCK_PATTERN.finditer(buffer):
+                yield match.group(1)
+                pos = match.end()
+            if not chunk:
+                break
+            # Unvollständigen Rest (angeschnittenes oder offenes <pre>) für den nächsten Block aufheben
+            open_match = PRE_OPEN_PATTERN.search(buffer, pos)
+            if open_match:
+                pos = open_match.start()
+            else:
+                last_tag = buffer.rfind("<", pos)
+                pos = last_tag if last_tag != -1 else len(buffer)
+            buffer = buffer[pos:]
+
+
+def _pre_text(raw: str, strip: bool = False) -> str:
+    """Entspricht BeautifulSoup get_text() bzw. get_text(strip=True) für einen <pre>-Inhalt."""
+    if strip:
+        return "".join(html.unescape(part).strip() for part in TAG_PATTERN.split(raw))
+    text = TAG_PATTERN.sub("", raw)
+    return html.unescape(text) if "&" in text else text
+
+
+@profiled("parse")
+def extract_cves_streaming(filepath: str, chunk_size: int = 1024 * 1024) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Extrahiert Komponentenzeilen und CVE-Zusammenfassung in einem einzigen Durchlauf über die <pre>-Blöcke.
+    Liefert dieselben Ergebnisse wie extract_cves_from_f17 / extract_summary_from_index,
+    kommt aber ohne BeautifulSoup und ohne vollständiges Einlesen der Datei aus.
+    """
+    components = []
+    summary = []
+    collecting = False
+    summary_done = False
+
+    for raw in iter_pre_blocks(filepath, chunk_size):
+        text = _pre_text(raw)
+        match = COMPONENT_PATTERN.search(text)
+        if match:
+            components.append({
+                "component": match.group("component"),
+                "version": match.group("version"),
+                "cves": int(match.group("cves")),
+                "exploits": int(match.group("exploits"))
+            })
+
+        # Die Zusammenfassung beginnt mit "identified ... cve entries" – alle anderen Blöcke überspringen
+        if summary_done or (not collecting and "identified" not in text.lower()):
+            continue
+        line = _pre_text(raw, strip=True)
+        if SUMMARY_START_PATTERN.search(line):
+            collecting = True
+        if collecting:
+            summary.append({"summary": line})
+            if SUMMARY_END_PATTERN.search(line):
+                summary_done = True
+
+    components_df = pd.DataFrame(components, columns=["component", "version", "cves", "exploits"])
+    return components_df, pd.DataFrame(summary)
 
 
+def extract_cves_auto(filepath: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Extrahiert Komponenten-CVEs (f17_cve_bin_tool.html) bzw. die Zusammenfassung (index.html).
+    Bei Seiten ohne Komponentenzeilen bleibt der Komponenten-DataFrame leer.
+    """
+    return extract_cves_streaming(filepath)
+
+
+@profiled("render")
 def plot_top_cve_components(components_df: pd.DataFrame, output_path: str = "./charts/emba_top_cves.png"):
     """
     Erstellt ein Balkendiagramm der Top 10 Komponenten mit den meisten CVEs.
@@ -153,38 +289,22 @@ def plot_cve_heatmap(components_df: pd.DataFrame, output_path: str = "./charts/e
     plt.close()
     print(f"✅ CVE-Heatmap gespeichert unter: {output_path}")
 
-def assign_risk_level(df: pd.DataFrame) -> pd.DataFrame:
+@profiled("pandas")
+def assign_risk_level(df: pd.DataFrame, rules: Optional[dict] = None, cve_index=None) -> pd.DataFrame:
     """
-    Bewertet CVE-Risiken für jede Komponente auf Basis einfacher Regeln.
+    Bewertet CVE-Risiken für jede Komponente anhand der Regeltabelle (config/risk_rules.json).
+    Mit cve_index (CveFeedIndex) werden die Komponenten vorher um Offline-NVD-Daten
+    (feed_cves, max_cvss, feed_severity, cve_ids) ergänzt, auf die sich Regeln beziehen können.
     Fügt Spalten 'risk_score' und 'risk_level' hinzu.
     """
-    def compute_score(row):
-        score = 0
-        if row["cves"] >= 10:
-            score += 2
-        if row["cves"] >= 50:
-            score += 3
-        if row["exploits"] >= 1:
-            score += 2
-        if row["exploits"] >= 5:
-            score += 1
-        if row["component"].lower() == "linux_kernel":
-            score += 3
-        return score
-
-    def map_level(score):
-        if score >= 7:
-            return "kritisch"
-        elif score >= 5:
-            return "hoch"
-        elif score >= 3:
-            return "mittel"
-        else:
-            return "niedrig"
-
+    rules = rules or load_risk_rules()
+    if cve_index is not None:
+        from src.cve_feed import enrich_components
+        df = enrich_components(df, cve_index)
     df = df.copy()
-    df["risk_score"] = df.apply(compute_score, axis=1)
-    df["risk_level"] = df["risk_score"].apply(map_level)
+    df["risk_score"] = compute_risk_scores(df, rules)
+    df["risk_level"] = map_risk_levels(df["risk_score"].to_numpy(), rules)
+    df.attrs["risk_levels"] = risk_level_order(rules)
     return df
 
 def plot_cve_heatmap(components_df: pd.DataFrame, output_path: str = "./charts/emba_cve_heatmap.png"):
@@ -204,6 +324,7 @@ def plot_cve_heatmap(components_df: pd.DataFrame, output_path: str = "./charts/e
     plt.close()
     print(f"✅ CVE-Heatmap gespeichert unter: {output_path}")
 
+@profiled("render")
 def plot_risk_level_distribution(components_df: pd.DataFrame, output_path: str = "./charts/emba_risk_distribution.png"):
     """
     Erstellt ein Balkendiagramm zur Verteilung der Risikostufen.
@@ -213,7 +334,7 @@ def plot_risk_level_distribution(components_df: pd.DataFrame, output_path: str =
         return
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    counts = components_df["risk_level"].value_counts().reindex(["kritisch", "hoch", "mittel", "niedrig"], fill_value=0)
+    counts = components_df["risk_level"].value_counts().reindex(levels_for_frame(components_df), fill_value=0)
 
     plt.figure(figsize=(8, 5))
     sns.barplot(x=counts.index, y=counts.values, hue=counts.index, palette="Reds", legend=False)
@@ -243,7 +364,7 @@ def append_risk_summary_table(pdf, components_df: pd.DataFrame):
     pdf.ln()
 
     pdf.set_font("Arial", size=10)
-    risk_counts = components_df["risk_level"].value_counts().reindex(["kritisch", "hoch", "mittel", "niedrig"], fill_value=0)
+    risk_counts = components_df["risk_level"].value_counts().reindex(levels_for_frame(components_df), fill_value=0)
     for level, count in risk_counts.items():
         pdf.cell(60, 8, level.capitalize(), border=1, align="L")
         pdf.cell(40, 8, str(count), border=1, align="C")
@@ -270,11 +391,20 @@ def generate_risk_explanation(row) -> str:
         explanation += "Die Risiken gelten aktuell als gering."
     return explanation
 
-def append_risk_explanations_sorted(pdf, components_df: pd.DataFrame):
+def iter_row_dicts(df: pd.DataFrame):
+    """Liefert die Zeilen eines DataFrames als dicts (deutlich schneller als iterrows)."""
+    columns = list(df.columns)
+    for values in df.itertuples(index=False, name=None):
+        yield dict(zip(columns, values))
+
+
+def append_risk_explanations_sorted(pdf, components_df: pd.DataFrame, max_rows: Optional[int] = None):
     """
     Fügt erklärende Risikobewertungen gruppiert nach Risikostufen in das PDF ein.
+    Mit max_rows werden nur die ersten (riskantesten) Erklärungen ausgegeben.
     """
-    relevant = components_df[components_df["risk_score"] >= 3]  # nur ab mittlerem Risiko
+    levels = levels_for_frame(components_df)
+    relevant = components_df[components_df["risk_level"] != levels[-1]]  # nur ab mittlerem Risiko
     if relevant.empty:
         return
 
@@ -284,16 +414,17 @@ def append_risk_explanations_sorted(pdf, components_df: pd.DataFrame):
     pdf.set_font("Arial", size=10)
 
     # Sortiert nach risk_level und dann nach risk_score (kritisch zuerst)
-    order = {"kritisch": 0, "hoch": 1, "mittel": 2, "niedrig": 3}
-    sorted_df = relevant.copy()
-    sorted_df["_level_order"] = sorted_df["risk_level"].map(order)
-    sorted_df = sorted_df.sort_values(by=["_level_order", "risk_score"], ascending=[True, False])
+    order = {level: i for i, level in enumerate(levels)}
+    level_order = relevant["risk_level"].map(order)
+    sorted_df = relevant.assign(_level_order=level_order).sort_values(
+        by=["_level_order", "risk_score"], ascending=[True, False], kind="stable")
 
-    for _, row in sorted_df.iterrows():
+    shown = sorted_df if max_rows is None else sorted_df.head(max_rows)
+    for row in iter_row_dicts(shown):
         text = generate_risk_explanation(row)
         pdf.multi_cell(0, 6, text, border=0)
         pdf.ln(2)
 
-
-
-
+    if len(shown) < len(sorted_df):
+        pdf.set_font("Arial", "I", 10)
+        pdf.cell(0, 8, f"... {len(sorted_df) - len(shown)} weitere Erklärungen ausgelassen.", ln=1)
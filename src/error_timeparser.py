@@ -1,7 +1,10 @@
 import re
 from datetime import datetime
 from typing import Optional, List, Dict
+import numpy as np
 import pandas as pd
+from src.profiling import profiled
+from src.event_buffer import EventBuffer, epoch_seconds, epoch_seconds_at, find_timestamps
 
 
 # Fehlerarten und zugehörige Schlüsselwörter
@@ -36,16 +39,124 @@ def classify_error_type(line: str) -> str:
     return "info"
 
 
+# Bytes-Auswertung: jedes Schlüsselwort wird einmal im ganzen kleingeschriebenen Puffer gesucht (bytes.find)
+# statt Zeile für Zeile. Reihenfolge = Priorität wie in classify_error_type; "info" hat den Code len(ERROR_TYPES).
+ERROR_TYPES = list(type_keywords) + ["generic_error"]
+_TYPE_KEYWORDS_BYTES = [[keyword.encode("ascii") for keyword in keywords] for keywords in type_keywords.values()] \
+    + [[b"error"]]
+
+
+def _find_all(data: bytes, needle: bytes) -> np.ndarray:
+    """Startpositionen aller Vorkommen von needle in data."""
+    positions = []
+    find = data.find
+    pos = find(needle)
+    while pos >= 0:
+        positions.append(pos)
+        pos = find(needle, pos + len(needle))
+    return np.array(positions, dtype=np.int64)
+
+
+# Zeilenumbrüche wie str.splitlines() auf dem tolerant dekodierten Text: \n, \r, \r\n, \v, \f, \x1c–\x1e (ein Byte)
+# sowie U+0085, U+2028, U+2029 (UTF-8-Folgen; deren Lead-Bytes sind nie Folgebytes, also immer gültig dekodiert)
+_LINE_BREAK_BYTES = np.zeros(256, dtype=bool)
+_LINE_BREAK_BYTES[[0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E]] = True
+_LINE_BREAK_SEQUENCES = (b"\xc2\x85", b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+
+
+def line_bounds(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (Anfang, Ende ohne Zeilenumbruch) jeder Zeile eines undekodierten Puffers, Zeilen wie
+    data.decode("utf-8", errors="replace").splitlines() – auch reine \r-Zeilenenden serieller Konsolen.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    candidates = np.flatnonzero(buf < 0x1F)
+    stops = candidates[_LINE_BREAK_BYTES[buf[candidates]]]
+    lengths = np.ones(len(stops), dtype=np.int64)
+    # \r\n ist ein Zeilenumbruch: \r mit Länge 2, das \n entfällt
+    cr = np.flatnonzero(buf[stops[:-1]] == 0x0D)
+    crlf = cr[(buf[stops[cr + 1]] == 0x0A) & (stops[cr + 1] == stops[cr] + 1)]
+    lengths[crlf] = 2
+    keep = np.ones(len(stops), dtype=bool)
+    keep[crlf + 1] = False
+    stops, lengths = stops[keep], lengths[keep]
+    sequences = [_find_all(data, sequence) for sequence in _LINE_BREAK_SEQUENCES]
+    if any(len(found) for found in sequences):
+        stops = np.concatenate([stops] + sequences)
+        lengths = np.concatenate([lengths] + [np.full(len(found), len(sequence), dtype=np.int64)
+                                              for found, sequence in zip(sequences, _LINE_BREAK_SEQUENCES)])
+        order = np.argsort(stops, kind="stable")
+        stops, lengths = stops[order], lengths[order]
+    starts = np.concatenate(([0], stops + lengths))
+    stops = np.concatenate((stops, [len(data)]))
+    if starts[-1] == len(data):  # Puffer endet mit Zeilenumbruch (oder ist leer): keine weitere Zeile
+        starts, stops = starts[:-1], stops[:-1]
+    return starts, stops
+
+
+def split_lines(data: bytes) -> list[bytes]:
+    """Zeilen ohne Zeilenumbruch nach denselben Regeln wie line_bounds (für zeilenweise Filter wie --dedupe)."""
+    starts, stops = line_bounds(data)
+    return [data[start:stop] for start, stop in zip(starts.tolist(), stops.tolist())]
+
+
+def scan_error_lines(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fehlerzeilen eines undekodierten Puffers (Zeilen wie line_bounds) wie build_error_dataframe:
+    gibt (Epoch-Sekunden, Index in ERROR_TYPES) in Zeilenreihenfolge zurück. bytes.lower() ändert nur ASCII –
+    die Schlüsselwörter sind ASCII, ungültige UTF-8-Bytes stören nicht. Dekodiert wird nichts.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    line_starts, _ = line_bounds(data)
+    lowered = data.lower()
+    codes = np.full(len(line_starts), len(ERROR_TYPES), dtype=np.int16)
+    for code in range(len(_TYPE_KEYWORDS_BYTES) - 1, -1, -1):  # höchste Priorität zuletzt (überschreibt)
+        for keyword in _TYPE_KEYWORDS_BYTES[code]:
+            codes[np.searchsorted(line_starts, _find_all(lowered, keyword), side="right") - 1] = code
+
+    # Nur der erste Zeitstempel einer Zeile zählt (wie epoch_seconds)
+    ts_starts = find_timestamps(buf)
+    ts_lines, first = np.unique(np.searchsorted(line_starts, ts_starts, side="right") - 1, return_index=True)
+    seconds, valid = epoch_seconds_at(buf, ts_starts[first])
+    line_seconds = np.zeros(len(line_starts), dtype=np.int64)
+    line_valid = np.zeros(len(line_starts), dtype=bool)
+    line_seconds[ts_lines], line_valid[ts_lines] = seconds, valid
+
+    keep = line_valid & (codes < len(ERROR_TYPES))
+    return line_seconds[keep], codes[keep]
+
+
+@profiled("parse")
 def build_error_dataframe(lines: List[str]) -> pd.DataFrame:
-    records = []
+    events = EventBuffer()
     for line in lines:
-        ts = extract_timestamp(line)
+        ts = epoch_seconds(line)
+        if ts is None:
+            continue
         error_type = classify_error_type(line)
-        if ts and error_type != "info":
+        if error_type != "info":
             # Nur Fehler und Warnungen in den DataFrame aufnehmen
-            records.append({"timestamp": ts, "error_type": error_type})
+            events.append(ts, error_type)
+    return events.to_frame() if len(events) else pd.DataFrame()
+
 
-    return pd.DataFrame(records)
+@profiled("parse")
+def build_error_dataframe_bytes(data: bytes) -> pd.DataFrame:
+    """
+    build_error_dataframe für den undekodierten Inhalt einer Datei (gleiches Ergebnis, gleiches kompaktes Schema).
+    Ungültige UTF-8-Bytes brechen die Auswertung nicht ab.
+    """
+    seconds, codes = scan_error_lines(data)
+    if not len(codes):
+        return pd.DataFrame()
+    # Kategorien in Reihenfolge des ersten Auftretens wie bei EventBuffer
+    present, first = np.unique(codes, return_index=True)
+    present = present[np.argsort(first)]
+    remap = np.zeros(len(ERROR_TYPES), dtype=np.int16)
+    remap[present] = np.arange(len(present))
+    error_type = pd.Categorical.from_codes(remap[codes], categories=[ERROR_TYPES[code] for code in present],
+                                           validate=False)
+    return pd.DataFrame({"timestamp": seconds.view("datetime64[s]"), "error_type": error_type})
 
 
 # Testausgabe wenn direkt ausgeführt
@@ -1,5 +1,4 @@
 import os
-import zipfile
 import shutil
 import itertools
 import json
@@ -9,8 +8,12 @@ import matplotlib.colors as mcolors
 import seaborn as sns
 from fpdf import FPDF
 from datetime import datetime
+from typing import Optional
 from src.error_timeparser import build_error_dataframe
-from src.custom_classifier import classify_custom_error
+from src.report_bundle import bundle_files, bundle_report_directory
+from src.pdf_table import PdfTableWriter, compute_column_widths
+from src.profiling import profiled
+from src.event_schema import observed_counts
 
 def export_suggested_classes(df, output_path):
     """Exportiert die suggested_classes aus einem DataFrame nach JSON."""
@@ -20,40 +23,19 @@ def export_suggested_classes(df, output_path):
         print(f"🧠 Vorschläge gespeichert unter: {output_path}")
 
 
-def compare_custom_error_logs(directory: str) -> pd.DataFrame:
+def compare_custom_error_logs(directory: str, workers: int = 1) -> pd.DataFrame:
     """
     Vergleicht benutzerdefinierte Fehlerarten über mehrere Logdateien.
-    Gibt eine Tabelle mit error_type, count und Dateiname zurück.
+    Gibt eine Tabelle mit error_type, count und Dateiname zurück (Map-Reduce über src/fleet_compare.py).
     """
-    summary = []
-    for fname in os.listdir(directory):
-        if fname.endswith(".txt"):
-            path = os.path.join(directory, fname)
-            with open(path, encoding="utf-8") as f:
-                lines = f.readlines()
-
-            records = []
-            for line in lines:
-                if "[ERROR]" in line:
-                    timestamp_match = pd.to_datetime(line[:19], errors='coerce')
-                    error_type = classify_custom_error(line)
-                    if pd.notnull(timestamp_match):
-                        records.append({"timestamp": timestamp_match, "error_type": error_type})
-
-            if records:
-                df = pd.DataFrame(records)
-                df["filename"] = fname
-                grouped = df.groupby(["filename", "error_type"]).size().reset_index(name="count")
-                summary.append(grouped)
-
-    if summary:
-        return pd.concat(summary, ignore_index=True)
-    else:
-        return pd.DataFrame(columns=["filename", "error_type", "count"])
+    from src.fleet_compare import compare_directory, partial_to_frame
 
+    return partial_to_frame(compare_directory(directory, mode="custom", workers=workers), by_name=True)
 
 
 
+
+@profiled("render")
 def plot_error_timecourse(df, output_dir="./charts"):
     """
     Visualisiert Fehlerhäufigkeit über die Zeit aus einem DataFrame mit 'timestamp' und 'error_type'.
@@ -67,7 +49,7 @@ def plot_error_timecourse(df, output_dir="./charts"):
 
     df = df.copy()
     df["hour"] = df["timestamp"].dt.floor("h")
-    grouped = df.groupby(["hour", "error_type"]).size().unstack(fill_value=0)
+    grouped = df.groupby(["hour", "error_type"], observed=True).size().unstack(fill_value=0)
 
     farben = {
         "sensor_error": "orange",
@@ -141,6 +123,7 @@ def plot_error_timecourse(df, output_dir="./charts"):
 
 
 
+@profiled("render")
 def plot_error_heatmap(df, output_dir="./charts"):
     """
     Erstellt eine Heatmap der Fehlerarten über Stunden hinweg.
@@ -149,7 +132,7 @@ def plot_error_heatmap(df, output_dir="./charts"):
     os.makedirs(heatmap_dir, exist_ok=True)
 
     df["hour"] = df["timestamp"].dt.floor("h")
-    heatmap_data = df.groupby(["error_type", "hour"]).size().unstack(fill_value=0)
+    heatmap_data = df.groupby(["error_type", "hour"], observed=True).size().unstack(fill_value=0)
 
     plt.figure(figsize=(14, 6))
     sns.heatmap(heatmap_data, annot=True, fmt="d", cmap="YlOrRd", linewidths=0.5, cbar_kws={"label": "Fehleranzahl"})
@@ -164,6 +147,7 @@ def plot_error_heatmap(df, output_dir="./charts"):
     print(f"✅ Heatmap gespeichert unter: {os.path.join(heatmap_dir, 'error_time_heatmap.png')}")
     return heatpath
 
+@profiled("pandas")
 def detect_critical_error_windows(df: pd.DataFrame, threshold: int = 5) -> pd.DataFrame:
     """
     Gibt alle Stunden + Fehlerarten zurück, bei denen die Fehleranzahl >= threshold ist.
@@ -173,7 +157,7 @@ def detect_critical_error_windows(df: pd.DataFrame, threshold: int = 5) -> pd.Da
         return pd.DataFrame()
     df = df.copy()
     df["hour"] = df["timestamp"].dt.floor("h")
-    grouped = df.groupby(["hour", "error_type"]).size().reset_index(name="count")
+    grouped = df.groupby(["hour", "error_type"], observed=True).size().reset_index(name="count")
     critical = grouped[grouped["count"] >= threshold]
     return critical.sort_values(by=["hour", "error_type"])
 
@@ -191,6 +175,7 @@ def append_critical_summary_to_pdf(df: pd.DataFrame, pdf: FPDF, threshold: int =
         pdf.cell(0, 10, line, ln=1)
 
 
+@profiled("pdf")
 def export_error_report_to_pdf(df: pd.DataFrame, output_path: str = "./charts/errors/fehlerreport.pdf" ):
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     pdf = FPDF()
@@ -228,21 +213,14 @@ def export_error_report_to_pdf(df: pd.DataFrame, output_path: str = "./charts/er
     print(f"✅ PDF-Report exportiert: {output_path}")
 
 
-def export_report_as_zip(output_dir: str = "./charts/errors", zip_name: str = "error_report_bundle.zip"):
+def export_report_as_zip(output_dir: str = "./charts/errors", zip_name: str = "error_report_bundle.zip",
+                         compression: str = "deflated", compresslevel: int | None = 6):
     """
-    Erstellt ein ZIP-Archiv aller relevanten Exportdateien im Reportverzeichnis.
+    Erstellt ein ZIP-Archiv aller Exportdateien im Reportverzeichnis (inkl. manifest.json).
+    Die Dateien werden gestreamt und komprimiert geschrieben, das Archiv atomar ersetzt.
     """
     zip_path = os.path.join(output_dir, zip_name)
-    with zipfile.ZipFile(zip_path, 'w') as zipf:
-        for filename in [
-            "fehlerreport.pdf",
-            "error_time_stacked_bar.png",
-            "error_time_lines.png",
-            "error_time_heatmap.png"
-        ]:
-            path = os.path.join(output_dir, filename)
-            if os.path.exists(path):
-                zipf.write(path, arcname=filename)
+    bundle_report_directory(output_dir, zip_path, compression=compression, compresslevel=compresslevel)
     print(f"📦 ZIP-Archiv erstellt: {zip_path}")
 
 
@@ -263,36 +241,36 @@ def publish_reports_to_docs(source_dir: str = "./charts/errors", target_dir: str
         print(f" → {path}")
 
 
-def compare_error_logs(directory: str) -> pd.DataFrame:
+def compare_error_logs(directory: str, workers: int = 1, partial_path: Optional[str] = None,
+                       files: Optional[list[str]] = None, dedupe: bool = False,
+                       plan: Optional[dict] = None) -> pd.DataFrame:
     """
     Vergleicht Fehlerarten über mehrere Logdateien in einem Verzeichnis.
     Gibt eine Tabelle mit error_type, count und Dateiname zurück.
+    Jede Datei liefert nur einen Zählvektor (Map-Reduce über src/fleet_compare.py); mit partial_path wird
+    zusätzlich das Teilergebnis gespeichert, um es später mit anderen zusammenzuführen.
+    files beschränkt den Vergleich auf diese Dateinamen (z. B. aus einem Shard-Manifest), plan vermerkt den Shard
+    im Teilergebnis.
+    dedupe=True zählt dateiübergreifend doppelte Ereignisse (gleicher Zeitstempel und Zeile) nur einmal.
     """
-    summary = []
-
-    for fname in os.listdir(directory):
-        if fname.endswith(".txt"):
-            fpath = os.path.join(directory, fname)
-            with open(fpath, encoding="utf-8") as f:
-                lines = f.readlines()
-            df = build_error_dataframe(lines)
-
-            if df.empty or "error_type" not in df.columns:
-                print(f"⚠️ Datei übersprungen (ungültig oder leer): {fname}")
-                continue
-
-            df = df[df["error_type"] != "info"]
-            counts = df["error_type"].value_counts().reset_index()
-            counts.columns = ["error_type", "count"]
-            counts["filename"] = fname
-            summary.append(counts)
-
-    if not summary:
-        return pd.DataFrame(columns=["filename", "error_type", "count"])
-
-    return pd.concat(summary, ignore_index=True)[["filename", "error_type", "count"]]
-
-
+    from src.dedupe import LineDeduplicator
+    from src.fleet_compare import compare_directory, partial_to_frame, save_partial
+
+    paths = [os.path.join(directory, fname) for fname in sorted(files)] if files is not None else None
+    deduplicator = LineDeduplicator() if dedupe else None
+    partial = compare_directory(directory, workers=workers, files=paths, dedupe=deduplicator)
+    if deduplicator is not None:
+        print(deduplicator.summary())
+    for fname, counts in partial["files"].items():
+        if not counts:
+            print(f"⚠️ Datei übersprungen (ungültig oder leer): {fname}")
+    if partial_path:
+        save_partial(partial, partial_path, plan)
+        print(f"💾 Teilergebnis gespeichert: {partial_path}")
+    return partial_to_frame(partial)
+
+
+@profiled("render")
 def plot_error_comparison(df: pd.DataFrame, output_dir="./charts"):
     """
     Erstellt einen gruppierten Balkenplot zur Fehlerverteilung über mehrere Logdateien.
@@ -311,12 +289,26 @@ def plot_error_comparison(df: pd.DataFrame, output_dir="./charts"):
     print(f"✅ Vergleichsdiagramm gespeichert unter: {out_path}")
 
 
-def plot_error_heatmap_logs(df: pd.DataFrame, output_dir="./charts"):
+@profiled("render")
+def plot_error_heatmap_logs(df: pd.DataFrame, output_dir="./charts", max_files: int = 50):
     """
     Erstellt eine Heatmap der Fehlerarten pro Logdatei.
+    Akzeptiert die lange Tabelle (filename, error_type, count) oder die Sparse-Matrix aus partial_to_sparse;
+    gezeigt werden die max_files Dateien mit den meisten Fehlern (nur diese werden dicht gemacht).
     """
     os.makedirs(output_dir, exist_ok=True)
-    pivot = df.pivot_table(index="filename", columns="error_type", values="count", fill_value=0)
+    if "filename" in df.columns:
+        top = df.groupby("filename", observed=True)["count"].sum().nlargest(max_files).index
+        pivot = df[df["filename"].isin(top)].pivot_table(index="filename", columns="error_type", values="count",
+                                                         fill_value=0, observed=True)
+    else:
+        # Sparse-Matrix (Datei × Fehlerart, z. B. aus partial_to_sparse): nur die auffälligsten Dateien dicht machen
+        totals = df.sum(axis=1)
+        totals = totals[totals > 0].sort_values(ascending=False, kind="stable")
+        pivot = df.loc[totals.index[:max_files]].sparse.to_dense()
+    if pivot.empty:
+        print("⚠️ Keine Fehler gefunden – keine Heatmap erstellt.")
+        return
     plt.figure(figsize=(10, 6))
     sns.heatmap(pivot, annot=True, cmap="OrRd", fmt=".0f")
     plt.title("Heatmap: Fehlerarten je Logdatei")
@@ -328,10 +320,18 @@ def plot_error_heatmap_logs(df: pd.DataFrame, output_dir="./charts"):
     plt.close()
     print(f"✅ Heatmap gespeichert unter: {out_path}")
 
-def export_emba_report_to_pdf(summary_df, chart_path, components_df=None, output_path="./charts/errors/emba_report_full.pdf"):
+@profiled("pdf")
+def export_emba_report_to_pdf(summary_df, chart_path, components_df=None, output_path="./charts/errors/emba_report_full.pdf",
+                              max_detail_rows: int | None = 1000):
+    """
+    Erstellt den EMBA-PDF-Report. Die Komponententabelle wird zeilenweise gestreamt (Kopfzeile auf jeder Seite);
+    mit max_detail_rows werden nur die riskantesten Komponenten einzeln aufgeführt, der Rest im Anhang zusammengefasst.
+    """
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
-    from src.emba_parser import append_risk_summary_table, generate_risk_explanation, append_risk_explanations_sorted
+    from src.emba_parser import (append_risk_summary_table, generate_risk_explanation, append_risk_explanations_sorted,
+                                 iter_row_dicts)
+    from src.risk_rules import levels_for_frame
     # PDF-Report erstellen
 
     pdf = FPDF()
@@ -346,8 +346,8 @@ def export_emba_report_to_pdf(summary_df, chart_path, components_df=None, output
     pdf.set_font("Arial", "B", 14)
     pdf.cell(0, 10, "CVE-Zusammenfassung", ln=1)
     pdf.set_font("Arial", size=10)
-    for _, row in summary_df.iterrows():
-        pdf.cell(0, 8, row["summary"], ln=1)
+    for line in summary_df.get("summary", []):
+        pdf.cell(0, 8, line, ln=1)
 
     # Chart einbinden
     if os.path.exists(chart_path):
@@ -361,44 +361,36 @@ def export_emba_report_to_pdf(summary_df, chart_path, components_df=None, output
         pdf.add_page()
         pdf.set_font("Arial", "B", 14)
         pdf.cell(0, 10, "Komponententabelle mit Risikobewertung", ln=1)
-        pdf.set_font("Arial", "B", 9)
 
-        # Spaltenüberschriften
-        col_widths = [48, 28, 18, 20, 25]  # in mm
         headers = ["Komponente", "Version", "CVEs", "Exploits", "Risikostufe"]
-
-        for i, header in enumerate(headers):
-            pdf.cell(col_widths[i], 8, header, border=1, align="L")
-        pdf.ln()
-
-        pdf.set_font("Arial", size=9)
-        for _, row in components_df.iterrows():
-            values = [
-                str(row["component"])[:32],
-                str(row["version"]),
-                str(row["cves"]),
-                str(row["exploits"]),
-                str(row["risk_level"])
-            ]
-            for i, val in enumerate(values):
-                pdf.cell(col_widths[i], 6, val, border=1, align="L")
-            pdf.ln()
-
-    # Nach der Tabelle oder auf neuer Seite:
-    append_risk_summary_table(pdf, components_df)
-    
-    # Risikobewertung, Regelbasierte Erklärung
-
-    if pdf.get_y() > 250:
-        pdf.add_page()
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, "Lokale Risikoanalyse kritischer Komponenten", ln=1)
-    pdf.set_font("Arial", size=10)
-
-    for _, row in components_df[components_df["risk_score"] >= 7].iterrows():
-        text = generate_risk_explanation(row)
-        pdf.multi_cell(0, 6, text, border=0)
-        pdf.ln(2)
+        columns = ["component", "version", "cves", "exploits", "risk_level"]
+        table_df = components_df
+        if max_detail_rows is not None and len(components_df) > max_detail_rows:
+            # Bei Kürzung die riskantesten Komponenten zuerst aufführen
+            table_df = components_df.sort_values("risk_score", ascending=False, kind="stable")
+
+        sample = list(table_df[columns].head(200).itertuples(index=False, name=None))
+        writer = PdfTableWriter(pdf, headers, compute_column_widths(pdf, headers, sample))
+        written = writer.write_rows(table_df[columns].itertuples(index=False, name=None), max_rows=max_detail_rows)
+
+        if written < len(table_df):
+            append_omitted_components_summary(pdf, table_df.iloc[written:], levels_for_frame(components_df))
+
+        # Nach der Tabelle oder auf neuer Seite:
+        append_risk_summary_table(pdf, components_df)
+
+        # Risikobewertung, Regelbasierte Erklärung
+        if pdf.get_y() > 250:
+            pdf.add_page()
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 10, "Lokale Risikoanalyse kritischer Komponenten", ln=1)
+        pdf.set_font("Arial", size=10)
+
+        critical = components_df[components_df["risk_level"] == levels_for_frame(components_df)[0]]
+        for row in iter_row_dicts(critical.head(max_detail_rows) if max_detail_rows is not None else critical):
+            text = generate_risk_explanation(row)
+            pdf.multi_cell(0, 6, text, border=0)
+            pdf.ln(2)
 
     # Am Ende vor pdf.output(...) einfügen:
     risk_chart = "./charts/emba_risk_distribution.png"
@@ -409,25 +401,47 @@ def export_emba_report_to_pdf(summary_df, chart_path, components_df=None, output
         pdf.image(risk_chart, w=180)
         pdf.ln(10)
 
-    append_risk_explanations_sorted(pdf, components_df)
+    if components_df is not None and not components_df.empty:
+        append_risk_explanations_sorted(pdf, components_df, max_rows=max_detail_rows)
 
     pdf.output(output_path)
     print(f"📄 PDF-Report gespeichert unter: {output_path}")
 
+
+def append_omitted_components_summary(pdf: FPDF, omitted_df: pd.DataFrame, levels: list[str]):
+    """
+    Anhang für Komponenten, die wegen max_detail_rows nicht einzeln aufgeführt wurden:
+    Anzahl sowie CVE- und Exploit-Summen je Risikostufe.
+    """
+    grouped = omitted_df.groupby("risk_level")[["cves", "exploits"]].agg(["count", "sum"])
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, f"Anhang: {len(omitted_df)} weitere Komponenten (zusammengefasst)", ln=1)
+
+    headers = ["Risikostufe", "Komponenten", "CVEs gesamt", "Exploits gesamt"]
+    rows = [
+        (level, int(grouped.loc[level, ("cves", "count")]), int(grouped.loc[level, ("cves", "sum")]),
+         int(grouped.loc[level, ("exploits", "sum")]))
+        for level in levels if level in grouped.index
+    ]
+    writer = PdfTableWriter(pdf, headers, [40, 35, 35, 35])
+    writer.write_rows(rows)
+    pdf.ln(5)
+
+
 def export_emba_report_zip(
     files: list[str],
-    output_zip: str = "./charts/errors/emba_report_bundle.zip"
+    output_zip: str = "./charts/errors/emba_report_bundle.zip",
+    compression: str = "deflated",
+    compresslevel: int | None = 6
 ):
-    os.makedirs(os.path.dirname(output_zip), exist_ok=True)
-
-    with zipfile.ZipFile(output_zip, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for fpath in files:
-            if os.path.exists(fpath):
-                arcname = os.path.basename(fpath)
-                zipf.write(fpath, arcname=arcname)
-                print(f"📎 Hinzugefügt: {arcname}")
-            else:
-                print(f"⚠️ Datei nicht gefunden und übersprungen: {fpath}")
-
+    entries = []
+    for fpath in files:
+        if os.path.exists(fpath):
+            entries.append({"path": fpath, "arcname": os.path.basename(fpath), "size": os.path.getsize(fpath)})
+            print(f"📎 Hinzugefügt: {os.path.basename(fpath)}")
+        else:
+            print(f"⚠️ Datei nicht gefunden und übersprungen: {fpath}")
+
+    bundle_files(entries, output_zip, compression=compression, compresslevel=compresslevel)
     print(f"📦 ZIP-Archiv erstellt: {output_zip}")
-
@@ -0,0 +1,177 @@
+# src/event_buffer.py – Ereignisse in typisierten Arrays sammeln statt als Liste von Dicts
+#
+# Pro Ereignis werden nur Zahlen abgelegt: Epoch-Sekunden (int64), Code der Fehlerart (int16), optional
+# Level-Code (int16), Datei-ID (int32) und Zeilen-Offset (int64). Texte für Kategorien werden einmal interniert.
+# Die Arrays wachsen amortisiert (Verdopplung); to_frame() baut den DataFrame im kompakten Schema direkt
+# auf Sichten dieser Arrays, ohne Zwischenliste und ohne Kopie der Zeitstempel.
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Sequence
+import numpy as np
+import pandas as pd
+
+TIMESTAMP_RE = re.compile(r"(\d{4}-\d{2}-\d{2}) (\d{2}):(\d{2}):(\d{2})")
+TIMESTAMP_RE_BYTES = re.compile(rb"(\d{4}-\d{2}-\d{2}) (\d{2}):(\d{2}):(\d{2})")
+_EPOCH = datetime(1970, 1, 1)
+# Ziffernpositionen in 'YYYY-MM-DD HH:MM:SS'
+_DIGIT_OFFSETS = np.array([0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18])
+
+
+@lru_cache(maxsize=4096)
+def _day_seconds(date: str) -> Optional[int]:
+    """Epoch-Sekunden von Mitternacht eines Datums (validiert wie strptime; pro Datum nur einmal berechnet)."""
+    try:
+        return int((datetime.strptime(date, "%Y-%m-%d") - _EPOCH).total_seconds())
+    except ValueError:
+        return None
+
+
+def epoch_seconds(text: str) -> Optional[int]:
+    """Erster Zeitstempel 'YYYY-MM-DD HH:MM:SS' in text als Epoch-Sekunden (UTC-naiv), sonst None."""
+    match = TIMESTAMP_RE.search(text)
+    if not match:
+        return None
+    date, hour, minute, second = match.groups()
+    day = _day_seconds(date)
+    hour, minute, second = int(hour), int(minute), int(second)
+    if day is None or hour > 23 or minute > 59 or second > 61:
+        return None
+    return day + hour * 3600 + minute * 60 + second
+
+
+def epoch_seconds_bytes(line: bytes) -> Optional[int]:
+    """epoch_seconds für undekodierte Zeilen; nur das ASCII-Datum wird dekodiert."""
+    match = TIMESTAMP_RE_BYTES.search(line)
+    if not match:
+        return None
+    date, hour, minute, second = match.groups()
+    day = _day_seconds(date.decode("ascii"))
+    hour, minute, second = int(hour), int(minute), int(second)
+    if day is None or hour > 23 or minute > 59 or second > 61:
+        return None
+    return day + hour * 3600 + minute * 60 + second
+
+
+def find_timestamps(buf: np.ndarray) -> np.ndarray:
+    """
+    Startpositionen aller Muster 'DDDD-DD-DD DD:DD:DD' in buf (uint8), aufsteigend – wie TIMESTAMP_RE_BYTES.finditer,
+    aber vektorisiert: Kandidaten sind die Positionen 13 Bytes vor einem Doppelpunkt, die übrigen Stellen werden
+    nacheinander geprüft und die Kandidatenliste dabei verkleinert.
+    """
+    starts = np.flatnonzero(buf == 0x3A) - 13
+    starts = starts[(starts >= 0) & (starts + 19 <= len(buf))]
+    for offset, char in ((16, 0x3A), (10, 0x20), (4, 0x2D), (7, 0x2D)):
+        starts = starts[buf[starts + offset] == char]
+    for offset in _DIGIT_OFFSETS:
+        starts = starts[(buf[starts + offset] - 0x30) < 10]  # uint8: Bytes unter '0' laufen über
+    return starts
+
+
+def epoch_seconds_at(buf: np.ndarray, starts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vektorisierte epoch_seconds für Zeitstempel, die in buf (uint8) an den Positionen starts beginnen
+    (Treffer von TIMESTAMP_RE_BYTES). Gibt (Sekunden, gültig) zurück; ungültig wie bei epoch_seconds
+    sind z. B. 2025-02-30 oder 24:00:00.
+    """
+    digits = buf[starts[:, None] + _DIGIT_OFFSETS].astype(np.int64) - 48
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month, day, hour, minute, second = (digits[:, i] * 10 + digits[:, i + 1] for i in range(4, 14, 2))
+    valid = (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (hour <= 23) & (minute <= 59) & (second <= 61)
+    months = (np.where(valid, year, 1970) - 1970) * 12 + np.where(valid, month, 1) - 1
+    month_start = months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    next_month = (months + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    valid &= day <= next_month - month_start
+    seconds = (month_start + day - 1) * 86400 + hour * 3600 + minute * 60 + second
+    return seconds, valid
+
+
+class _Interner:
+    """Text → fortlaufender Code; die Reihenfolge der Codes ist die Kategorienliste."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, values: Sequence[str] = ()):
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class EventBuffer:
+    """
+    Sammelt Ereignisse (timestamp, error_type[, level, message, source_file, offset]) spaltenweise.
+    Spalten außer Zeit und Fehlerart werden beim Anlegen aktiviert; message bleibt eine Python-Liste.
+    """
+
+    def __init__(self, levels: bool = False, messages: bool = False, files: bool = False, offsets: bool = False,
+                 error_types: Sequence[str] = (), capacity: int = 1024):
+        self.size = 0
+        self._capacity = max(int(capacity), 1)
+        self._timestamps = np.empty(self._capacity, dtype=np.int64)
+        self._types = np.empty(self._capacity, dtype=np.int16)
+        self._levels = np.empty(self._capacity, dtype=np.int16) if levels else None
+        self._files = np.empty(self._capacity, dtype=np.int32) if files else None
+        self._offsets = np.empty(self._capacity, dtype=np.int64) if offsets else None
+        self._messages: Optional[list] = [] if messages else None
+        self.error_types = _Interner(error_types)
+        self.levels = _Interner()
+        self.files = _Interner()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def file_id(self, name: str) -> int:
+        """ID einer Quelldatei (für append(file_id=…)); einmal pro Datei abrufen, nicht pro Zeile."""
+        return self.files.code(name)
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for attr in ("_timestamps", "_types", "_levels", "_files", "_offsets"):
+            array = getattr(self, attr)
+            if array is not None:
+                grown = np.empty(self._capacity, dtype=array.dtype)
+                grown[:self.size] = array[:self.size]
+                setattr(self, attr, grown)
+
+    def append(self, timestamp: int, error_type: str, level: Optional[str] = None, message: Optional[str] = None,
+               file_id: int = 0, offset: int = -1) -> None:
+        """Hängt ein Ereignis an (timestamp in Epoch-Sekunden)."""
+        i = self.size
+        if i == self._capacity:
+            self._grow()
+        self._timestamps[i] = timestamp
+        self._types[i] = self.error_types.code(error_type)
+        if self._levels is not None:
+            self._levels[i] = self.levels.code(level)
+        if self._files is not None:
+            self._files[i] = file_id
+        if self._offsets is not None:
+            self._offsets[i] = offset
+        if self._messages is not None:
+            self._messages.append(message)
+        self.size = i + 1
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame im kompakten Schema (vgl. src/event_schema.py); Zeitstempel als datetime64[s]-Sicht."""
+        n = self.size
+        columns = {"timestamp": self._timestamps[:n].view("datetime64[s]")}
+        if self._levels is not None:
+            columns["level"] = pd.Categorical.from_codes(self._levels[:n], categories=self.levels.values,
+                                                         validate=False)
+        if self._messages is not None:
+            columns["message"] = pd.array(self._messages, dtype="str")
+        columns["error_type"] = pd.Categorical.from_codes(self._types[:n], categories=self.error_types.values,
+                                                          validate=False)
+        if self._files is not None:
+            columns["source_file"] = pd.Categorical.from_codes(self._files[:n], categories=self.files.values,
+                                                               validate=False)
+        if self._offsets is not None:
+            columns["offset"] = self._offsets[:n]
+        return pd.DataFrame(columns, copy=False)
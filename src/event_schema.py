@@ -0,0 +1,90 @@
+# src/event_schema.py – Kompaktes Schema für Ereignis-DataFrames
+#
+# Ereignisse (eine Zeile pro Fehler/Logeintrag) tragen wenige, sich ständig wiederholende Werte:
+# Fehlerart, Level und Quelldatei werden als Kategorien gespeichert (Ganzzahl-Codes + einmalige Werteliste),
+# Zeitstempel als datetime64. Optional werden Meldungen auf Vorlagen reduziert (Zahlen/Adressen → Platzhalter)
+# und ebenfalls als Kategorie geführt. Gruppierungen über diese Spalten sollten observed=True verwenden.
+
+import re
+from typing import Iterable, Optional
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ("error_type", "level", "source_file", "filename", "message_template")
+TIMESTAMP_COLUMN = "timestamp"
+
+_TEMPLATE_PATTERNS = (
+    (re.compile(r"0x[0-9a-fA-F]+"), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+)
+
+
+def message_template(message: str) -> str:
+    """Meldung ohne variable Anteile, z. B. 'Voltage drop detected: 10.49V' → 'Voltage drop detected: <n>V'."""
+    for pattern, placeholder in _TEMPLATE_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def compact_events(df: pd.DataFrame, templates: bool = False, intern_messages: bool = False) -> pd.DataFrame:
+    """
+    Bringt einen Ereignis-DataFrame in das kompakte Schema (in place, gibt df zurück).
+    templates=True ergänzt die Spalte message_template, intern_messages=True speichert message selbst als Kategorie
+    (lohnt sich nur bei vielen identischen Meldungen).
+    """
+    if df.empty:
+        return df
+    if TIMESTAMP_COLUMN in df.columns and not pd.api.types.is_datetime64_any_dtype(df[TIMESTAMP_COLUMN]):
+        df[TIMESTAMP_COLUMN] = pd.to_datetime(df[TIMESTAMP_COLUMN], errors="coerce")
+    if templates and "message" in df.columns:
+        # Vorlagen pro eindeutiger Meldung berechnen, nicht pro Zeile
+        df["message_template"] = df["message"].astype("category").map(message_template, na_action="ignore")
+    if intern_messages and "message" in df.columns:
+        df["message"] = df["message"].astype("category")
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+
+def concat_events(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Verkettet Ereignis-DataFrames ohne Rückfall auf Objekt-Strings:
+    Kategorische Spalten erhalten vorab die Vereinigung aller Kategorien.
+    """
+    frames = [frame.copy(deep=False) for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    for col in frames[0].columns:
+        if not isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            continue
+        categories = pd.api.types.union_categoricals(
+            [frame[col] for frame in frames if col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype)],
+            ignore_order=True,
+        ).categories
+        dtype = pd.CategoricalDtype(categories)
+        for frame in frames:
+            if col in frame.columns:
+                frame[col] = frame[col].astype(dtype)
+    return pd.concat(frames, ignore_index=True)
+
+
+def observed_counts(values: pd.Series) -> pd.Series:
+    """value_counts ohne Kategorien, die (z. B. nach Filtern) nicht mehr vorkommen."""
+    counts = values.value_counts()
+    return counts[counts > 0] if isinstance(values.dtype, pd.CategoricalDtype) else counts
+
+
+def expand_events(df: pd.DataFrame) -> pd.DataFrame:
+    """Gegenstück zu compact_events: kategorische Spalten als Objekt-Strings (Vergleichsbasis, Altformate)."""
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
+
+
+def memory_usage_mb(df: Optional[pd.DataFrame]) -> float:
+    """Tatsächlicher Speicherbedarf inkl. Python-Objekte (deep) in MB."""
+    if df is None:
+        return 0.0
+    return round(df.memory_usage(deep=True).sum() / 1e6, 3)
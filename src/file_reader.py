@@ -1,11 +1,63 @@
 # src/file_reader.py – Datei einlesen
 
-def read_text_file(path):
-    """Liest eine Textdatei im UTF-8-Format und gibt den Inhalt als String zurück."""
+import codecs
+from typing import BinaryIO, Iterator
+from src.profiling import profiled
+
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def count_invalid_bytes(data: bytes) -> int:
+    """
+    Anzahl der Bytes, die beim UTF-8-Dekodieren ungültig sind (reines ASCII wird nicht dekodiert).
+    surrogateescape macht aus jedem ungültigen Byte genau ein Ersatzzeichen, das sich nicht wieder kodieren lässt.
+    """
+    if data.isascii():
+        return 0
+    return len(data) - len(data.decode("utf-8", errors="surrogateescape").encode("utf-8", errors="ignore"))
+
+
+@profiled("read")
+def read_log_bytes(path: str) -> bytes:
+    """Liest eine Logdatei undekodiert (für die Bytes-Auswertung, z. B. build_error_dataframe_bytes)."""
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def iter_text_lines(file: BinaryIO, chunk_size: int = READ_CHUNK_BYTES) -> Iterator[str]:
+    """
+    Zeilen (mit Zeilenende) eines Binärstroms, blockweise gelesen und tolerant dekodiert – dieselben Zeilen wie
+    data.decode("utf-8", errors="replace").splitlines(). Bricht der Aufrufer ab, wird nicht weitergelesen.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while chunk := file.read(chunk_size):
+        lines = (pending + decoder.decode(chunk)).splitlines(keepends=True)
+        # Die letzte Zeile kann unvollständig sein (oder auf \r enden, dem im nächsten Block \n folgt)
+        pending = lines.pop() if lines else ""
+        yield from lines
+    yield from (pending + decoder.decode(b"", final=True)).splitlines(keepends=True)
+
+
+@profiled("read")
+def read_text_file(path, errors="strict"):
+    """
+    Liest eine Textdatei im UTF-8-Format und gibt den Inhalt als String zurück.
+    errors="replace" ersetzt ungültige Bytes (z. B. Störungen der seriellen Konsole) durch U+FFFD und meldet
+    deren Anzahl, statt die Datei zu verwerfen.
+    """
     try:
-        with open(path, 'r', encoding='utf-8') as file:
-            print(f"✅ Datei zu analysieren: {path}")
-            return file.read()
+        if errors == "strict":
+            with open(path, 'r', encoding='utf-8') as file:
+                print(f"✅ Datei zu analysieren: {path}")
+                return file.read()
+        with open(path, 'rb') as file:
+            data = file.read()
+        print(f"✅ Datei zu analysieren: {path}")
+        invalid = count_invalid_bytes(data)
+        if invalid:
+            print(f"⚠️ {invalid} ungültige Bytes ersetzt: {path}")
+        return data.decode("utf-8", errors=errors)
     except FileNotFoundError:
         print(f"❌ Datei nicht gefunden: {path}")
         return None
@@ -1,46 +1,270 @@
 # src/file_writer.py – Textdatei schreiben
-# src/file_writer.py – Exportfunktionen ohne pandas
+# src/file_writer.py – Exportfunktionen (CSV, JSON, JSON Lines, XLSX; optional gzip, gestreamt)
 
 import pandas as pd
 import csv
+import gzip
 import json
+from typing import Iterable, Optional
+from src.profiling import profiled
+
+# Zeilen pro Block beim gestreamten Export von DataFrames
+DEFAULT_CHUNK_SIZE = 100_000
+# Zeilenlimit eines Excel-Tabellenblatts (inkl. Kopfzeile)
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def _open_output(path: str, compress: Optional[bool] = None):
+    """Öffnet die Zieldatei zum Schreiben; gzip, wenn gewünscht oder der Pfad auf .gz endet."""
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, "wt", compresslevel=6, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _iter_chunks(df: pd.DataFrame, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Zerlegt einen DataFrame in Zeilenblöcke (Views, keine Kopie des Gesamtframes)."""
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def _format_datetimes(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Formatiert Zeitstempel-Spalten eines Blocks wie export_to_json (YYYY-MM-DD HH:MM:SS)."""
+    datetime_cols = chunk.select_dtypes(include=["datetime64[ns]", "datetimetz"]).columns
+    if len(datetime_cols) == 0:
+        return chunk
+    chunk = chunk.copy()
+    for col in datetime_cols:
+        chunk[col] = chunk[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+    return chunk
+
+
+def _epoch_ms_datetimes(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Zeitstempel-Spalten als Epoch-Millisekunden (wie DataFrame.to_json ohne date_format; NaT → null)."""
+    datetime_cols = chunk.select_dtypes(include=["datetime64", "datetimetz"]).columns
+    if len(datetime_cols) == 0:
+        return chunk
+    chunk = chunk.copy()
+    for col in datetime_cols:
+        values = chunk[col]
+        if values.dt.tz is not None:
+            values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        millis = values.astype("datetime64[ms]").astype("int64").astype("Int64")
+        chunk[col] = millis.mask(values.isna())
+    return chunk
+
+
+def _prepare_json_chunk(chunk: pd.DataFrame, dates: str) -> pd.DataFrame:
+    if dates == "text":
+        return _format_datetimes(chunk)
+    if dates == "epoch_ms":
+        return _epoch_ms_datetimes(chunk)
+    raise ValueError(f"Unbekanntes Datumsformat: {dates} (erlaubt: text, epoch_ms)")
+
+
+@profiled("export")
+def stream_dataframe_to_csv(df: pd.DataFrame, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            compress: Optional[bool] = None) -> int:
+    """Schreibt einen DataFrame blockweise als CSV; gibt die Anzahl geschriebener Zeilen zurück."""
+    with _open_output(path, compress) as f:
+        if df.empty:
+            df.to_csv(f, index=False)
+            return 0
+        for i, chunk in enumerate(_iter_chunks(df, chunk_size)):
+            chunk.to_csv(f, index=False, header=(i == 0))
+    return len(df)
+
+
+@profiled("export")
+def stream_dataframe_to_jsonl(df: pd.DataFrame, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                              compress: Optional[bool] = None, dates: str = "text") -> int:
+    """
+    Schreibt einen DataFrame blockweise als JSON Lines (ein Objekt pro Zeile).
+    dates: Zeitstempel als "text" (YYYY-MM-DD HH:MM:SS) oder "epoch_ms" (Ganzzahl, wie DataFrame.to_json).
+    """
+    with _open_output(path, compress) as f:
+        for chunk in _iter_chunks(df, chunk_size):
+            lines = _prepare_json_chunk(chunk, dates).to_json(orient="records", lines=True, force_ascii=False)
+            f.write(lines if lines.endswith("\n") else lines + "\n")
+    return len(df)
+
+
+@profiled("export")
+def stream_dataframe_to_json(df: pd.DataFrame, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                             compress: Optional[bool] = None, dates: str = "text") -> int:
+    """
+    Schreibt einen DataFrame blockweise als JSON-Array (ein Datensatz pro Zeile).
+    Das Ergebnis ist gültiges JSON, ohne dass alle Datensätze gleichzeitig im Speicher liegen.
+    dates wie bei stream_dataframe_to_jsonl.
+    """
+    with _open_output(path, compress) as f:
+        f.write("[")
+        first = True
+        for chunk in _iter_chunks(df, chunk_size):
+            lines = _prepare_json_chunk(chunk, dates).to_json(orient="records", lines=True, force_ascii=False)
+            # nur an "\n" trennen: force_ascii=False lässt U+0085, U+2028, \x1c usw. unmaskiert, splitlines() nicht
+            for line in lines.rstrip("\n").split("\n") if lines else ():
+                f.write("\n  " if first else ",\n  ")
+                f.write(line)
+                first = False
+        f.write("\n]\n")
+    return len(df)
+
+
+def stream_records_to_csv(records: Iterable[dict], path: str, fieldnames: Optional[list] = None,
+                          compress: Optional[bool] = None) -> int:
+    """
+    Schreibt Datensätze aus einem Iterator (z. B. Ereignisse eines Parsers) direkt als CSV.
+    Ohne fieldnames bestimmen die Schlüssel des ersten Datensatzes die Spalten.
+    """
+    count = 0
+    with _open_output(path, compress) as f:
+        writer = None
+        for record in records:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=fieldnames or list(record.keys()), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(record)
+            count += 1
+    return count
+
+
+def stream_records_to_jsonl(records: Iterable[dict], path: str, compress: Optional[bool] = None) -> int:
+    """Schreibt Datensätze aus einem Iterator direkt als JSON Lines."""
+    count = 0
+    with _open_output(path, compress) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, default=str))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def _xlsx_rows(df: pd.DataFrame, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Liefert Tabellenzeilen für openpyxl (NaN/NaT → leer, unzulässige Steuerzeichen entfernt)."""
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    for chunk in _iter_chunks(df, chunk_size):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for col in chunk.columns:
+            if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+                chunk[col] = chunk[col].map(lambda v: ILLEGAL_CHARACTERS_RE.sub("", v) if isinstance(v, str) else v)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+@profiled("export")
+def stream_tables_to_xlsx(tables: dict, path: str, max_rows: int = EXCEL_MAX_ROWS,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Schreibt mehrere Tabellen (Name → DataFrame oder list[dict]) im Write-only-Modus von openpyxl,
+    ein Tabellenblatt pro Tabelle. Überschreitet eine Tabelle max_rows (inkl. Kopfzeile),
+    wird sie auf Folgeblätter "<name> (2)", "<name> (3)" … aufgeteilt.
+    Gibt die Anzahl der Blätter pro Tabelle zurück.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheets_per_table = {}
+    for name, data in tables.items():
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        header = [str(col) for col in df.columns]
+        sheet_count, rows_in_sheet, sheet = 0, max_rows, None
+        for row in _xlsx_rows(df, chunk_size):
+            if rows_in_sheet >= max_rows:
+                sheet_count += 1
+                title = name if sheet_count == 1 else f"{name} ({sheet_count})"
+                sheet = workbook.create_sheet(title=title[:31])
+                sheet.append(header)
+                rows_in_sheet = 1
+            sheet.append(row)
+            rows_in_sheet += 1
+        if sheet is None:
+            workbook.create_sheet(title=name[:31]).append(header)
+            sheet_count = 1
+        sheets_per_table[name] = sheet_count
+    workbook.save(path)
+    return sheets_per_table
+
+
+def export_to_xlsx(tables, path: str) -> None:
+    """Exportiert eine oder mehrere Tabellen als Excel-Datei (DataFrame, list[dict] oder dict Name → Tabelle)."""
+    if not isinstance(tables, dict):
+        tables = {"data": tables}
+    if all(len(table) == 0 for table in tables.values()):
+        print("⚠️ Keine Daten zum Exportieren (XLSX).")
+        return
+
+    try:
+        sheets = stream_tables_to_xlsx(tables, path)
+        print(f"💾 XLSX-Datei erfolgreich exportiert: {path} ({sum(sheets.values())} Tabellenblätter)")
+    except Exception as e:
+        print(f"❌ Fehler beim XLSX-Export: {e}")
+
 
 def export_to_csv(data, path: str) -> None:
-    """Exportiert Daten als CSV-Datei. Akzeptiert list[dict] oder pandas.DataFrame."""
+    """Exportiert Daten als CSV-Datei. Akzeptiert list[dict] oder pandas.DataFrame (gestreamt)."""
     if isinstance(data, pd.DataFrame):
-        data = data.to_dict(orient="records")
+        if data.empty:
+            print("⚠️ Keine Daten zum Exportieren (CSV).")
+            return
+        try:
+            stream_dataframe_to_csv(data, path)
+            print(f"💾 CSV-Datei erfolgreich exportiert: {path}")
+        except Exception as e:
+            print(f"❌ Fehler beim CSV-Export: {e}")
+        return
+
     if not data:
         print("⚠️ Keine Daten zum Exportieren (CSV).")
         return
 
     try:
-        with open(path, mode='w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
+        stream_records_to_csv(data, path, fieldnames=list(data[0].keys()))
         print(f"💾 CSV-Datei erfolgreich exportiert: {path}")
     except Exception as e:
         print(f"❌ Fehler beim CSV-Export: {e}")
 
 def export_to_json(data, path: str) -> None:
-    """Exportiert Daten als JSON-Datei. Akzeptiert list[dict] oder pandas.DataFrame."""
+    """Exportiert Daten als JSON-Datei. Akzeptiert list[dict] oder pandas.DataFrame (gestreamt)."""
     if isinstance(data, pd.DataFrame):
-        data = data.copy()
-        for col in data.select_dtypes(include=["datetime64[ns]"]):
-            data[col] = data[col].dt.strftime("%Y-%m-%d %H:%M:%S")
-        data = data.to_dict(orient="records")
+        if data.empty:
+            print("⚠️ Keine Daten zum Exportieren (JSON).")
+            return
+        try:
+            stream_dataframe_to_json(data, path)
+            print(f"💾 JSON-Datei erfolgreich exportiert: {path}")
+        except Exception as e:
+            print(f"❌ Fehler beim JSON-Export: {e}")
+        return
 
     if not data:
         print("⚠️ Keine Daten zum Exportieren (JSON).")
         return
 
     try:
-        with open(path, "w", encoding="utf-8") as f:
+        with _open_output(path) as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
         print(f"💾 JSON-Datei erfolgreich exportiert: {path}")
     except Exception as e:
         print(f"❌ Fehler beim JSON-Export: {e}")
 
+def export_to_jsonl(data, path: str) -> None:
+    """Exportiert Daten als JSON Lines (.jsonl, optional .jsonl.gz). Akzeptiert list[dict] oder DataFrame."""
+    is_frame = isinstance(data, pd.DataFrame)
+    if (is_frame and data.empty) or (not is_frame and not data):
+        print("⚠️ Keine Daten zum Exportieren (JSONL).")
+        return
+
+    try:
+        if is_frame:
+            stream_dataframe_to_jsonl(data, path)
+        else:
+            stream_records_to_jsonl(data, path)
+        print(f"💾 JSONL-Datei erfolgreich exportiert: {path}")
+    except Exception as e:
+        print(f"❌ Fehler beim JSONL-Export: {e}")
+
 
 
 def write_text_file(path, text):
@@ -51,4 +275,3 @@ def write_text_file(path, text):
             print(f"✅ Datei erfolgreich gespeichert: {path}")
     except Exception as e:
         print(f"❌ Fehler beim Schreiben in die Datei {path}: {e}")
-        
\ No newline at end of file
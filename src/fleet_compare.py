@@ -0,0 +1,188 @@
+# src/fleet_compare.py – Map-Reduce-Vergleich von Fehlerarten über viele Logdateien
+#
+# Map:    jede Datei → kleiner Zählvektor {fehlerart: anzahl} (zeilenweise gelesen, kein DataFrame pro Datei)
+# Reduce: Teilergebnisse {datei: zählvektor} werden paarweise im Baum zusammengeführt (Schlüssel: Pfad relativ
+#         zum Verzeichnis; jede Datei darf nur in einem Teilergebnis stehen)
+# Ergebnis: Datei × Fehlerart als Sparse-DataFrame oder als lange Tabelle (filename, error_type, count)
+#
+# Teilergebnisse lassen sich als JSON (optional .gz) speichern; mehrere Rechner können so je einen Teil eines
+# Verzeichnisses auswerten und die Dateien anschließend zusammenführen. Auf der Platte liegt die Matrix im
+# Koordinatenformat (Dateiliste, Fehlerartenliste, Einträge [datei, art, anzahl]).
+
+import os
+import json
+import gzip
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from src.custom_classifier import classify_custom_error
+from src.dedupe import LineDeduplicator
+from src.error_timeparser import ERROR_TYPES, scan_error_lines, split_lines
+from src.event_buffer import epoch_seconds_bytes
+from src.profiling import profiled
+
+PARTIAL_VERSION = 1
+MODES = ("builtin", "custom")
+DEFAULT_BATCH_SIZE = 256
+
+
+def count_file(path: str, mode: str = "builtin", dedupe: Optional[LineDeduplicator] = None) -> dict[str, int]:
+    """
+    Map-Schritt: Fehleranzahl pro Art für eine Datei.
+    builtin zählt wie build_error_dataframe (Zeilen mit Zeitstempel, ohne 'info'),
+    custom wie compare_custom_error_logs ([ERROR]-Zeilen mit Zeitstempel am Zeilenanfang, classify_custom_error).
+    Mit dedupe werden bereits (auch in anderen Dateien) gesehene Ereignisse übersprungen.
+    Gelesen wird binär, Zeilen wie str.splitlines() (split_lines); builtin wertet den Puffer mit scan_error_lines
+    aus, custom dekodiert nur die Meldungen für classify_custom_error (tolerant).
+    """
+    counts: dict[str, int] = {}
+    if mode != "custom":
+        with open(path, "rb") as f:
+            data = f.read()
+        if dedupe is not None:
+            data = b"\n".join(dedupe.filter(split_lines(data)))
+        _, codes = scan_error_lines(data)
+        return {ERROR_TYPES[code]: int(count) for code, count in enumerate(np.bincount(codes)) if count}
+    with open(path, "rb") as f:
+        lines = split_lines(f.read())
+    for line in (dedupe.filter(lines) if dedupe is not None else lines):
+        if b"[ERROR]" not in line or epoch_seconds_bytes(line[:19]) is None:
+            continue
+        error_type = classify_custom_error(line.decode("utf-8", errors="replace"))
+        counts[error_type] = counts.get(error_type, 0) + 1
+    return counts
+
+
+def map_files(paths: Iterable[str], mode: str = "builtin", dedupe: Optional[LineDeduplicator] = None,
+              root: Optional[str] = None) -> dict:
+    """Teilergebnis für mehrere Dateien (Schlüssel: Pfad relativ zu root, ohne root der Dateiname)."""
+    if mode not in MODES:
+        raise ValueError(f"Unbekannter Modus: {mode} (erlaubt: {', '.join(MODES)})")
+    files = {}
+    for path in paths:
+        key = os.path.relpath(path, root) if root else os.path.basename(path)
+        if key in files:
+            raise ValueError(f"Datei doppelt im Teilergebnis: {key}")
+        files[key] = count_file(path, mode, dedupe)
+    return {"mode": mode, "files": files}
+
+
+def merge_partials(left: dict, right: dict) -> dict:
+    """
+    Führt zwei Teilergebnisse zusammen. Eine Datei in beiden wirft ValueError: gleichnamige Dateien aus
+    verschiedenen Verzeichnissen oder ein doppelt übergebener Shard würden sonst still aufsummiert.
+    """
+    if left["mode"] != right["mode"]:
+        raise ValueError(f"Teilergebnisse mit unterschiedlichem Modus: {left['mode']} / {right['mode']}")
+    if len(left["files"]) < len(right["files"]):
+        left, right = right, left
+    overlap = left["files"].keys() & right["files"].keys()
+    if overlap:
+        raise ValueError(f"Dateien in mehreren Teilergebnissen: {', '.join(sorted(overlap)[:5])}"
+                         + (f" (+{len(overlap) - 5} weitere)" if len(overlap) > 5 else ""))
+    return {"mode": left["mode"], "files": {**left["files"], **right["files"]}}
+
+
+def tree_merge(partials: list[dict]) -> dict:
+    """Reduce-Schritt: paarweises Zusammenführen Ebene für Ebene (log2(n) Ebenen)."""
+    if not partials:
+        raise ValueError("Keine Teilergebnisse zum Zusammenführen")
+    level = list(partials)
+    while len(level) > 1:
+        level = [merge_partials(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+    return level[0]
+
+
+@profiled("parse")
+def compare_directory(directory: str, mode: str = "builtin", workers: int = 1,
+                      batch_size: int = DEFAULT_BATCH_SIZE, files: Optional[list[str]] = None,
+                      dedupe: Optional[LineDeduplicator] = None) -> dict:
+    """
+    Map-Reduce über alle .txt-Dateien eines Verzeichnisses (oder die angegebenen Pfade, Schlüssel relativ zu
+    directory).
+    Mit workers > 1 werden Dateistapel parallel gezählt; die Stapel-Ergebnisse werden im Baum zusammengeführt.
+    Mit dedupe läuft die Map-Phase sequenziell, da alle Dateien denselben Duplikatspeicher teilen.
+    """
+    if files is None:
+        files = [os.path.join(directory, fname) for fname in sorted(os.listdir(directory)) if fname.endswith(".txt")]
+    batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+    if not batches:
+        return {"mode": mode, "files": {}}
+    if workers > 1 and len(batches) > 1 and dedupe is None:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            partials = list(pool.map(map_files, batches, [mode] * len(batches), [None] * len(batches),
+                                     [directory] * len(batches)))
+    else:
+        partials = [map_files(batch, mode, dedupe, directory) for batch in batches]
+    return tree_merge(partials)
+
+
+def save_partial(partial: dict, path: str, plan: Optional[dict] = None) -> None:
+    """
+    Speichert ein Teilergebnis im Koordinatenformat als JSON (gzip bei Endung .gz).
+    plan ({"directory", "shard", "shards"} aus dem Shard-Manifest) lässt merge die Vollständigkeit prüfen.
+    """
+    file_names = list(partial["files"])
+    types = sorted({error_type for counts in partial["files"].values() for error_type in counts})
+    type_index = {error_type: i for i, error_type in enumerate(types)}
+    entries = [[file_idx, type_index[error_type], count]
+               for file_idx, counts in enumerate(partial["files"].values())
+               for error_type, count in counts.items()]
+    payload = {"kind": "compare", "version": PARTIAL_VERSION, "mode": partial["mode"], "files": file_names,
+               "types": types, "entries": entries}
+    if plan is not None:
+        payload["plan"] = plan
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+
+
+def load_partial(path: str) -> dict:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    if payload.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"Nicht unterstützte Version des Teilergebnisses: {payload.get('version')} ({path})")
+    files: dict[str, dict[str, int]] = {fname: {} for fname in payload["files"]}
+    names, types = payload["files"], payload["types"]
+    for file_idx, type_idx, count in payload["entries"]:
+        files[names[file_idx]][types[type_idx]] = count
+    partial = {"mode": payload["mode"], "files": files}
+    if "plan" in payload:
+        partial["plan"] = payload["plan"]
+    return partial
+
+
+def partial_to_frame(partial: dict, by_name: bool = False) -> pd.DataFrame:
+    """
+    Lange Tabelle (filename, error_type, count) wie compare_error_logs; Dateien ohne Fehler entfallen.
+    Fehlerarten je Datei absteigend nach Anzahl, mit by_name alphabetisch.
+    """
+    order = (lambda item: item[0]) if by_name else (lambda item: (-item[1], item[0]))
+    rows = [(fname, error_type, count)
+            for fname, counts in partial["files"].items()
+            for error_type, count in sorted(counts.items(), key=order)]
+    return pd.DataFrame(rows, columns=["filename", "error_type", "count"])
+
+
+def partial_to_sparse(partial: dict) -> pd.DataFrame:
+    """Datei × Fehlerart als DataFrame mit Sparse-Spalten (Füllwert 0); gespeichert werden nur Nicht-Null-Werte."""
+    file_names = list(partial["files"])
+    types = sorted({error_type for counts in partial["files"].values() for error_type in counts})
+    rows: dict[str, list] = {error_type: [] for error_type in types}
+    values: dict[str, list] = {error_type: [] for error_type in types}
+    for row, counts in enumerate(partial["files"].values()):
+        for error_type, count in counts.items():
+            rows[error_type].append(row)
+            values[error_type].append(count)
+
+    columns = {}
+    for error_type in types:
+        dense = np.zeros(len(file_names), dtype=np.int64)  # nur je Spalte kurzzeitig dicht
+        dense[rows[error_type]] = values[error_type]
+        columns[error_type] = pd.arrays.SparseArray(dense, fill_value=0)
+    return pd.DataFrame(columns, index=pd.Index(file_names, name="filename"))
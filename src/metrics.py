@@ -0,0 +1,258 @@
+# src/metrics.py – Kennzahlen im Prometheus-Textformat (node_exporter textfile collector)
+#
+# Counter, Gauges und Histogramme halten nur Zahlen; Formatierung passiert ausschließlich beim Schreiben.
+# Inkremente sind einfache Attribut-Additionen ohne Locks: die Registry ist pro Prozess und für den
+# Haupt-Thread gedacht. Der optionale Intervall-Schreiber liest nur Momentaufnahmen.
+
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Optional
+
+METRIC_PREFIX = "firmware_analyzer_"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = METRIC_PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, "_Metric"] = {}
+
+    def labels(self, *values) -> "_Metric":
+        """Kindmetrik für eine Label-Kombination (wird beim ersten Zugriff angelegt und wiederverwendet)."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> "_Metric":
+        """Neue, ungelabelte Metrik gleicher Art für eine Label-Kombination."""
+
+    def _samples(self) -> list[tuple[str, tuple, float, str]]:
+        """(suffix, labelwerte, wert, zusatzlabel) – Kinder bei gelabelten Metriken, sonst die Metrik selbst."""
+        if not self.labelnames:
+            return self._own_samples(())
+        samples = []
+        for values, child in list(self._children.items()):
+            samples.extend(child._own_samples(values))
+        return samples
+
+    @abstractmethod
+    def _own_samples(self, label_values: tuple) -> list:
+        """Samples dieser Metrik (Format wie _samples) mit den übergebenen Labelwerten."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, value, extra in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, values, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        self._children.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def inc_by_label(self, counts: dict) -> None:
+        """Erhöht mehrere Label-Werte auf einmal (z. B. aus value_counts())."""
+        for label, amount in counts.items():
+            self.labels(str(label)).value += amount
+
+    def _new_child(self):
+        return Counter(self.name[len(METRIC_PREFIX):], self.documentation)
+
+    def _own_samples(self, label_values):
+        return [("_total" if not self.name.endswith("_total") else "", label_values, self.value, "")]
+
+    def reset(self):
+        super().reset()
+        self.value = 0.0
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def _new_child(self):
+        return Gauge(self.name[len(METRIC_PREFIX):], self.documentation)
+
+    def _own_samples(self, label_values):
+        return [("", label_values, self.value, "")]
+
+    def reset(self):
+        super().reset()
+        self.value = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def _new_child(self):
+        return Histogram(self.name[len(METRIC_PREFIX):], self.documentation, self.buckets)
+
+    def _own_samples(self, label_values):
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), list(self.counts)):
+            cumulative += count
+            samples.append(("_bucket", label_values, cumulative, f'le="{_format_value(bound)}"'))
+        samples.append(("_sum", label_values, self.sum, ""))
+        samples.append(("_count", label_values, self.count, ""))
+        return samples
+
+    def reset(self):
+        super().reset()
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Sammlung aller Metriken eines Laufs; schreibt sie atomar als Textfile."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._writer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metrik bereits registriert: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, buckets: tuple, labelnames: tuple = ()) -> Histogram:
+        return self._register(Histogram(name, documentation, buckets, labelnames))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Schreibt alle Metriken (tmp-Datei + os.replace, damit der Collector nie halbe Dateien liest)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def start_interval_writer(self, path: str, interval_s: float) -> None:
+        """Schreibt die Metriken zusätzlich alle interval_s Sekunden (für langlaufende Modi)."""
+        self.stop_interval_writer()
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval_s):
+                self.write_textfile(path)
+
+        self._writer = threading.Thread(target=loop, name="metrics-writer", daemon=True)
+        self._writer.start()
+
+    def stop_interval_writer(self) -> None:
+        if self._writer is not None:
+            self._stop.set()
+            self._writer.join()
+            self._writer = None
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+FILES_PROCESSED = REGISTRY.counter("files_processed_total", "Verarbeitete Logdateien.")
+BYTES_READ = REGISTRY.counter("bytes_read_total", "Gelesene Bytes aus Logdateien.")
+LINES_PROCESSED = REGISTRY.counter("lines_processed_total", "Verarbeitete Logzeilen.")
+INVALID_BYTES = REGISTRY.counter("invalid_bytes_total", "Ungültige UTF-8-Bytes in Logdateien (ersetzt statt abgebrochen).")
+LINES_PER_SECOND = REGISTRY.histogram(
+    "lines_per_second", "Durchsatz pro Datei in Zeilen pro Sekunde.",
+    buckets=(1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7),
+)
+FILE_SECONDS = REGISTRY.histogram(
+    "file_processing_seconds", "Verarbeitungszeit pro Datei in Sekunden.",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+CLASSIFICATION_CACHE_HITS = REGISTRY.counter("classification_cache_hits_total",
+                                             "Treffer im Cache von classify_custom_error.")
+CLASSIFICATION_CACHE_MISSES = REGISTRY.counter("classification_cache_misses_total",
+                                               "Cache-Misses von classify_custom_error (Regex-Auswertung nötig).")
+ERROR_EVENTS = REGISTRY.counter("error_events_total", "Erkannte Fehlerereignisse pro Fehlerart.", ("error_type",))
+DEPLOYMENT_DECISIONS = REGISTRY.counter("deployment_decisions_total",
+                                        "Deployment-Entscheidungen von evaluate_firmware_acceptance.", ("decision",))
+RUN_DURATION = REGISTRY.gauge("run_duration_seconds", "Laufzeit des letzten CLI-Aufrufs in Sekunden.")
+LAST_RUN = REGISTRY.gauge("last_run_timestamp_seconds", "Unix-Zeitpunkt des Endes des letzten CLI-Aufrufs.")
+
+
+def record_file(num_bytes: int, lines: int, seconds: float, invalid_bytes: int = 0) -> None:
+    """Kennzahlen einer fertig verarbeiteten Datei (einmal pro Datei, nicht pro Zeile)."""
+    FILES_PROCESSED.value += 1
+    BYTES_READ.value += num_bytes
+    LINES_PROCESSED.value += lines
+    INVALID_BYTES.value += invalid_bytes
+    FILE_SECONDS.observe(seconds)
+    if seconds > 0:
+        LINES_PER_SECOND.observe(lines / seconds)
+
+
+def finish_run(started: float, path: Optional[str] = None) -> None:
+    """Setzt Laufzeit-Gauges und schreibt das Textfile (falls path angegeben)."""
+    REGISTRY.stop_interval_writer()
+    RUN_DURATION.set(time.time() - started)
+    LAST_RUN.set(time.time())
+    if path:
+        REGISTRY.write_textfile(path)
@@ -0,0 +1,72 @@
+# src/pdf_table.py – Gestreamte, seitenweise PDF-Tabellen für große Komponentenlisten
+
+from itertools import islice
+from typing import Iterable, Optional, Sequence
+from fpdf import FPDF
+
+
+def compute_column_widths(pdf: FPDF, headers: Sequence[str], sample_rows: Sequence[Sequence],
+                          total_width: Optional[float] = None, min_width: float = 12.0,
+                          font_size: int = 9) -> list[float]:
+    """
+    Bestimmt die Spaltenbreiten einmalig aus Überschriften und einer Stichprobe von Zeilen.
+    Die Breiten werden proportional auf die verfügbare Seitenbreite verteilt.
+    """
+    pdf.set_font("Arial", "B", font_size)
+    total_width = total_width or (pdf.w - pdf.l_margin - pdf.r_margin)
+    natural = []
+    for i, header in enumerate(headers):
+        longest = max([len(str(row[i])) for row in sample_rows] + [0])
+        natural.append(max(pdf.get_string_width(str(header)) + 4, pdf.get_string_width("0" * longest) + 4, min_width))
+    scale = min(1.0, total_width / sum(natural))
+    return [width * scale for width in natural]
+
+
+class PdfTableWriter:
+    """
+    Schreibt Tabellenzeilen als Stream in ein FPDF-Dokument.
+    Seitenumbrüche werden vor jeder Zeile geprüft, der Tabellenkopf auf jeder neuen Seite wiederholt.
+    Zellinhalte werden anhand einer vorab bestimmten Zeichenzahl gekürzt (kein Messen pro Zeile).
+    """
+
+    def __init__(self, pdf: FPDF, headers: Sequence[str], col_widths: Sequence[float],
+                 row_height: float = 6, header_height: float = 8, font_size: int = 9):
+        self.pdf = pdf
+        self.headers = list(headers)
+        self.col_widths = list(col_widths)
+        self.row_height = row_height
+        self.header_height = header_height
+        self.font_size = font_size
+        pdf.set_font("Arial", size=font_size)
+        char_width = pdf.get_string_width("0")
+        self.max_chars = [max(1, int((width - 2) / char_width)) for width in self.col_widths]
+
+    def write_header(self) -> None:
+        pdf = self.pdf
+        pdf.set_font("Arial", "B", self.font_size)
+        for width, header in zip(self.col_widths, self.headers):
+            pdf.cell(width, self.header_height, header, border=1, align="L")
+        pdf.ln()
+        pdf.set_font("Arial", size=self.font_size)
+
+    def write_rows(self, rows: Iterable[Sequence], max_rows: Optional[int] = None) -> int:
+        """
+        Schreibt bis zu max_rows Zeilen aus dem Iterator und gibt die Anzahl geschriebener Zeilen zurück.
+        Nicht verbrauchte Zeilen bleiben im Iterator (z. B. für einen Zusammenfassungsanhang).
+        """
+        pdf = self.pdf
+        if pdf.get_y() + self.header_height + self.row_height > pdf.page_break_trigger:
+            pdf.add_page()
+        self.write_header()
+
+        written = 0
+        widths = list(zip(self.col_widths, self.max_chars))
+        for row in islice(rows, max_rows):
+            if pdf.get_y() + self.row_height > pdf.page_break_trigger:
+                pdf.add_page()
+                self.write_header()
+            for (width, max_chars), value in zip(widths, row):
+                pdf.cell(width, self.row_height, str(value)[:max_chars], border=1, align="L")
+            pdf.ln()
+            written += 1
+        return written
@@ -0,0 +1,184 @@
+# src/profiling.py – Laufzeitprofil pro Pipeline-Stufe (Wall-/CPU-Zeit, tracemalloc-Spitze)
+#
+# Spans werden über @profiled("stufe") oder `with span("stufe.name"):` gesetzt.
+# Ohne aktives Profil (Standard) prüft ein Span nur eine globale Variable – kein Zeitmessen, kein Allozieren.
+# Gemessen wird im aktuellen Prozess und Thread; Worker-Prozesse (ProcessPoolExecutor) werden nicht erfasst.
+
+import os
+import sys
+import json
+import time
+import cProfile
+import functools
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Optional
+
+_NULL_SPAN = nullcontext()
+_active: Optional["Profiler"] = None
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "wall0", "cpu0", "mem0", "peak", "child_wall", "child_cpu")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        stack = profiler.stack
+        self.child_wall = self.child_cpu = 0.0
+        self.mem0 = self.peak = 0
+        if profiler.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Bisherige Spitze gehört zum umgebenden Span, bevor sie zurückgesetzt wird
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.mem0 = self.peak = current
+        stack.append(self)
+        self.cpu0 = time.process_time()
+        self.wall0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall0
+        cpu = time.process_time() - self.cpu0
+        profiler = self.profiler
+        profiler.stack.pop()
+        parent = profiler.stack[-1] if profiler.stack else None
+        alloc_peak = 0
+        if profiler.trace_memory:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            alloc_peak = peak - self.mem0
+            if parent is not None:
+                parent.peak = max(parent.peak, peak)
+        if parent is not None:
+            parent.child_wall += wall
+            parent.child_cpu += cpu
+        profiler.record(self.name, wall, cpu, wall - self.child_wall, cpu - self.child_cpu, alloc_peak)
+        return False
+
+
+class Profiler:
+    """Sammelt Span-Messwerte, aggregiert nach Span-Name."""
+
+    def __init__(self, trace_memory: bool = True, pstats_path: Optional[str] = None):
+        self.trace_memory = trace_memory
+        self.pstats_path = pstats_path
+        self.stack: list[_Span] = []
+        # name → [aufrufe, wall, cpu, self_wall, self_cpu, max_alloc_peak]
+        self.stats: dict[str, list] = {}
+        self._root: Optional[_Span] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        self.started = datetime.now()
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def record(self, name, wall, cpu, self_wall, self_cpu, alloc_peak) -> None:
+        entry = self.stats.get(name)
+        if entry is None:
+            self.stats[name] = [1, wall, cpu, self_wall, self_cpu, alloc_peak]
+            return
+        entry[0] += 1
+        entry[1] += wall
+        entry[2] += cpu
+        entry[3] += self_wall
+        entry[4] += self_cpu
+        entry[5] = max(entry[5], alloc_peak)
+
+    def start(self) -> None:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.pstats_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._root = self.span("total")
+        self._root.__enter__()
+
+    def stop(self) -> None:
+        while self.stack:
+            self.stack[-1].__exit__(None, None, None)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def report(self) -> dict:
+        """Spans absteigend nach Wall-Zeit sowie Eigenzeit pro Stufe (Präfix vor dem ersten Punkt)."""
+        spans = []
+        stages: dict[str, dict] = {}
+        for name, (calls, wall, cpu, self_wall, self_cpu, alloc_peak) in self.stats.items():
+            stage = name.split(".", 1)[0]
+            spans.append({
+                "name": name, "stage": stage, "calls": calls,
+                "wall_s": round(wall, 6), "cpu_s": round(cpu, 6),
+                "self_wall_s": round(self_wall, 6), "self_cpu_s": round(self_cpu, 6),
+                "tracemalloc_peak_mb": round(alloc_peak / 1e6, 3),
+            })
+            totals = stages.setdefault(stage, {"self_wall_s": 0.0, "self_cpu_s": 0.0})
+            totals["self_wall_s"] = round(totals["self_wall_s"] + self_wall, 6)
+            totals["self_cpu_s"] = round(totals["self_cpu_s"] + self_cpu, 6)
+        spans.sort(key=lambda item: item["wall_s"], reverse=True)
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "command": sys.argv[1:],
+            "trace_memory": self.trace_memory,
+            "stages": dict(sorted(stages.items(), key=lambda item: item[1]["self_wall_s"], reverse=True)),
+            "spans": spans,
+        }
+
+    def write(self, output_path: str) -> dict:
+        """Schreibt das JSON-Profil (und ggf. den pstats-Dump) und gibt den Report zurück."""
+        report = self.report()
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        if self._cprofile is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.pstats_path)), exist_ok=True)
+            self._cprofile.dump_stats(self.pstats_path)
+        return report
+
+
+def span(name: str):
+    """Kontextmanager für einen benannten Abschnitt; ohne aktives Profil ein geteilter No-op."""
+    if _active is None:
+        return _NULL_SPAN
+    return _active.span(name)
+
+
+def profiled(stage: str, name: Optional[str] = None):
+    """Dekorator: misst jeden Aufruf der Funktion als Span '<stage>.<funktionsname>'."""
+    def decorate(func):
+        span_name = name or f"{stage}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enable_profiling(trace_memory: bool = True, pstats_path: Optional[str] = None) -> Profiler:
+    """Startet ein globales Profil; alle folgenden Spans werden erfasst."""
+    global _active
+    profiler = Profiler(trace_memory=trace_memory, pstats_path=pstats_path)
+    profiler.start()
+    _active = profiler
+    return profiler
+
+
+def disable_profiling(output_path: Optional[str] = None) -> Optional[dict]:
+    """Beendet das globale Profil und schreibt es optional als JSON."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    return profiler.write(output_path) if output_path else profiler.report()
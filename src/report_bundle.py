@@ -0,0 +1,120 @@
+# src/report_bundle.py – Gestreamte, komprimierte ZIP-Bundles für Report-Exporte
+
+import os
+import json
+import hashlib
+import zipfile
+from src.profiling import profiled
+
+COMPRESSION_METHODS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+# Bereits komprimierte Formate werden unverändert abgelegt (erneutes Komprimieren kostet nur Zeit)
+PRECOMPRESSED_SUFFIXES = (".png", ".jpg", ".jpeg", ".zip", ".gz", ".bz2", ".xz", ".xlsx")
+
+MANIFEST_NAME = "manifest.json"
+CHUNK_SIZE = 1024 * 1024
+
+
+def build_report_manifest(source_dir: str, exclude_suffixes: tuple = (".zip",)) -> list[dict]:
+    """
+    Ermittelt alle Dateien eines Reportverzeichnisses (rekursiv) als Manifest.
+    Jeder Eintrag enthält Quellpfad, Archivname und Größe. Ein manifest.json auf oberster Ebene (z. B. aus einem
+    entpackten Bundle) wird übersprungen, da bundle_files das Manifest selbst erzeugt.
+    """
+    manifest = []
+    for root, _, filenames in os.walk(source_dir):
+        for filename in sorted(filenames):
+            if filename.endswith(exclude_suffixes) or filename.startswith(".bundle-"):
+                continue
+            path = os.path.join(root, filename)
+            arcname = os.path.relpath(path, source_dir).replace(os.sep, "/")
+            if arcname == MANIFEST_NAME:
+                continue
+            manifest.append({"path": path, "arcname": arcname, "size": os.path.getsize(path)})
+    return sorted(manifest, key=lambda entry: entry["arcname"])
+
+
+def _write_member(zipf: zipfile.ZipFile, entry: dict, compression: int, chunk_size: int) -> dict:
+    """Schreibt eine Datei in Blöcken ins Archiv und berechnet dabei die SHA-256-Prüfsumme."""
+    method = zipfile.ZIP_STORED if entry["arcname"].lower().endswith(PRECOMPRESSED_SUFFIXES) else compression
+    zipf.compression = method
+    digest = hashlib.sha256()
+    force_zip64 = entry["size"] >= zipfile.ZIP64_LIMIT
+    with open(entry["path"], "rb") as src, zipf.open(entry["arcname"], "w", force_zip64=force_zip64) as dest:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            dest.write(chunk)
+    zipf.compression = compression
+    return {
+        "arcname": entry["arcname"],
+        "size": entry["size"],
+        "sha256": digest.hexdigest(),
+        "compression": next(name for name, value in COMPRESSION_METHODS.items() if value == method),
+    }
+
+
+@profiled("export")
+def bundle_files(
+    entries: list[dict],
+    zip_path: str,
+    compression: str = "deflated",
+    compresslevel: int | None = 6,
+    chunk_size: int = CHUNK_SIZE,
+    include_manifest: bool = True,
+) -> list[dict]:
+    """
+    Packt die Manifest-Einträge gestreamt in ein ZIP-Archiv.
+    Das Archiv wird zuerst als temporäre Datei im Zielverzeichnis geschrieben und
+    danach atomar umbenannt – ein abgebrochener Lauf hinterlässt kein halbes ZIP.
+    Gibt die tatsächlich geschriebenen Manifest-Einträge (inkl. SHA-256) zurück.
+    """
+    if compression not in COMPRESSION_METHODS:
+        raise ValueError(f"Unbekannte Kompression: {compression} (erlaubt: {', '.join(COMPRESSION_METHODS)})")
+    method = COMPRESSION_METHODS[compression]
+    if method in (zipfile.ZIP_STORED, zipfile.ZIP_LZMA):
+        compresslevel = None
+    if include_manifest and any(entry["arcname"] == MANIFEST_NAME for entry in entries):
+        raise ValueError(f"{MANIFEST_NAME} ist für das Bundle-Manifest reserviert")
+
+    target_dir = os.path.dirname(os.path.abspath(zip_path))
+    os.makedirs(target_dir, exist_ok=True)
+    # Modus 0666 wie bei open(): der Kernel zieht die umask ab, das ZIP ist so lesbar wie jede normal erzeugte Datei
+    tmp_path = os.path.join(target_dir, f".bundle-{os.urandom(8).hex()}.zip.tmp")
+    os.close(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+
+    written = []
+    try:
+        with zipfile.ZipFile(tmp_path, "w", compression=method, compresslevel=compresslevel) as zipf:
+            for entry in entries:
+                written.append(_write_member(zipf, entry, method, chunk_size))
+            if include_manifest:
+                zipf.writestr(MANIFEST_NAME, json.dumps({"files": written}, indent=2, ensure_ascii=False))
+        os.replace(tmp_path, zip_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return written
+
+
+def bundle_report_directory(
+    source_dir: str,
+    zip_path: str,
+    compression: str = "deflated",
+    compresslevel: int | None = 6,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[dict]:
+    """Packt das komplette Reportverzeichnis laut Manifest in ein ZIP-Archiv."""
+    entries = build_report_manifest(source_dir)
+    target = os.path.abspath(zip_path)
+    entries = [entry for entry in entries if os.path.abspath(entry["path"]) != target]
+    return bundle_files(entries, zip_path, compression, compresslevel, chunk_size)
@@ -0,0 +1,108 @@
+# src/risk_rules.py – Konfigurierbare, vektorisierte Risikobewertung für EMBA-Komponenten
+
+import json
+import fnmatch
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / "config" / "risk_rules.json"
+
+# Notbehelf, falls config/risk_rules.json fehlt (z. B. unvollständige Installation). Maßgeblich ist allein die
+# Konfigurationsdatei; hier nur zwei Stufen, damit ein fehlendes Regelwerk nicht unbemerkt als "niedrig" endet.
+FALLBACK_RISK_RULES = {
+    "rules": [
+        {"column": "cves", "threshold": 10, "weight": 1},
+        {"column": "exploits", "threshold": 1, "weight": 1},
+    ],
+    "levels": [
+        {"level": "niedrig", "min_score": 0},
+        {"level": "hoch", "min_score": 1},
+    ],
+}
+
+
+def load_risk_rules(path: str | None = None) -> dict:
+    """
+    Lädt die Regeltabelle (Schwellenwert, Gewicht, Komponenten-Matcher) aus einer JSON-Datei.
+    Ohne Pfad wird config/risk_rules.json verwendet; fehlt sie, gelten mit Warnung die FALLBACK_RISK_RULES.
+    """
+    if path is None:
+        if not DEFAULT_RULES_PATH.exists():
+            print(f"⚠️ {DEFAULT_RULES_PATH} fehlt – vereinfachte Risikoregeln (niedrig/hoch) aktiv")
+            return FALLBACK_RISK_RULES
+        path = DEFAULT_RULES_PATH
+
+    rules_path = Path(path)
+    if not rules_path.exists():
+        raise FileNotFoundError(f"Datei nicht gefunden: {path}")
+    with open(rules_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    validate_risk_rules(config)
+    return config
+
+
+def validate_risk_rules(config: dict) -> None:
+    """Prüft die Regeltabelle auf Vollständigkeit und wirft ValueError bei Fehlern."""
+    if not config.get("rules") or not config.get("levels"):
+        raise ValueError("Risikoregeln benötigen die Schlüssel 'rules' und 'levels'.")
+    for rule in config["rules"]:
+        if "weight" not in rule:
+            raise ValueError(f"Regel ohne 'weight': {rule}")
+        if "components" not in rule and ("column" not in rule or "threshold" not in rule):
+            raise ValueError(f"Regel benötigt 'column' + 'threshold' oder 'components': {rule}")
+    scores = [level["min_score"] for level in config["levels"]]
+    if scores != sorted(scores) or len(set(scores)) != len(scores):
+        raise ValueError("Risikostufen müssen nach 'min_score' aufsteigend und eindeutig sein.")
+
+
+def _component_mask(components: pd.Series, patterns: list[str]) -> np.ndarray:
+    """
+    Vergleicht Komponentennamen (case-insensitive, Wildcards erlaubt) mit einer Regel.
+    Der Regex läuft nur über die eindeutigen Namen, das Ergebnis wird per Code-Array verteilt.
+    """
+    regex = "|".join(fnmatch.translate(pattern.lower()) for pattern in patterns)
+    codes, uniques = pd.factorize(components)
+    matched = pd.Series(uniques).astype(str).str.lower().str.match(regex).fillna(False).to_numpy(dtype=bool)
+    return np.append(matched, False)[codes]
+
+
+def compute_risk_scores(df: pd.DataFrame, config: dict) -> np.ndarray:
+    """
+    Berechnet den Risiko-Score aller Zeilen spaltenweise.
+    Regeln auf Spalten, die im DataFrame fehlen, werden ignoriert.
+    """
+    integral = all(isinstance(rule["weight"], int) for rule in config["rules"])
+    scores = np.zeros(len(df), dtype=np.int64 if integral else np.float64)
+    for rule in config["rules"]:
+        if "components" in rule:
+            if "component" not in df.columns:
+                continue
+            mask = _component_mask(df["component"], rule["components"])
+            if "column" in rule and rule["column"] in df.columns:
+                mask &= pd.to_numeric(df[rule["column"]], errors="coerce").to_numpy() >= rule["threshold"]
+        elif rule["column"] in df.columns:
+            mask = pd.to_numeric(df[rule["column"]], errors="coerce").to_numpy() >= rule["threshold"]
+        else:
+            continue
+        scores += mask * rule["weight"]
+    return scores
+
+
+def map_risk_levels(scores, config: dict) -> np.ndarray:
+    """Ordnet Scores per pd.cut den konfigurierten Risikostufen zu."""
+    levels = config["levels"]
+    bins = [-np.inf] + [level["min_score"] for level in levels[1:]] + [np.inf]
+    labels = [level["level"] for level in levels]
+    return pd.cut(scores, bins=bins, labels=labels, right=False).astype(object)
+
+
+def risk_level_order(config: dict | None = None) -> list[str]:
+    """Risikostufen von der höchsten zur niedrigsten (z. B. für Sortierung und Diagramme)."""
+    config = config or load_risk_rules()
+    return [level["level"] for level in reversed(config["levels"])]
+
+
+def levels_for_frame(df: pd.DataFrame) -> list[str]:
+    """Risikostufen, mit denen ein DataFrame bewertet wurde (Fallback: Standardkonfiguration)."""
+    return df.attrs.get("risk_levels") or risk_level_order()
@@ -0,0 +1,109 @@
+# src/rollup.py – Vorberechnete Zeit-Rollups für interaktive Ansichten großer Logs
+#
+# Aus dem Ereignis-DataFrame (timestamp, error_type, …) wird einmal eine Zähltabelle pro Minute und Fehlerart
+# gebildet. Filter (Zeitraum, Fehlerarten) und Diagramme arbeiten nur auf dieser Tabelle und werden auf eine
+# feste Anzahl Zeitpunkte heruntergerechnet – die Antwortzeit hängt damit von der Zeitspanne, nicht von der
+# Anzahl der Ereignisse ab. Ereignistabellen werden seitenweise über die zeitlich sortierten Ereignisse geliefert.
+
+from typing import Optional, Sequence
+import numpy as np
+import pandas as pd
+from src.profiling import profiled
+
+ROLLUP_FREQ = "min"
+# Mögliche Diagramm-Auflösungen, aufsteigend; gewählt wird die feinste mit höchstens max_points Zeitpunkten
+CHART_FREQUENCIES = ("min", "5min", "15min", "h", "6h", "D", "7D", "30D")
+DEFAULT_MAX_POINTS = 200
+DEFAULT_PAGE_SIZE = 100
+
+
+@profiled("pandas")
+def build_rollup(df: pd.DataFrame, freq: str = ROLLUP_FREQ) -> dict:
+    """
+    Baut den Rollup eines Ereignis-DataFrames.
+    Enthält die zeitlich sortierten Ereignisse (für Seiten), die Zähltabelle (bucket, error_type, count)
+    sowie Zeitspanne und vorkommende Fehlerarten.
+    """
+    if df.empty:
+        return {"events": df, "counts": pd.DataFrame(columns=["bucket", "error_type", "count"]),
+                "freq": freq, "start": None, "end": None, "error_types": []}
+
+    events = df if df["timestamp"].is_monotonic_increasing else df.sort_values("timestamp", kind="stable")
+    events = events.reset_index(drop=True)
+    counts = (events.groupby([events["timestamp"].dt.floor(freq).rename("bucket"), "error_type"], observed=True)
+              .size().reset_index(name="count"))
+    return {
+        "events": events,
+        "counts": counts,
+        "freq": freq,
+        "start": events["timestamp"].iloc[0],
+        "end": events["timestamp"].iloc[-1],
+        "error_types": sorted(counts["error_type"].unique().tolist()),
+    }
+
+
+def _time_slice(timestamps: pd.Series, start, end) -> slice:
+    """Positionsbereich [start, end] in einer aufsteigend sortierten Zeitreihe (binäre Suche, ohne Maske)."""
+    values = timestamps.to_numpy()
+    lo = 0 if start is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(start)), side="left"))
+    hi = len(values) if end is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(end)), side="right"))
+    return slice(lo, max(lo, hi))
+
+
+def filter_counts(rollup: dict, start=None, end=None, error_types: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Zähltabelle eingeschränkt auf Zeitraum (Bucket-genau) und Fehlerarten."""
+    counts = rollup["counts"]
+    if counts.empty:
+        return counts
+    start = None if start is None else pd.Timestamp(start).floor(rollup["freq"])
+    counts = counts.iloc[_time_slice(counts["bucket"], start, end)]
+    if error_types is not None:
+        counts = counts[counts["error_type"].isin(error_types)]
+    return counts
+
+
+def chart_frequency(start, end, max_points: int = DEFAULT_MAX_POINTS) -> str:
+    """Feinste Auflösung aus CHART_FREQUENCIES, bei der die Zeitspanne höchstens max_points Zeitpunkte ergibt."""
+    if start is None or end is None:
+        return CHART_FREQUENCIES[0]
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for freq in CHART_FREQUENCIES:
+        if span / pd.Timedelta(pd.tseries.frequencies.to_offset(freq)) < max_points:
+            return freq
+    return CHART_FREQUENCIES[-1]
+
+
+def chart_series(rollup: dict, start=None, end=None, error_types: Optional[Sequence[str]] = None,
+                 max_points: int = DEFAULT_MAX_POINTS) -> pd.DataFrame:
+    """
+    Diagrammdaten: Zeit (Zeilen) × Fehlerart (Spalten), auf höchstens ~max_points Zeilen verdichtet.
+    Nur Zeitpunkte mit Ereignissen erscheinen (keine aufgefüllten Lücken).
+    """
+    counts = filter_counts(rollup, start, end, error_types)
+    if counts.empty:
+        return pd.DataFrame()
+    freq = chart_frequency(counts["bucket"].iloc[0], counts["bucket"].iloc[-1], max_points)
+    return (counts.groupby([counts["bucket"].dt.floor(freq), "error_type"], observed=True)["count"].sum()
+            .unstack(fill_value=0))
+
+
+def type_totals(rollup: dict, start=None, end=None, error_types: Optional[Sequence[str]] = None) -> pd.Series:
+    """Ereignisse pro Fehlerart im gefilterten Bereich, absteigend."""
+    counts = filter_counts(rollup, start, end, error_types)
+    return counts.groupby("error_type", observed=True)["count"].sum().sort_values(ascending=False)
+
+
+def page_events(rollup: dict, page: int = 0, page_size: int = DEFAULT_PAGE_SIZE, start=None, end=None,
+                error_types: Optional[Sequence[str]] = None) -> tuple[pd.DataFrame, int]:
+    """
+    Eine Seite (0-basiert) der gefilterten Ereignisse und die Gesamtzahl der Treffer.
+    Der Zeitraum wird per binärer Suche eingegrenzt; nur dieser Ausschnitt wird nach Fehlerart gefiltert.
+    """
+    events = rollup["events"]
+    if events.empty:
+        return events, 0
+    window = events.iloc[_time_slice(events["timestamp"], start, end)]
+    if error_types is not None:
+        window = window[window["error_type"].isin(error_types)]
+    offset = max(page, 0) * page_size
+    return window.iloc[offset:offset + page_size], len(window)
@@ -0,0 +1,232 @@
+# src/sharding.py – Aufteilung eines Log-Archivs auf mehrere Analyse-Rechner
+#
+# python main.py plan --dir /nfs/logs --shards 4 --output ./shards
+#   → shards/shard-001-of-004.manifest.json … (Dateilisten, nach Bytes ausgeglichen)
+# python main.py analyze --manifest ./shards/shard-001-of-004.manifest.json       (je Rechner ein Manifest)
+# python main.py compare-logs --manifest ./shards/shard-001-of-004.manifest.json
+# python main.py merge --partial "./shards/*.analyze.json.gz" --export events.csv
+#
+# Manifeste enthalten das Verzeichnis als absoluten Pfad; alle Rechner müssen das Archiv unter demselben Pfad
+# eingehängt haben. Teilergebnisse von analyze speichern den Ereignis-DataFrame spaltenweise (Zeitstempel als
+# Epoch-Sekunden, Kategorien als Werteliste + Codes), die von compare-logs das Format aus src/fleet_compare.py.
+# Beide vermerken den Plan (Verzeichnis, Shard i von N); merge bricht ab, wenn Shards fehlen, doppelt vorkommen
+# oder aus verschiedenen Plänen stammen.
+
+import os
+import re
+import glob
+import gzip
+import json
+import heapq
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from src.event_schema import concat_events
+
+MANIFEST_VERSION = 1
+EVENTS_PARTIAL_VERSION = 1
+PARTIAL_SUFFIXES = {"analyze": ".analyze.json.gz", "compare": ".compare.json.gz"}
+_KIND_RE = re.compile(r'"kind":"(\w+)"')
+
+
+def plan_shards(directory: str, shards: int) -> list[dict]:
+    """
+    Verteilt die .txt-Dateien eines Verzeichnisses auf shards Manifeste mit möglichst gleicher Bytesumme
+    (größte Datei zuerst in den jeweils leichtesten Shard). Dateien innerhalb eines Shards bleiben sortiert.
+    """
+    if shards < 1:
+        raise ValueError(f"Anzahl der Shards muss mindestens 1 sein: {shards}")
+    directory = os.path.abspath(directory)
+    sizes = {fname: os.path.getsize(os.path.join(directory, fname))
+             for fname in os.listdir(directory) if fname.endswith(".txt")}
+    heap = [(0, index) for index in range(shards)]
+    assigned: list[list[str]] = [[] for _ in range(shards)]
+    totals = [0] * shards
+    for fname in sorted(sizes, key=lambda name: (-sizes[name], name)):
+        total, index = heapq.heappop(heap)
+        assigned[index].append(fname)
+        totals[index] = total + sizes[fname]
+        heapq.heappush(heap, (totals[index], index))
+    return [{"version": MANIFEST_VERSION, "directory": directory, "shard": index + 1, "shards": shards,
+             "bytes": totals[index], "files": sorted(assigned[index])}
+            for index in range(shards)]
+
+
+def write_manifests(manifests: list[dict], output_dir: str) -> list[str]:
+    """Schreibt die Manifeste als shard-XXX-of-YYY.manifest.json und gibt die Pfade zurück."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for manifest in manifests:
+        path = os.path.join(output_dir, f"shard-{manifest['shard']:03d}-of-{manifest['shards']:03d}.manifest.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+def load_manifest(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Nicht unterstützte Manifest-Version: {manifest.get('version')} ({path})")
+    return manifest
+
+
+def manifest_files(manifest: dict) -> list[str]:
+    """Vollständige Pfade der Dateien eines Manifests."""
+    return [os.path.join(manifest["directory"], fname) for fname in manifest["files"]]
+
+
+def shard_plan(manifest: dict) -> dict:
+    """Planangaben eines Manifests, die ein Teilergebnis für die Vollständigkeitsprüfung mitführt."""
+    return {"directory": manifest["directory"], "shard": manifest["shard"], "shards": manifest["shards"]}
+
+
+def check_plan(plans: list[Optional[dict]], paths: list[str]) -> None:
+    """
+    ValueError, wenn die Teilergebnisse nicht genau die Shards 1 … N eines Plans abdecken (fehlend, doppelt,
+    anderes Verzeichnis oder andere Shard-Anzahl). Teilergebnisse ganz ohne Plan (ohne --manifest erzeugt)
+    werden nicht geprüft, gemischt mit geplanten aber abgelehnt.
+    """
+    if all(plan is None for plan in plans):
+        return
+    unplanned = [path for plan, path in zip(plans, paths) if plan is None]
+    if unplanned:
+        raise ValueError(f"Teilergebnisse ohne Shard-Plan (nicht mit --manifest erzeugt): {', '.join(unplanned)}")
+    for key in ("directory", "shards"):
+        values = sorted({str(plan[key]) for plan in plans})
+        if len(values) > 1:
+            raise ValueError(f"Teilergebnisse aus verschiedenen Plänen ({key}: {', '.join(values)})")
+    seen: dict[int, str] = {}
+    for plan, path in zip(plans, paths):
+        if plan["shard"] in seen:
+            raise ValueError(f"Shard {plan['shard']}/{plan['shards']} doppelt: {seen[plan['shard']]}, {path}")
+        seen[plan["shard"]] = path
+    missing = [str(shard) for shard in range(1, plans[0]["shards"] + 1) if shard not in seen]
+    if missing:
+        raise ValueError(f"Unvollständig: Shard {', '.join(missing)} von {plans[0]['shards']} fehlt "
+                         f"({plans[0]['directory']})")
+
+
+def default_partial_path(manifest_path: str, kind: str) -> str:
+    """Teilergebnis neben dem Manifest: shard-001-of-004.manifest.json → shard-001-of-004.analyze.json.gz."""
+    base = manifest_path[:-len(".manifest.json")] if manifest_path.endswith(".manifest.json") \
+        else os.path.splitext(manifest_path)[0]
+    return base + PARTIAL_SUFFIXES[kind]
+
+
+def save_events_partial(result_df: pd.DataFrame, stats: dict, manifest: dict, path: str) -> None:
+    """Speichert den Ereignis-DataFrame eines Shards spaltenweise samt Kennzahlen (gzip bei Endung .gz)."""
+    columns = {}
+    for col in result_df.columns:
+        values = result_df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            columns[col] = {"categories": [str(c) for c in values.cat.categories],
+                            "codes": values.cat.codes.tolist()}
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            columns[col] = {"epoch_seconds": values.to_numpy().astype("datetime64[s]").astype(np.int64).tolist()}
+        else:
+            columns[col] = {"values": values.tolist()}
+    payload = {"kind": "analyze", "version": EVENTS_PARTIAL_VERSION, "directory": manifest["directory"],
+               "shard": manifest["shard"], "shards": manifest["shards"], "files": manifest["files"],
+               "stats": stats, "rows": len(result_df), "columns": columns}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def _read_payload(path: str) -> dict:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _events_frame(payload: dict) -> pd.DataFrame:
+    columns = {}
+    for col, spec in payload["columns"].items():
+        if "categories" in spec:
+            columns[col] = pd.Categorical.from_codes(np.asarray(spec["codes"], dtype=np.int32),
+                                                     categories=spec["categories"])
+        elif "epoch_seconds" in spec:
+            columns[col] = np.asarray(spec["epoch_seconds"], dtype=np.int64).view("datetime64[s]")
+        else:
+            columns[col] = spec["values"]
+    return pd.DataFrame(columns)
+
+
+def expand_partial_paths(patterns: Iterable[str]) -> list[str]:
+    """Pfade und Glob-Muster (z. B. "./shards/*.analyze.json.gz") → sortierte, eindeutige Dateiliste."""
+    paths: list[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+def merge_events_partials(paths: list[str]) -> tuple[pd.DataFrame, dict]:
+    """
+    Führt analyze-Teilergebnisse zusammen: Ergebnis wie analyze über das ganze Verzeichnis
+    (Zeilen nach Dateiname, innerhalb einer Datei in Logreihenfolge). Überschneidende Shards → ValueError.
+    """
+    payloads = [_read_payload(path) for path in paths]
+    for payload, path in zip(payloads, paths):
+        if payload.get("kind") != "analyze" or payload.get("version") != EVENTS_PARTIAL_VERSION:
+            raise ValueError(f"Kein analyze-Teilergebnis (Version {EVENTS_PARTIAL_VERSION}): {path}")
+    check_plan([shard_plan(payload) for payload in payloads], paths)
+
+    frames, seen = [], {}
+    stats = {"files": [], "error_counts": {}, "events": 0}
+    for payload, path in zip(payloads, paths):
+        for fname in payload["files"]:
+            if fname in seen:
+                raise ValueError(f"Datei {fname} kommt in mehreren Teilergebnissen vor: {seen[fname]}, {path}")
+            seen[fname] = path
+        frames.append(_events_frame(payload))
+        stats["files"].extend(payload["stats"]["files"])
+        for error_type, count in payload["stats"]["error_counts"].items():
+            stats["error_counts"][error_type] = stats["error_counts"].get(error_type, 0) + count
+        stats["events"] += payload["stats"]["events"]
+
+    result_df = concat_events(frames)
+    if "source_file" in result_df.columns:
+        order = np.argsort(result_df["source_file"].astype(str).to_numpy(), kind="stable")
+        result_df = result_df.iloc[order].reset_index(drop=True)
+        result_df["source_file"] = result_df["source_file"].cat.reorder_categories(
+            sorted(result_df["source_file"].cat.categories))
+    return result_df, stats
+
+
+def partial_kind(path: str) -> str:
+    """
+    'analyze' oder 'compare' – Art eines Teilergebnisses anhand der Endung, sonst anhand des Dateianfangs
+    ("kind" steht vorn im JSON; ältere compare-Teilergebnisse ohne "kind" beginnen mit "version" und "mode").
+    """
+    for kind, suffix in PARTIAL_SUFFIXES.items():
+        if path.endswith(suffix) or path.endswith(suffix[:-len(".gz")]):
+            return kind
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        head = f.read(256)
+    match = _KIND_RE.search(head)
+    if match and match.group(1) in PARTIAL_SUFFIXES:
+        return match.group(1)
+    if '"mode":' in head:
+        return "compare"
+    raise ValueError(f"Unbekanntes Teilergebnis: {path}")
+
+
+def merge_compare_partials(paths: list[str], output: Optional[str] = None) -> pd.DataFrame:
+    """
+    Führt compare-logs-Teilergebnisse zusammen; Ergebnis wie compare_error_logs über das ganze Verzeichnis.
+    Überschneidende Teilergebnisse und unvollständige Pläne → ValueError (wie merge_events_partials).
+    """
+    from src.fleet_compare import load_partial, partial_to_frame, save_partial, tree_merge
+
+    partials = [load_partial(path) for path in paths]
+    check_plan([partial.pop("plan", None) for partial in partials], paths)
+    partial = tree_merge(partials)
+    partial["files"] = dict(sorted(partial["files"].items()))
+    if output:
+        save_partial(partial, output)
+    return partial_to_frame(partial, by_name=partial["mode"] == "custom")
@@ -35,7 +35,7 @@ class TextAnalyzer:
         max_words = 0
         for filename in self.txt_files:
             path = os.path.join(self.directory, filename)
-            text = read_text_file(path)
+            text = read_text_file(path, errors="replace")
             if text:
                 lines = text.count('\n') + 1
                 words = word_count(text)
@@ -135,6 +135,13 @@ class TextAnalyzer:
         try:
             if file_format.lower() == "json":
                 df.to_json(export_path, orient="records", indent=2)
+            elif file_format.lower() == "xlsx":
+                from src.file_writer import stream_tables_to_xlsx
+                correlations = df[["lines", "words", "chars", "bytes"]].corr().round(2).reset_index()
+                stream_tables_to_xlsx({"file_stats": df, "correlations": correlations}, export_path)
+            elif file_format.lower() == "jsonl":
+                from src.file_writer import stream_dataframe_to_jsonl
+                stream_dataframe_to_jsonl(df, export_path)
             else:
                 df.to_csv(export_path, index=False)
 
@@ -0,0 +1,124 @@
+# src/upload_analysis.py – Einmalige, blockweise Analyse hochgeladener Logs (für die Streamlit-GUI)
+#
+# Ein Upload wird über seinen Inhalts-Hash identifiziert und genau einmal geparst. Dekodiert und geparst wird
+# blockweise (kein zusammengesetzter Gesamttext); Diagramme und Tabellen der GUI nutzen nur die hier
+# berechneten Aggregate, damit Button-Klicks und andere Reruns den Log nicht erneut verarbeiten.
+
+import io
+import codecs
+import hashlib
+from typing import Callable, Iterator, Optional
+import pandas as pd
+import matplotlib.pyplot as plt
+from src.data_analysis import parse_log_events, suggest_classes
+from src.event_buffer import EventBuffer
+from src.emba_parser import evaluate_firmware_acceptance
+from src.profiling import profiled
+from src.event_schema import observed_counts
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def content_hash(data: bytes) -> str:
+    """Schlüssel eines Uploads (BLAKE2b, 128 Bit) – gleicher Inhalt, gleicher Cache-Eintrag."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def iter_line_chunks(data: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple[list[str], int]]:
+    """
+    Liefert (vollständige Zeilen, bisher verarbeitete Bytes) je Block.
+    Über Blockgrenzen geteilte Zeilen und UTF-8-Sequenzen werden zusammengesetzt; ungültige Bytes werden ersetzt.
+    """
+    view = memoryview(data)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    rest = ""
+    for offset in range(0, len(view), chunk_size):
+        end = min(offset + chunk_size, len(view))
+        lines = (rest + decoder.decode(view[offset:end], final=end == len(view))).split("\n")
+        rest = lines.pop()
+        yield lines, end
+    if rest:
+        yield [rest], len(view)
+
+
+@profiled("parse")
+def analyze_upload(data: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   progress: Optional[Callable[[int, int], None]] = None) -> dict:
+    """
+    Parst einen Upload blockweise (klassifiziert) und berechnet alle Aggregate der GUI in einem Durchlauf.
+    progress(verarbeitete_bytes, gesamt_bytes) wird nach jedem Block aufgerufen.
+    """
+    events = EventBuffer(levels=True, messages=True)
+    line_count = 0
+    for lines, done in iter_line_chunks(data, chunk_size):
+        line_count += len(lines)
+        parse_log_events(lines, classify=True, events=events)
+        if progress is not None:
+            progress(done, len(data))
+
+    df = events.to_frame() if len(events) else pd.DataFrame()
+    status, reason = evaluate_firmware_acceptance(df)
+    if df.empty:
+        counts = pd.Series(dtype="int64")
+        hourly = pd.DataFrame()
+        suggestions = {}
+    else:
+        counts = observed_counts(df["error_type"])
+        hourly = df.groupby([df["timestamp"].dt.floor("h"), "error_type"], observed=True).size().unstack(fill_value=0)
+        suggestions = {str(k): int(v) for k, v in suggest_classes(df["message"]).items()}
+        df.attrs["suggested_classes"] = suggestions
+
+    return {
+        "digest": content_hash(data),
+        "bytes": len(data),
+        "lines": line_count,
+        "df": df,
+        "status": bool(status),
+        "reason": reason,
+        "counts": counts,
+        "hourly": hourly,
+        "suggested_classes": suggestions,
+    }
+
+
+def _figure_png(fig) -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def render_charts(analysis: dict) -> dict[str, bytes]:
+    """
+    PNG-Diagramme aus den Aggregaten (Verteilung, gestapelter Zeitverlauf, Heatmap).
+    Das Ergebnis wird in analysis["charts"] abgelegt und bei weiteren Aufrufen wiederverwendet.
+    """
+    if "charts" in analysis:
+        return analysis["charts"]
+    charts = {}
+    counts, hourly = analysis["counts"], analysis["hourly"]
+    if not counts.empty:
+        fig, ax = plt.subplots()
+        counts.plot(kind="bar", color="tomato", ax=ax)
+        ax.set_ylabel("Anzahl")
+        ax.set_xlabel("Fehlertyp")
+        ax.set_title("Verteilung der Fehlerarten")
+        charts["error_types"] = _figure_png(fig)
+    if not hourly.empty:
+        import seaborn as sns
+
+        fig, ax = plt.subplots(figsize=(12, 5))
+        hourly.plot(kind="bar", stacked=True, ax=ax)
+        ax.set_xlabel("Zeit (Stunde)")
+        ax.set_ylabel("Fehleranzahl")
+        ax.set_title("Gestapelte Fehler über Zeit")
+        charts["error_stacked_bar"] = _figure_png(fig)
+
+        fig, ax = plt.subplots(figsize=(12, 4))
+        sns.heatmap(hourly.T, annot=True, fmt=".0f", cmap="YlGnBu", ax=ax, cbar_kws={"label": "Fehleranzahl"})
+        ax.set_xlabel("Zeit (Stunde)")
+        ax.set_ylabel("Fehlerart")
+        ax.set_title("Heatmap: Fehlerarten über Zeit")
+        charts["error_heatmap"] = _figure_png(fig)
+    analysis["charts"] = charts
+    return charts
@@ -4,7 +4,9 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import os
+from src.profiling import profiled
 
+@profiled("render")
 def plot_analysis(data, output_dir="./charts"):
     """Erstellt und speichert grundlegende Visualisierungen aus der Analyse."""
     summary_dir = os.path.join(output_dir, "summary")
@@ -32,6 +34,7 @@ def plot_analysis(data, output_dir="./charts"):
 
     print(f"✅ Zusammenfassende Charts gespeichert unter: {summary_dir}")
 
+@profiled("render")
 def plot_trends(data, output_dir="./charts"):
     """Erstellt Trend-Scatterplots zur Untersuchung von Zusammenhängen."""
     trends_dir = os.path.join(output_dir, "trends")
@@ -58,6 +61,7 @@ def plot_trends(data, output_dir="./charts"):
 
     print(f"✅ Trend-Charts gespeichert unter: {trends_dir}")
 
+@profiled("render")
 def plot_error_types(data, output_dir="./charts"):
     """Visualisiert die Verteilung der Fehlerarten pro Datei als gestapeltes Balkendiagramm."""
     # DataFrame aus der Fehleranalyse aufbauen
@@ -105,3 +109,33 @@ def plot_error_types(data, output_dir="./charts"):
     print(f"✅ Fehlerart-Chart gespeichert unter: {output_path}")
 
 
+
+@profiled("render")
+def plot_entropy_profile(profile, output_dir="./charts/binary"):
+    """Zeichnet das Entropie-Profil eines Firmware-Images (analyze_binary_file) mit markierten Bereichen."""
+    os.makedirs(output_dir, exist_ok=True)
+    sns.set_theme(style="whitegrid")
+
+    offsets_mb = profile["offsets"] / (1024 * 1024)
+    plt.figure(figsize=(12, 5))
+    plt.plot(offsets_mb, profile["entropy"], color="steelblue", linewidth=0.8)
+    for region in profile["regions"]:
+        color = "red" if region["kind"] == "high" else "grey"
+        plt.axvspan(region["start"] / (1024 * 1024), region["end"] / (1024 * 1024), color=color, alpha=0.15)
+    plt.axhline(profile["thresholds"]["high"], color="red", linestyle="--", linewidth=0.8,
+                label="komprimiert/verschlüsselt")
+    plt.axhline(profile["thresholds"]["low"], color="grey", linestyle="--", linewidth=0.8, label="Füllbereich")
+    plt.ylim(0, 8.2)
+    plt.xlabel("Offset (MB)")
+    plt.ylabel("Entropie (Bit/Byte)")
+    plt.title(f"Entropie-Profil: {os.path.basename(profile['path'])} "
+              f"(Fenster {profile['window']} B, Schritt {profile['step']} B)")
+    plt.legend(loc="lower right")
+    plt.tight_layout()
+
+    output_path = os.path.join(output_dir, f"{os.path.basename(profile['path'])}_entropy.png")
+    plt.savefig(output_path)
+    plt.close()
+
+    print(f"✅ Entropie-Profil gespeichert unter: {output_path}")
+    return output_path
@@ -0,0 +1,114 @@
+# tests/test_analysis_server.py – Tests für den lokalen Analyse-Server und den Client-Modus
+
+import os
+import shutil
+import socket
+import asyncio
+import tempfile
+import threading
+import unittest
+from src.analysis_server import ServerError, check_loopback, parse_address, send_request, submit, run_server
+from src.analysis_tasks import check_firmware_file
+from src.metrics import REGISTRY, DEPLOYMENT_DECISIONS, FILES_PROCESSED
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), "..", "data_250503", "sensor_data_with_lots_errors.txt")
+
+
+class TestAnalysisServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.address = os.path.join(cls.tmp_dir, "analyzer.sock")
+        started = threading.Event()
+        cls.thread = threading.Thread(
+            target=lambda: asyncio.run(run_server(cls.address, workers=1, ready=lambda server: started.set())),
+            daemon=True,
+        )
+        cls.thread.start()
+        if not started.wait(30):
+            raise RuntimeError("Analyse-Server nicht gestartet")
+
+    @classmethod
+    def tearDownClass(cls):
+        submit(cls.address, {"command": "shutdown"}, timeout=30)
+        cls.thread.join(30)
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def setUp(self):
+        REGISTRY.reset()
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("tcp://127.0.0.1:8765"), ("tcp", ("127.0.0.1", 8765)))
+        self.assertEqual(parse_address("./.cache/analyzer.sock"), ("unix", "./.cache/analyzer.sock"))
+        self.assertEqual(parse_address("tcp://[::1]:8765"), ("tcp", ("::1", 8765)))
+
+    def test_only_loopback_and_private_socket(self):
+        for host in ("127.0.0.1", "::1", "localhost"):
+            check_loopback(host)
+        for host in ("0.0.0.0", "::", "192.168.1.10"):
+            with self.subTest(host=host), self.assertRaises(ValueError):
+                check_loopback(host)
+        with self.assertRaises(ValueError):
+            asyncio.run(run_server("tcp://0.0.0.0:0", workers=1))
+        self.assertEqual(os.stat(self.address).st_mode & 0o777, 0o600)
+        self.assertFalse([name for name in os.listdir(self.tmp_dir) if name.startswith(".ffa-")])
+
+    def test_tcp_client_over_ipv6_loopback(self):
+        with socket.socket(socket.AF_INET6, socket.SOCK_STREAM) as listener:
+            listener.bind(("::1", 0))
+            listener.listen(1)
+
+            def answer():
+                conn, _ = listener.accept()
+                with conn, conn.makefile("rb") as f:
+                    f.readline()
+                    conn.sendall(b'{"ok": true, "result": "pong"}\n')
+
+            thread = threading.Thread(target=answer, daemon=True)
+            thread.start()
+            port = listener.getsockname()[1]
+            self.assertEqual(submit(f"tcp://[::1]:{port}", {"command": "ping"}, timeout=10), "pong")
+            thread.join(10)
+
+    def test_ping(self):
+        result = submit(self.address, {"command": "ping"}, timeout=30)
+        self.assertEqual(result["workers"], 1)
+
+    def test_check_firmware_matches_local_result(self):
+        remote = submit(self.address, {"command": "check-firmware-status", "filepath": os.path.abspath(LOG_FILE)},
+                        timeout=60)
+        REGISTRY.reset()
+        local = check_firmware_file(LOG_FILE)
+        self.assertFalse(remote["status"])
+        self.assertEqual(remote["reason"], local["reason"])
+        self.assertEqual(remote["error_counts"], local["error_counts"])
+
+    def test_server_records_metrics(self):
+        submit(self.address, {"command": "check-firmware-status", "filepath": os.path.abspath(LOG_FILE)}, timeout=60)
+        self.assertEqual(FILES_PROCESSED.value, 1)
+        self.assertEqual(DEPLOYMENT_DECISIONS.labels("blocked").value, 1)
+
+    def test_analyze_exports_in_worker(self):
+        export = os.path.join(self.tmp_dir, "events.csv")
+        result = submit(self.address, {"command": "analyze", "dir": os.path.dirname(os.path.abspath(LOG_FILE)),
+                                       "export": export, "format": "csv"}, timeout=60)
+        self.assertGreater(result["events"], 0)
+        self.assertEqual(result["exported"], export)
+        self.assertTrue(os.path.exists(export))
+
+    def test_errors_are_reported(self):
+        response = send_request(self.address, {"command": "check-firmware-status",
+                                               "filepath": os.path.join(self.tmp_dir, "fehlt.txt")}, timeout=30)
+        self.assertFalse(response["ok"])
+        self.assertIn("FileNotFoundError", response["error"])
+        with self.assertRaises(ServerError):
+            submit(self.address, {"command": "unbekannt"}, timeout=30)
+
+    def test_unreachable_server(self):
+        with self.assertRaises(ServerError):
+            submit(os.path.join(self.tmp_dir, "kein.sock"), {"command": "ping"}, timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# tests/test_batch_report.py – Tests für die Batch-Reportgenerierung
+
+import os
+import shutil
+import tempfile
+import unittest
+from src.batch_report import generate_batch_reports
+
+
+class TestBatchReport(unittest.TestCase):
+
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        logs = {
+            "device_a.txt": "2025-05-01 10:00:00 [ERROR] Sensor failed: ID 3\n"
+                            "2025-05-01 10:05:00 [ERROR] Voltage drop detected: 10.2V\n",
+            "device_b.txt": "2025-05-01 11:00:00 [ERROR] Firmware exception at address 0x5C4F\n",
+            "device_c.txt": "2025-05-01 11:00:00 INFO System started\n",
+        }
+        for name, content in logs.items():
+            with open(os.path.join(self.input_dir, name), "w", encoding="utf-8") as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.input_dir)
+        shutil.rmtree(self.output_dir)
+
+    def test_reports_are_isolated_per_file(self):
+        index_df = generate_batch_reports(self.input_dir, output_root=self.output_dir, workers=2, create_zip=True)
+
+        self.assertEqual(list(index_df["filename"]), ["device_a.txt", "device_b.txt", "device_c.txt"])
+        for stem in ["device_a", "device_b"]:
+            report_dir = os.path.join(self.output_dir, stem, "errors")
+            self.assertTrue(os.path.isfile(os.path.join(report_dir, "fehlerreport.pdf")))
+            self.assertTrue(os.path.isfile(os.path.join(report_dir, "error_report_bundle.zip")))
+
+        status = dict(zip(index_df["filename"], index_df["status"]))
+        self.assertEqual(status["device_a.txt"], "ok")
+        self.assertEqual(status["device_c.txt"], "empty")
+        self.assertEqual(int(index_df.loc[index_df["filename"] == "device_a.txt", "events"].iloc[0]), 2)
+
+    def test_invalid_utf8_is_replaced_and_counted(self):
+        with open(os.path.join(self.input_dir, "device_b.txt"), "wb") as f:
+            f.write(b"2025-05-01 11:00:00 [ERROR] Firmware exception \xff\xfe at address 0x5C4F\n")
+        index_df = generate_batch_reports(self.input_dir, output_root=self.output_dir, workers=1)
+        row = index_df[index_df["filename"] == "device_b.txt"].iloc[0]
+        self.assertEqual(row["status"], "ok")
+        self.assertEqual(int(row["events"]), 1)
+        self.assertEqual(int(row["invalid_bytes"]), 2)
+
+    def test_summary_index_written(self):
+        generate_batch_reports(self.input_dir, output_root=self.output_dir, workers=1)
+        self.assertTrue(os.path.isfile(os.path.join(self.output_dir, "index.csv")))
+        self.assertTrue(os.path.isfile(os.path.join(self.output_dir, "index.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+# tests/test_benchmarks.py – Tests für Log-Generator und Benchmark-Suite
+
+import os
+import shutil
+import tempfile
+import unittest
+from benchmarks.generator import write_synthetic_log, iter_log_lines, parse_size
+from benchmarks.suite import _read_log_prefix, run_suite
+from benchmarks.history import (append_history, compare_reports, compare_samples, find_baseline,
+                                host_fingerprint, load_history)
+from src.error_timeparser import build_error_dataframe
+
+
+class TestLogGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("1MB"), 1024 ** 2)
+        self.assertEqual(parse_size("10 gb"), 10 * 1024 ** 3)
+        self.assertEqual(parse_size("512"), 512)
+        with self.assertRaises(ValueError):
+            parse_size("viel")
+
+    def test_deterministic_and_sized(self):
+        first = write_synthetic_log(os.path.join(self.tmp_dir, "a.txt"), 200_000, seed=7)
+        second = write_synthetic_log(os.path.join(self.tmp_dir, "b.txt"), 200_000, seed=7)
+        self.assertLessEqual(first["bytes"], 200_000)
+        self.assertGreater(first["bytes"], 199_000)
+        with open(first["path"], "rb") as a, open(second["path"], "rb") as b:
+            content = a.read()
+            self.assertEqual(content, b.read())
+        self.assertTrue(content.endswith(b"\n"))
+        self.assertEqual(content.count(b"\n"), first["lines"])
+
+    def test_in_memory_input_is_capped_at_line_boundary(self):
+        info = write_synthetic_log(os.path.join(self.tmp_dir, "a.txt"), 50_000, seed=3)
+        prefix = _read_log_prefix(info["path"], limit=10_000)
+        self.assertLessEqual(len(prefix.encode("utf-8")), 10_000)
+        self.assertTrue(prefix.endswith("\n"))
+        with open(info["path"], encoding="utf-8") as f:
+            content = f.read()
+        self.assertTrue(content.startswith(prefix))
+        self.assertEqual(_read_log_prefix(info["path"], limit=1_000_000), content)
+
+    def test_formats_match_sample_logs(self):
+        lines = iter_log_lines("mixed", seed=1)
+        sample = [next(lines) for _ in range(500)]
+        self.assertTrue(any(" [ERROR] " in line for line in sample))
+        self.assertTrue(any(line.startswith("Reached waypoint") for line in sample))
+        self.assertTrue(any("Temperature:" in line for line in sample))
+        self.assertFalse(build_error_dataframe(sample).empty)
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_run_suite_reports_throughput(self):
+        workdir = tempfile.mkdtemp()
+        try:
+            report = run_suite("64KB", repeat=2, names=["build_error_dataframe", "emba_streaming"],
+                               workdir=workdir, isolate=False)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        self.assertEqual(set(report["results"]), {"build_error_dataframe", "emba_streaming"})
+        for result in report["results"].values():
+            self.assertEqual(len(result["timings_s"]), 2)
+            self.assertGreater(result["lines_per_s"], 0)
+            self.assertGreater(result["mb_per_s"], 0)
+        self.assertIn("python", report["host"])
+        memory = report["results"]["build_error_dataframe"]["frame_memory"]
+        self.assertGreater(memory["rows"], 0)
+        self.assertLess(memory["compact_mb"], memory["object_mb"])
+        self.assertNotIn("frame_memory", report["results"]["emba_streaming"])
+
+
+class TestBenchmarkHistory(unittest.TestCase):
+
+    def test_compare_samples_detects_regression_beyond_tolerance(self):
+        baseline = [1.00, 1.02, 0.98, 1.01, 0.99]
+        self.assertEqual(compare_samples(baseline, [1.30, 1.32, 1.29, 1.31, 1.28], 0.10)["status"], "regression")
+        self.assertEqual(compare_samples(baseline, [1.05, 1.03, 1.06, 1.04, 1.05], 0.10)["status"], "ok")
+        self.assertEqual(compare_samples(baseline, [0.50, 0.52, 0.49, 0.51, 0.50], 0.10)["status"], "improvement")
+
+    def test_noisy_samples_are_not_flagged(self):
+        result = compare_samples([1.0, 1.6, 0.7, 1.3], [1.2, 1.9, 0.8, 1.5], 0.10)
+        self.assertGreater(result["change"], 0.10)
+        self.assertEqual(result["status"], "ok")
+
+    def test_history_roundtrip_and_baseline_selection(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "history.jsonl")
+            host = {"python": "3.11", "platform": "Linux", "machine": "x86_64", "cpu_count": 8}
+            report = {"size": "1MB", "log_format": "mixed", "host": host,
+                      "results": {"classify_custom_error": {"timings_s": [1.0, 1.01, 0.99]}}}
+            append_history(report, path, commit="aaa1111")
+            append_history(dict(report, size="1GB"), path, commit="bbb2222")
+            append_history(report, path, commit="ccc3333")
+            append_history(report, path, commit="ddd4444", source="compare")
+            append_history(dict(report, results={"emba_streaming": {"timings_s": [0.5]}}), path, commit="eee5555")
+            history = load_history(path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        fingerprint = host_fingerprint(host)
+        self.assertEqual(len(history), 5)
+        self.assertEqual(find_baseline(history, fingerprint, "1MB", "mixed")["commit"], "eee5555")
+        # Vergleichsläufe und Einträge ohne die verfolgten Benchmarks sind keine Baseline
+        self.assertEqual(find_baseline(history, fingerprint, "1MB", "mixed",
+                                       tracked=("classify_custom_error",))["commit"], "ccc3333")
+        self.assertIsNone(find_baseline(history, fingerprint, "1MB", "mixed", commit="ddd",
+                                        tracked=("classify_custom_error",)))
+        self.assertIsNone(find_baseline(history, fingerprint, "1MB", "mixed",
+                                        tracked=("classify_custom_error", "emba_streaming")))
+        self.assertEqual(find_baseline(history, fingerprint, "1MB", "mixed", commit="aaa")["commit"], "aaa1111")
+        self.assertIsNone(find_baseline(history, "anderer-host", "1MB", "mixed"))
+
+        slower = {"results": {"classify_custom_error": {"timings_s": [1.5, 1.52, 1.49]}}}
+        comparison = compare_reports(history[0], slower, ("classify_custom_error", "emba_streaming"))
+        self.assertEqual(list(comparison), ["classify_custom_error"])
+        self.assertEqual(comparison["classify_custom_error"]["status"], "regression")
+
+
+if __name__ == "__main__":
+    unittest.main()
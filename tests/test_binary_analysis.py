@@ -0,0 +1,67 @@
+# tests/test_binary_analysis.py – Tests für das Entropie-Profil von Firmware-Images
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.binary_analysis import analyze_binary_file, entropy_profile, find_regions, synthetic_image
+from src.visualizer import plot_entropy_profile
+
+
+def _reference_entropy(window: np.ndarray) -> float:
+    counts = np.bincount(window, minlength=256)
+    p = counts[counts > 0] / len(window)
+    return float(-(p * np.log2(p)).sum())
+
+
+class TestBinaryAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_matches_reference_entropy(self):
+        buf = np.frombuffer(synthetic_image(300_000, seed=1), dtype=np.uint8)
+        for window, step in ((4096, 1024), (2048, 2048), (65536, 512)):
+            with self.subTest(window=window, step=step):
+                profile = entropy_profile(buf, window, step)
+                self.assertEqual(len(profile["entropy"]), (len(buf) - window) // step + 1)
+                for i in (0, len(profile["entropy"]) // 2, len(profile["entropy"]) - 1):
+                    start = int(profile["offsets"][i])
+                    self.assertAlmostEqual(profile["entropy"][i], _reference_entropy(buf[start:start + window]))
+                self.assertEqual(int(profile["histogram"].sum()), len(buf))
+
+    def test_small_and_invalid_inputs(self):
+        profile = entropy_profile(np.frombuffer(b"abcd", dtype=np.uint8))
+        self.assertEqual(profile["entropy"].tolist(), [2.0])
+        with self.assertRaises(ValueError):
+            entropy_profile(np.zeros(10, dtype=np.uint8), window=1000, step=300)
+
+    def test_regions_and_plot(self):
+        path = os.path.join(self.tmp_dir, "fw.bin")
+        with open(path, "wb") as f:
+            f.write(synthetic_image(3 * 1024 * 1024))
+        profile = analyze_binary_file(path)
+        self.assertEqual([region["kind"] for region in profile["regions"]], ["low", "high"])
+        low, high = profile["regions"]
+        self.assertEqual(low["start"], 0)
+        self.assertEqual(high["end"], 3 * 1024 * 1024)
+        self.assertGreater(high["mean_entropy"], 7.9)
+        self.assertEqual(find_regions(profile, min_bytes=10 * 1024 * 1024), [])
+
+        chart = plot_entropy_profile(profile, os.path.join(self.tmp_dir, "charts"))
+        self.assertTrue(os.path.getsize(chart) > 0)
+
+    def test_empty_file(self):
+        path = os.path.join(self.tmp_dir, "empty.bin")
+        open(path, "wb").close()
+        profile = analyze_binary_file(path)
+        self.assertEqual(profile["size"], 0)
+        self.assertEqual(profile["regions"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_bytes_reading.py – Tests für die Bytes-Auswertung und tolerantes Einlesen
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.analysis_tasks import analyze_directory
+from src.error_timeparser import build_error_dataframe, build_error_dataframe_bytes
+from src.event_buffer import epoch_seconds, epoch_seconds_at, find_timestamps
+from src.file_reader import count_invalid_bytes, read_text_file
+
+LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "data_250503")
+
+EDGE_CASES = (
+    b"2025-02-30 10:00:00 [ERROR] ungueltiges Datum\n"
+    b"2025-01-01 24:00:00 error ungueltige Stunde\n"
+    b"\xff\xfe 2024-02-29 23:59:59 Collision ERROR timeout\n"
+    b"kein Zeitstempel, aber error\n"
+    b"2025-04-27 06:00:30 2024-01-01 00:00:00 Sensor FAILED\r\n"
+    b"12025-04-27 06:00:301 low voltage\n"
+    b"2025-04-27 6:00:30 error\n"
+    b"2025-04-27 06:01:00 error cr\r2025-04-27 06:01:01 sensor failed\r"  # serielle Konsole: nur \r
+    b"2025-04-27 06:01:02 timeout\x0c2025-04-27 06:01:03 low voltage\r\n"  # Seitenvorschub
+    b"2025-04-27 06:00:31 Voltage drop \xc3 ohne Zeilenende"
+)
+
+
+class TestBytesReading(unittest.TestCase):
+
+    def test_matches_text_parser_on_sample_logs(self):
+        for fname in sorted(os.listdir(LOG_DIR)):
+            with self.subTest(fname=fname):
+                with open(os.path.join(LOG_DIR, fname), "rb") as f:
+                    data = f.read()
+                expected = build_error_dataframe(data.decode("utf-8").splitlines())
+                self.assertTrue(build_error_dataframe_bytes(data).equals(expected))
+
+    def test_matches_text_parser_on_edge_cases(self):
+        expected = build_error_dataframe(EDGE_CASES.decode("utf-8", errors="replace").splitlines())
+        result = build_error_dataframe_bytes(EDGE_CASES)
+        self.assertTrue(result.equals(expected))
+        self.assertEqual(result["error_type"].tolist(), ["communication_error", "sensor_error", "voltage_warning",
+                                                         "generic_error", "sensor_error", "communication_error",
+                                                         "voltage_warning", "voltage_warning"])
+
+    def test_vectorized_timestamps(self):
+        buf = np.frombuffer(EDGE_CASES, dtype=np.uint8)
+        starts = find_timestamps(buf)
+        seconds, valid = epoch_seconds_at(buf, starts)
+        for start, value, ok in zip(starts, seconds, valid):
+            expected = epoch_seconds(EDGE_CASES[start:start + 19].decode("ascii"))
+            self.assertEqual(value if ok else None, expected)
+        self.assertEqual(len(starts), 11)
+
+    def test_count_invalid_bytes(self):
+        self.assertEqual(count_invalid_bytes(b"nur ascii"), 0)
+        self.assertEqual(count_invalid_bytes("gültig: äöü €".encode("utf-8")), 0)
+        self.assertEqual(count_invalid_bytes(EDGE_CASES), 3)
+        self.assertEqual(count_invalid_bytes(b"\xed\xa0\x80"), 3)  # kodiertes Surrogat ist ungültig
+
+    def test_tolerant_reading(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(tmp_dir, "serial.txt"), "wb") as f:
+                f.write(EDGE_CASES)
+            self.assertIsNone(read_text_file(os.path.join(tmp_dir, "serial.txt")))
+            text = read_text_file(os.path.join(tmp_dir, "serial.txt"), errors="replace")
+            self.assertIn("�", text)
+
+            result_df, stats = analyze_directory(tmp_dir)
+            deduped_df, _ = analyze_directory(tmp_dir, dedupe=True)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.assertEqual(len(result_df), 8)
+        self.assertEqual(len(deduped_df), 8)
+        self.assertEqual(stats["files"][0]["invalid_bytes"], 3)
+        self.assertEqual(stats["files"][0]["lines"], 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_cve_feed.py – Tests für den Offline-CVE-Index
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from src.cve_feed import CveFeedIndex, enrich_components, version_key
+from src.emba_parser import assign_risk_level
+
+FEED_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "nvdcve-1.1-sample.json")
+
+
+class TestCveFeedIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = CveFeedIndex.from_feeds([FEED_PATH])
+
+    def ids(self, product, version):
+        return [cve_id for cve_id, _, _ in self.index.lookup(product, version)]
+
+    def test_version_ranges(self):
+        self.assertEqual(self.ids("openssl", "1.1.1k"), ["CVE-2021-3711"])
+        self.assertEqual(self.ids("openssl", "1.1.1l"), [])
+        self.assertEqual(self.ids("openssl", "1.0.2a"), ["CVE-2016-2105"])
+        self.assertEqual(self.ids("busybox", "1.35.0"), ["CVE-2022-28391"])
+        self.assertEqual(self.ids("linux_kernel", "4.9"), [])
+        self.assertEqual(self.ids("linux_kernel", "5.4.0"), ["CVE-2020-10713"])
+        self.assertEqual(self.ids("Linux-Kernel", "5.7.0"), [])
+
+    def test_only_vulnerable_cpes_are_indexed(self):
+        self.assertNotIn("alpine_linux", self.index.products)
+
+    def test_version_key(self):
+        self.assertEqual(version_key("4.14"), version_key("4.14.0"))
+        self.assertLess(version_key("1.0.2"), version_key("1.0.2k"))
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.json.gz")
+            self.index.save(path)
+            loaded = CveFeedIndex.load(path)
+        self.assertEqual(loaded.lookup("openssl", "1.1.1k"), self.index.lookup("openssl", "1.1.1k"))
+
+    def test_enrich_and_risk_level(self):
+        df = pd.DataFrame({
+            "component": ["openssl", "busybox", "zlib"],
+            "version": ["1.1.1k", "1.30.1", "1.2.11"],
+            "cves": [0, 0, 0],
+            "exploits": [0, 0, 0],
+        })
+        enriched = enrich_components(df, self.index)
+        self.assertEqual(enriched["feed_cves"].tolist(), [1, 1, 0])
+        self.assertEqual(enriched["max_cvss"].tolist(), [9.8, 8.8, 0.0])
+        self.assertEqual(enriched["feed_severity"].tolist(), ["CRITICAL", "HIGH", ""])
+
+        scored = assign_risk_level(df, cve_index=self.index)
+        self.assertEqual(scored["risk_score"].tolist(), [2, 0, 0])
+
+    def test_enrich_looks_up_each_pair_once(self):
+        n = 50000
+        df = pd.DataFrame({"component": ["openssl", "busybox", "linux_kernel", "zlib"] * (n // 4),
+                           "version": [f"1.{i % 40}.{i % 7}" for i in range(n)], "cves": 0, "exploits": 0})
+        index = CveFeedIndex.from_feeds([FEED_PATH])
+        with mock.patch("src.cve_feed.version_key", wraps=version_key) as parsed:
+            with mock.patch.object(index, "lookup", wraps=index.lookup) as lookup:
+                enriched = enrich_components(df, index)
+        self.assertEqual(len(enriched), n)
+        pairs = set(zip(df["component"], df["version"]))
+        self.assertEqual(lookup.call_count, len(pairs))
+        # Versionsgrenzen werden einmal pro Produkt zerlegt, nicht pro Komponente
+        bounds = sum(value is not None for product in ("openssl", "busybox", "linux_kernel", "zlib")
+                     for entry in index.products.get(product, []) for value in (entry[1], entry[2], entry[4]))
+        self.assertEqual(parsed.call_count, len(pairs) + bounds)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/test_dedupe.py – Tests für die dateiübergreifende Duplikaterkennung
+
+import os
+import unittest
+import numpy as np
+from src.analysis_tasks import analyze_directory
+from src.dedupe import BloomFilter, LineDeduplicator, line_key
+from src.error_visualizer import compare_error_logs
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestDedupe(unittest.TestCase):
+
+    def test_line_key_normalization(self):
+        key = line_key("[2025-04-27 08:36:00] Voltage drop detected: 9.5V\n")
+        self.assertEqual(line_key("2025-04-27 08:36:00   Voltage  drop detected: 9.5V"), key)
+        self.assertNotEqual(line_key("[2025-04-27 08:36:01] Voltage drop detected: 9.5V"), key)
+        self.assertNotEqual(line_key("[2025-04-27 08:36:00] Voltage drop detected: 9.6V"), key)
+        self.assertIsNone(line_key("kein Zeitstempel"))
+        self.assertLess(key, 2 ** 64)
+
+    def test_lines_without_timestamp_are_kept(self):
+        dedupe = LineDeduplicator()
+        lines = ["-----", "-----", "2025-04-27 06:00:00 [ERROR] x", "2025-04-27 06:00:00 [ERROR] x"]
+        self.assertEqual(list(dedupe.filter(lines)), lines[:3])
+        self.assertEqual(dedupe.stats()["duplicates"], 1)
+
+    def test_bloom_fallback_matches_exact(self):
+        lines = [f"2025-04-27 06:{i % 60:02d}:{i // 60 % 60:02d} [ERROR] event {i % 700}" for i in range(3000)]
+        exact = LineDeduplicator()
+        bloom = LineDeduplicator(max_exact=50, bloom_capacity=10_000, fp_rate=1e-6)
+        self.assertEqual(list(bloom.filter(lines)), list(exact.filter(lines)))
+        stats = bloom.stats()
+        self.assertEqual(stats["mode"], "bloom")
+        self.assertLess(stats["false_positive_rate"], 1e-6)
+        self.assertEqual(exact.stats()["mode"], "exact")
+
+    def test_bloom_false_positive_rate_estimate(self):
+        bloom = BloomFilter(capacity=1000, fp_rate=0.01)
+        for i in range(1000):
+            bloom.add(line_key(f"2025-04-27 06:00:00 stored {i}"))
+        self.assertAlmostEqual(bloom.false_positive_rate(), 0.01, delta=0.005)
+        false_positives = sum(line_key(f"2025-04-27 06:00:00 probe {i}") in bloom for i in range(20_000))
+        self.assertLess(false_positives / 20_000, 0.02)
+
+    def test_add_many_matches_single_adds(self):
+        keys = [line_key(f"2025-04-27 06:00:00 event {i % 700}") for i in range(2000)]
+        single, batched = BloomFilter(capacity=10_000, fp_rate=1e-6), BloomFilter(capacity=10_000, fp_rate=1e-6)
+        expected = [single.add(key) for key in keys]
+        got = np.concatenate([batched.add_many(np.array(keys[:900], dtype=np.uint64)),
+                              batched.add_many(np.array(keys[900:], dtype=np.uint64))])
+        self.assertEqual(got.tolist(), expected)
+        self.assertEqual(batched.count, single.count)
+        self.assertEqual(batched.bits, single.bits)
+
+    def test_overlapping_sample_logs_are_counted_once(self):
+        plain = compare_error_logs(DATA_DIR)
+        deduped = compare_error_logs(DATA_DIR, dedupe=True)
+        self.assertLess(deduped["count"].sum(), plain["count"].sum())
+        # log_alpha.txt wird zuerst gelesen und bleibt unverändert
+        self.assertEqual(deduped[deduped["filename"] == "log_alpha.txt"].values.tolist(),
+                         plain[plain["filename"] == "log_alpha.txt"].values.tolist())
+
+        result_df, stats = analyze_directory(DATA_DIR, dedupe=True)
+        self.assertEqual(len(result_df), deduped["count"].sum())
+        self.assertEqual(stats["dedupe"]["duplicates"], stats["dedupe"]["lines"] - len(
+            {line_key(line) for fname in sorted(os.listdir(DATA_DIR))
+             for line in open(os.path.join(DATA_DIR, fname), encoding="utf-8").read().splitlines()} - {None}))
+
+
+if __name__ == "__main__":
+    unittest.main()
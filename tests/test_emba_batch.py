@@ -0,0 +1,50 @@
+# tests/test_emba_batch.py – Tests für die Batch-Auswertung von EMBA-Reportbäumen
+
+import os
+import shutil
+import tempfile
+import unittest
+from benchmarks.bench_emba_parser import write_synthetic_f17_report
+from src.emba_batch import analyze_emba_tree, discover_emba_pages, file_hash
+
+
+class TestEmbaBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.root, "cache")
+        self.report_dirs = []
+        for firmware, components in [("fw_1.0", 30), ("fw_1.1", 40)]:
+            report_dir = os.path.join(self.root, firmware, "html-report")
+            os.makedirs(report_dir)
+            write_synthetic_f17_report(os.path.join(report_dir, "f17_cve_bin_tool.html"), components)
+            with open(os.path.join(report_dir, "p02_firmware_bin_file_check.html"), "w") as f:
+                f.write("<html><pre>irrelevant</pre></html>")
+            self.report_dirs.append(report_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_discovers_only_relevant_pages(self):
+        pages = discover_emba_pages(self.report_dirs)
+        self.assertEqual([(fw, os.path.basename(p)) for fw, p in pages],
+                         [("fw_1.0", "f17_cve_bin_tool.html"), ("fw_1.1", "f17_cve_bin_tool.html")])
+
+    def test_consolidated_frame_and_cache(self):
+        df, stats = analyze_emba_tree(self.report_dirs, workers=2, cache_dir=self.cache_dir)
+        self.assertEqual(stats["cache_hits"], 0)
+        self.assertEqual(len(df), 70)
+        self.assertEqual(df.groupby("firmware").size().to_dict(), {"fw_1.0": 30, "fw_1.1": 40})
+
+        cached_df, stats = analyze_emba_tree(self.report_dirs, workers=1, cache_dir=self.cache_dir)
+        self.assertEqual(stats["cache_hits"], 2)
+        self.assertTrue(cached_df.equals(df))
+
+    def test_cache_key_depends_on_parser_version(self):
+        page = discover_emba_pages(self.report_dirs)[0][1]
+        self.assertNotEqual(file_hash(page, version=1), file_hash(page, version=2))
+        self.assertEqual(file_hash(page), file_hash(page))
+
+
+if __name__ == "__main__":
+    unittest.main()
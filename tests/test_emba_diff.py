@@ -0,0 +1,56 @@
+# tests/test_emba_diff.py – Tests für die CVE-Differenz zwischen Firmware-Releases
+
+import unittest
+import pandas as pd
+from src.emba_diff import diff_emba_components, summarize_diff
+
+
+class TestEmbaDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.old = pd.DataFrame({
+            "component": ["linux_kernel", "busybox", "openssl", "dropbear_ssh"],
+            "version": ["4.14.0", "1.30.1", "1.0.2k", "2019.78"],
+            "cves": [120, 12, 60, 3],
+            "exploits": [6, 0, 2, 0],
+        })
+        self.new = pd.DataFrame({
+            "component": ["linux_kernel", "busybox", "openssl", "dnsmasq"],
+            "version": ["5.10.0", "1.30.1", "1.0.2k", "2.85"],
+            "cves": [40, 12, 61, 1],
+            "exploits": [0, 0, 2, 0],
+        })
+
+    def test_change_types(self):
+        diff = diff_emba_components(self.old, self.new)
+        changes = dict(zip(diff["component"], diff["change"]))
+        self.assertEqual(changes, {
+            "dnsmasq": "added",
+            "dropbear_ssh": "removed",
+            "linux_kernel": "version_changed",
+            "openssl": "counts_changed",
+            "busybox": "unchanged",
+        })
+        kernel = diff[diff["component"] == "linux_kernel"].iloc[0]
+        self.assertEqual((kernel["old_version"], kernel["new_version"]), ("4.14.0", "5.10.0"))
+        self.assertEqual(kernel["cves_delta"], -80)
+        self.assertEqual((kernel["old_risk_level"], kernel["new_risk_level"]), ("kritisch", "hoch"))
+        self.assertTrue(kernel["risk_changed"])
+
+    def test_summary(self):
+        summary = summarize_diff(diff_emba_components(self.old, self.new))
+        self.assertEqual(summary["added"], 1)
+        self.assertEqual(summary["removed"], 1)
+        self.assertEqual(summary["cves_delta"], (40 + 12 + 61 + 1) - (120 + 12 + 60 + 3))
+
+    def test_scales_linearly(self):
+        n = 20000
+        old = pd.DataFrame({"component": [f"comp_{i}" for i in range(n)], "version": "1.0",
+                            "cves": 1, "exploits": 0})
+        new = old.assign(version=["1.0" if i % 2 else "1.1" for i in range(n)])
+        diff = diff_emba_components(old, new)
+        self.assertEqual(summarize_diff(diff)["version_changed"], n // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# tests/test_emba_parser.py – Tests für den Streaming-Parser der EMBA-Reports
+
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from benchmarks.bench_emba_parser import write_synthetic_f17_report
+from src.emba_parser import (extract_cves_streaming, extract_cves_from_f17, extract_cves_auto,
+                             extract_summary_from_index)
+
+INDEX_HTML = """<html><body>
+<pre>[<span class="blue">*</span>] EMBA   firmware analyzer</pre>
+<pre>[<span class="green">+</span>] Identified <b>2449</b> CVE entries.</pre>
+<pre>[+] Critical: 28 &amp; High: 703</pre>
+<pre>[+] Identified 58 verified exploits.</pre>
+<pre>[+] Nicht mehr Teil der Zusammenfassung</pre>
+</body></html>
+"""
+
+
+class TestEmbaStreamingParser(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.f17_path = os.path.join(self.tmp_dir, "f17_cve_bin_tool.html")
+        write_synthetic_f17_report(self.f17_path, components=200)
+        self.index_path = os.path.join(self.tmp_dir, "index.html")
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            f.write(INDEX_HTML)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_matches_beautifulsoup_reference(self):
+        ref_components, ref_summary = extract_cves_from_f17(self.f17_path)
+        for chunk_size in [7, 64, 1024 * 1024]:
+            with self.subTest(chunk_size=chunk_size):
+                components, summary = extract_cves_streaming(self.f17_path, chunk_size=chunk_size)
+                pd.testing.assert_frame_equal(components, ref_components)
+                pd.testing.assert_frame_equal(summary, ref_summary)
+
+    def test_index_summary_matches_reference(self):
+        components, summary = extract_cves_auto(self.index_path)
+        self.assertTrue(components.empty)
+        self.assertEqual(list(components.columns), ["component", "version", "cves", "exploits"])
+        pd.testing.assert_frame_equal(summary, extract_summary_from_index(self.index_path))
+        self.assertEqual(len(summary), 3)
+        self.assertEqual(summary["summary"].iloc[1], "[+] Critical: 28 & High: 703")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# tests/test_event_buffer.py – Tests für den Array-basierten Ereignispuffer
+
+import unittest
+import numpy as np
+import pandas as pd
+from src.event_buffer import EventBuffer, epoch_seconds
+from src.error_timeparser import extract_timestamp
+
+
+class TestEventBuffer(unittest.TestCase):
+
+    def test_epoch_seconds_matches_extract_timestamp(self):
+        for line in ["2025-04-27 06:00:30 [ERROR] Sensor failed", "[2024-02-29 23:59:59] WARN x",
+                     "2025-02-30 10:00:00 ungültiges Datum", "2025-01-01 24:00:00 ungültige Stunde", "kein Zeitstempel"]:
+            with self.subTest(line=line):
+                expected = extract_timestamp(line)
+                result = epoch_seconds(line)
+                if expected is None:
+                    self.assertIsNone(result)
+                else:
+                    self.assertEqual(pd.Timestamp(result, unit="s"), pd.Timestamp(expected))
+
+    def test_growth_and_frame(self):
+        events = EventBuffer(levels=True, messages=True, files=True, offsets=True, capacity=2)
+        a, b = events.file_id("a.txt"), events.file_id("b.txt")
+        for i in range(1000):
+            events.append(1_700_000_000 + i, "sensor_error" if i % 2 else "firmware_issue",
+                          level="ERROR", message=f"msg {i}", file_id=a if i < 500 else b, offset=i * 10)
+        df = events.to_frame()
+        self.assertEqual(len(df), 1000)
+        self.assertEqual(list(df.columns), ["timestamp", "level", "message", "error_type", "source_file", "offset"])
+        self.assertEqual(df["timestamp"].iloc[1], pd.Timestamp(1_700_000_001, unit="s"))
+        self.assertEqual(df["error_type"].value_counts().to_dict(), {"firmware_issue": 500, "sensor_error": 500})
+        self.assertEqual(df["source_file"].iloc[999], "b.txt")
+        self.assertEqual(df["offset"].iloc[999], 9990)
+        self.assertIsInstance(df["error_type"].dtype, pd.CategoricalDtype)
+
+    def test_frame_shares_timestamp_memory(self):
+        events = EventBuffer()
+        events.append(0, "x")
+        df = events.to_frame()
+        self.assertTrue(np.shares_memory(df["timestamp"].to_numpy(), events._timestamps))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# tests/test_event_schema.py – Tests für das kompakte Ereignis-Schema
+
+import os
+import unittest
+import pandas as pd
+from src.analysis_tasks import analyze_directory
+from src.error_timeparser import build_error_dataframe
+from src.event_schema import (compact_events, concat_events, expand_events, memory_usage_mb, message_template,
+                              observed_counts)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data_250503")
+
+
+class TestEventSchema(unittest.TestCase):
+
+    def test_message_template(self):
+        self.assertEqual(message_template("Voltage drop detected: 10.49V"), "Voltage drop detected: <n>V")
+        self.assertEqual(message_template("Firmware exception at address 0x5C4F"), "Firmware exception at address <hex>")
+
+    def test_compact_events_types_and_templates(self):
+        df = compact_events(pd.DataFrame({
+            "timestamp": ["2025-05-21 10:01:00", "2025-05-21 10:02:00"],
+            "level": ["ERROR", "ERROR"],
+            "error_type": ["sensor_failed", "sensor_failed"],
+            "message": ["Sensor failed: ID 3", "Sensor failed: ID 4"],
+        }), templates=True)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["timestamp"]))
+        for col in ("level", "error_type", "message_template"):
+            self.assertIsInstance(df[col].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["message_template"].nunique(), 1)
+        self.assertNotIsInstance(df["message"].dtype, pd.CategoricalDtype)
+
+    def test_concat_keeps_categories(self):
+        a = compact_events(pd.DataFrame({"error_type": ["x", "y"], "source_file": ["a.txt", "a.txt"]}))
+        b = compact_events(pd.DataFrame({"error_type": ["z"], "source_file": ["b.txt"]}))
+        merged = concat_events([a, b])
+        self.assertIsInstance(merged["error_type"].dtype, pd.CategoricalDtype)
+        self.assertEqual(merged["error_type"].tolist(), ["x", "y", "z"])
+        self.assertEqual(list(a["error_type"].cat.categories), ["x", "y"])
+
+    def test_observed_counts_drops_filtered_categories(self):
+        values = pd.Series(["x", "y", "y"], dtype="category")
+        self.assertEqual(observed_counts(values[values == "y"]).to_dict(), {"y": 2})
+
+    def test_producers_use_compact_schema(self):
+        with open(os.path.join(DATA_DIR, "sensor_data_with_lots_errors.txt"), encoding="utf-8") as f:
+            df = build_error_dataframe(f.readlines())
+        self.assertIsInstance(df["error_type"].dtype, pd.CategoricalDtype)
+        result_df, stats = analyze_directory(DATA_DIR)
+        self.assertIsInstance(result_df["source_file"].dtype, pd.CategoricalDtype)
+        self.assertEqual(stats["events"], len(result_df))
+        self.assertLess(memory_usage_mb(result_df), memory_usage_mb(expand_events(result_df)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,16 @@
 # tests/test_file_writer.py – Tests für Exportfunktionen
 
 import os
+import gzip
+import json
+import shutil
+import tempfile
 import unittest
-from src.file_writer import export_to_csv, export_to_json
+import pandas as pd
+from openpyxl import load_workbook
+from src.data_analysis import save_dataframe
+from src.file_writer import (export_to_csv, export_to_json, stream_dataframe_to_csv, stream_dataframe_to_jsonl,
+                             stream_records_to_csv, stream_tables_to_xlsx)
 
 class TestFileWriter(unittest.TestCase):
 
@@ -26,3 +34,77 @@ class TestFileWriter(unittest.TestCase):
     def test_export_json_creates_file(self):
         export_to_json(self.test_data, self.json_path)
         self.assertTrue(os.path.exists(self.json_path))
+
+
+class TestStreamingWriters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            "timestamp": pd.date_range("2025-05-03 10:00:00", periods=25, freq="s"),
+            "error_type": ["Timeout", "Ünterspannung"] * 12 + ["Timeout"],
+            "line": range(25),
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_csv_chunks_write_single_header(self):
+        path = os.path.join(self.tmp_dir, "events.csv")
+        self.assertEqual(stream_dataframe_to_csv(self.df, path, chunk_size=7), 25)
+        loaded = pd.read_csv(path)
+        self.assertEqual(len(loaded), 25)
+        self.assertEqual(list(loaded["line"]), list(range(25)))
+
+    def test_jsonl_gzip_roundtrip(self):
+        path = os.path.join(self.tmp_dir, "events.jsonl.gz")
+        stream_dataframe_to_jsonl(self.df, path, chunk_size=10)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 25)
+        self.assertEqual(records[0]["timestamp"], "2025-05-03 10:00:00")
+        self.assertEqual(records[1]["error_type"], "Ünterspannung")
+
+    def test_json_array_is_valid_json(self):
+        path = os.path.join(self.tmp_dir, "events.json")
+        export_to_json(self.df, path)
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+        self.assertEqual([r["line"] for r in records], list(range(25)))
+
+    def test_json_array_keeps_unicode_line_separators(self):
+        path = os.path.join(self.tmp_dir, "messages.json")
+        messages = ["c\x85d", "e\u2028f", "g\x1ch\x0ci"]
+        export_to_json(pd.DataFrame({"m": messages}), path)
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual([r["m"] for r in json.load(f)], messages)
+
+    def test_save_dataframe_json_keeps_epoch_milliseconds(self):
+        for name in ("events.json", "events.jsonl"):
+            with self.subTest(name=name):
+                path = os.path.join(self.tmp_dir, name)
+                save_dataframe(self.df, path)
+                with open(path, encoding="utf-8") as f:
+                    records = json.load(f) if name.endswith(".json") else [json.loads(line) for line in f]
+                self.assertEqual(records[0]["timestamp"], 1746266400000)
+                self.assertEqual(records[24]["timestamp"], 1746266424000)
+
+    def test_records_iterator_to_csv(self):
+        path = os.path.join(self.tmp_dir, "records.csv")
+        records = ({"file": f"log{i}.txt", "errors": i} for i in range(5))
+        self.assertEqual(stream_records_to_csv(records, path), 5)
+        self.assertEqual(list(pd.read_csv(path)["errors"]), [0, 1, 2, 3, 4])
+
+    def test_xlsx_sheets_split_at_row_limit(self):
+        path = os.path.join(self.tmp_dir, "report.xlsx")
+        stats = [{"filename": "a.txt", "errors": 3}, {"filename": "b.txt", "errors": float("nan")}]
+        sheets = stream_tables_to_xlsx({"events": self.df, "file_stats": stats}, path, max_rows=11, chunk_size=4)
+        self.assertEqual(sheets, {"events": 3, "file_stats": 1})
+
+        workbook = load_workbook(path)
+        self.assertEqual(workbook.sheetnames, ["events", "events (2)", "events (3)", "file_stats"])
+        rows = [list(ws.iter_rows(values_only=True)) for ws in workbook.worksheets]
+        self.assertEqual([len(r) for r in rows], [11, 11, 6, 3])
+        self.assertEqual(rows[0][0], ("timestamp", "error_type", "line"))
+        self.assertEqual(rows[2][-1][2], 24)
+        self.assertEqual(rows[3][2], ("b.txt", None))
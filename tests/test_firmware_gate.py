@@ -0,0 +1,94 @@
+# tests/test_firmware_gate.py – Tests für die Deployment-Entscheidung (Vollauswertung und Streaming)
+
+import os
+import shutil
+import tempfile
+import unittest
+from src.analysis_tasks import check_firmware_file
+from src.emba_parser import evaluate_firmware_acceptance, evaluate_firmware_acceptance_stream
+from src.error_timeparser import build_error_dataframe
+
+LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "data_250503")
+
+
+def _line(minute: int, message: str) -> str:
+    return f"2025-04-27 06:{minute:02d}:00 [ERROR] {message}\n"
+
+
+class TestFirmwareGate(unittest.TestCase):
+
+    def test_stream_matches_full_decision_on_sample_logs(self):
+        for fname in sorted(os.listdir(LOG_DIR)):
+            if not fname.endswith(".txt"):
+                continue
+            with self.subTest(fname=fname):
+                with open(os.path.join(LOG_DIR, fname), encoding="utf-8") as f:
+                    lines = f.readlines()
+                full_status, full_reason = evaluate_firmware_acceptance(build_error_dataframe(lines))
+                status, reason, stats = evaluate_firmware_acceptance_stream(lines)
+                self.assertEqual(status, full_status)
+                if not stats["early_exit"]:
+                    self.assertEqual(reason, full_reason)
+
+    def test_stops_at_second_firmware_issue(self):
+        lines = [_line(0, "Firmware exception at 0x1"), _line(1, "Sensor failed: ID 3"),
+                 _line(2, "Assertion failed in main"), _line(3, "Firmware exception at 0x2")]
+        status, reason, stats = evaluate_firmware_acceptance_stream(iter(lines))
+        self.assertFalse(status)
+        self.assertEqual(reason, "Firmware enthält 2 kritische firmware_issue-Fehler.")
+        self.assertEqual(stats["lines"], 3)
+        self.assertTrue(stats["early_exit"])
+
+    def test_reason_names_first_limit_reached(self):
+        # Vollauswertung priorisiert firmware_issue, Streaming meldet die zuerst erreichte Grenze
+        lines = [_line(i, "Voltage drop detected: 9.5V") for i in range(3)] + \
+                [_line(10 + i, "Firmware exception at 0x1") for i in range(2)]
+        _, full_reason = evaluate_firmware_acceptance(build_error_dataframe(lines))
+        status, reason, _ = evaluate_firmware_acceptance_stream(lines)
+        self.assertFalse(status)
+        self.assertEqual(full_reason, "Firmware enthält 2 kritische firmware_issue-Fehler.")
+        self.assertEqual(reason, "Mehr als 3 Spannungseinbrüche erkannt.")
+
+    def test_accepts_and_handles_empty_logs(self):
+        self.assertEqual(evaluate_firmware_acceptance_stream([])[:2],
+                         (True, "Kein Fehlerprotokoll erkannt – Deployment möglich."))
+        status, reason, stats = evaluate_firmware_acceptance_stream([_line(0, "Sensor failed: ID 1")])
+        self.assertTrue(status)
+        self.assertFalse(stats["early_exit"])
+
+    def test_check_firmware_file_reads_only_until_decision(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "bad.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_line(0, "Firmware exception at 0x1") + _line(1, "Firmware exception at 0x2"))
+                f.writelines(_line(i % 60, "Sensor ok") for i in range(50_000))
+            streamed = check_firmware_file(path)
+            full = check_firmware_file(path, full_scan=True)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.assertEqual(streamed["files"][0]["lines"], 2)
+        self.assertLess(streamed["files"][0]["bytes"], full["files"][0]["bytes"])
+        self.assertTrue(streamed["early_exit"])
+        self.assertEqual(streamed["status"], full["status"])
+
+    def test_stream_and_full_scan_read_serial_logs_alike(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "serial.txt")
+            with open(path, "wb") as f:  # nur \r als Zeilenende, dazwischen ungültige Bytes
+                f.write(b"".join(_line(i, "Sensor failed \xff").encode("utf-8").replace(b"\n", b"\r")
+                                 for i in range(3)))
+            streamed = check_firmware_file(path)
+            full = check_firmware_file(path, full_scan=True)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        for result in (streamed, full):
+            self.assertEqual(result["files"][0]["lines"], 3)
+            self.assertEqual(result["error_counts"], {"sensor_error": 3})
+        self.assertEqual(streamed["files"][0]["bytes"], full["files"][0]["bytes"])
+        self.assertEqual(streamed["status"], full["status"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# tests/test_fleet_compare.py – Tests für den Map-Reduce-Flottenvergleich
+
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from src.error_timeparser import build_error_dataframe
+from src.error_visualizer import plot_error_heatmap_logs
+from src.fleet_compare import (compare_directory, count_file, load_partial, map_files, merge_partials,
+                               partial_to_frame, partial_to_sparse, save_partial, tree_merge)
+
+LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "data_250503")
+
+
+def _log_files() -> list[str]:
+    return [os.path.join(LOG_DIR, f) for f in sorted(os.listdir(LOG_DIR)) if f.endswith(".txt")]
+
+
+class TestFleetCompare(unittest.TestCase):
+
+    def test_count_file_matches_error_dataframe(self):
+        for path in _log_files():
+            with self.subTest(path=os.path.basename(path)):
+                with open(path, encoding="utf-8") as f:
+                    df = build_error_dataframe(f.readlines())
+                expected = {} if df.empty else {k: v for k, v in df["error_type"].value_counts().items() if v}
+                self.assertEqual(count_file(path), expected)
+
+    def test_tree_merge_of_shards_equals_whole(self):
+        paths = _log_files()
+        whole = map_files(paths)
+        shards = [map_files(paths[i:i + 2]) for i in range(0, len(paths), 2)]
+        self.assertEqual(tree_merge(shards), whole)
+        self.assertEqual(compare_directory(LOG_DIR, batch_size=1), whole)
+
+    def test_merge_rejects_duplicate_files(self):
+        left = {"mode": "builtin", "files": {"a.txt": {"sensor_error": 2}}}
+        right = {"mode": "builtin", "files": {"b/a.txt": {"sensor_error": 1, "firmware_issue": 4}, "b.txt": {}}}
+        merged = merge_partials(left, right)
+        self.assertEqual(merged["files"], {"a.txt": {"sensor_error": 2}, "b/a.txt": {"sensor_error": 1,
+                                                                                   "firmware_issue": 4}, "b.txt": {}})
+        self.assertEqual(left["files"], {"a.txt": {"sensor_error": 2}})
+        with self.assertRaises(ValueError):
+            merge_partials(left, {"mode": "builtin", "files": {"a.txt": {"sensor_error": 1}}})
+        with self.assertRaises(ValueError):
+            merge_partials(left, {"mode": "custom", "files": {}})
+        # gleichnamige Dateien aus verschiedenen Verzeichnissen bleiben getrennt
+        root = os.path.dirname(os.path.abspath(LOG_DIR))
+        paths = [_log_files()[0], os.path.join(root, "data", "log_alpha.txt")]
+        self.assertEqual(list(map_files(paths, root=root)["files"]),
+                         [os.path.join("data_250503", os.path.basename(paths[0])), os.path.join("data", "log_alpha.txt")])
+        with self.assertRaises(ValueError):
+            map_files([paths[0], paths[0]], root=root)
+
+    def test_save_load_roundtrip(self):
+        partial = compare_directory(LOG_DIR)
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for name in ("partial.json", "partial.json.gz"):
+                with self.subTest(name=name):
+                    path = os.path.join(tmp_dir, name)
+                    save_partial(partial, path)
+                    self.assertEqual(load_partial(path), partial)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_sparse_matrix(self):
+        partial = {"mode": "builtin", "files": {"a.txt": {"x": 2}, "b.txt": {}, "c.txt": {"x": 1, "y": 5}}}
+        matrix = partial_to_sparse(partial)
+        self.assertEqual(list(matrix.columns), ["x", "y"])
+        self.assertIsInstance(matrix["x"].dtype, pd.SparseDtype)
+        self.assertEqual(matrix.sparse.to_dense().loc["c.txt"].tolist(), [1, 5])
+        self.assertEqual(matrix["y"].sparse.npoints, 1)
+        frame = partial_to_frame(partial)
+        self.assertEqual(frame.values.tolist(), [["a.txt", "x", 2], ["c.txt", "y", 5], ["c.txt", "x", 1]])
+
+    def test_heatmap_from_sparse_matrix(self):
+        matrix = partial_to_sparse(compare_directory(LOG_DIR))
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            plot_error_heatmap_logs(matrix, output_dir=tmp_dir, max_files=2)
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "error_comparison_heatmap.png")))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
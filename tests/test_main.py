@@ -165,4 +165,35 @@ def test_export_to_json():
         # Hier kannst du den Inhalt der JSON-Datei weiter prüfen
         assert os.path.exists(temp_json.name)
 
+def test_bench_compare_rejects_unknown_and_missing_baseline():
+    """bench compare: unbekannter --track und fehlende Baseline enden mit Exit-Code 1, ohne zu messen."""
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        history = os.path.join(temp_dir, "history.jsonl")
+        result = runner.invoke(app, ["bench", "compare", "--track", "gibt_es_nicht", "--history", history])
+        assert result.exit_code == 1
+        assert "Unbekannte Benchmarks: gibt_es_nicht" in result.output
+
+        result = runner.invoke(app, ["bench", "compare", "--history", history])
+        assert result.exit_code == 1
+        assert "Keine Baseline" in result.output
+        assert not os.path.exists(history)
+    finally:
+        cleanup_temp_dir(temp_dir)
+
+def test_show_log_summary_tolerates_invalid_utf8():
+    """show-log-summary: ungültige UTF-8-Bytes werden ersetzt und gemeldet statt abzubrechen."""
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, "serial.txt")
+        with open(path, "wb") as f:
+            f.write(b"2024-01-01 10:00:00 - ERROR - Sensor \xff failure\n2024-01-01 10:15:00 - INFO - System started\n")
+        result = runner.invoke(app, ["show-log-summary", path])
+        assert result.exit_code == 0
+        assert "1 ungültige Bytes in 1 Datei(en) ersetzt" in result.output
+    finally:
+        cleanup_temp_dir(temp_dir)
+
 # ... (Weitere Tests für Funktionen in anderen Modulen)
\ No newline at end of file
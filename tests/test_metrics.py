@@ -0,0 +1,77 @@
+# tests/test_metrics.py – Tests für die Prometheus-Metriken
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import pandas as pd
+from src import custom_classifier
+from src.custom_classifier import classify_custom_error
+from src.emba_parser import evaluate_firmware_acceptance
+from src.metrics import (REGISTRY, MetricsRegistry, CLASSIFICATION_CACHE_HITS, CLASSIFICATION_CACHE_MISSES,
+                         DEPLOYMENT_DECISIONS, record_file)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        REGISTRY.reset()
+        custom_classifier._CLASSIFICATION_CACHE.clear()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        REGISTRY.stop_interval_writer()
+        REGISTRY.reset()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_render_counter_labels_and_histogram(self):
+        registry = MetricsRegistry()
+        errors = registry.counter("errors_total", "Fehler.", ("error_type",))
+        latency = registry.histogram("latency_seconds", "Dauer.", buckets=(0.1, 1))
+        errors.inc_by_label({"sensor_error": 3, 'say "hi"': 1})
+        for value in (0.05, 0.5, 5):
+            latency.observe(value)
+
+        text = registry.render()
+        self.assertIn('firmware_analyzer_errors_total{error_type="sensor_error"} 3', text)
+        self.assertIn('firmware_analyzer_errors_total{error_type="say \\"hi\\""} 1', text)
+        self.assertIn('firmware_analyzer_latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('firmware_analyzer_latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('firmware_analyzer_latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("firmware_analyzer_latency_seconds_count 3", text)
+        self.assertIn("# TYPE firmware_analyzer_latency_seconds histogram", text)
+
+    def test_classification_cache_hits_are_counted(self):
+        for _ in range(3):
+            self.assertEqual(classify_custom_error("Sensor failed: ID 3"), "sensor_failed")
+        self.assertEqual(CLASSIFICATION_CACHE_MISSES.value, 1)
+        self.assertEqual(CLASSIFICATION_CACHE_HITS.value, 2)
+
+    def test_deployment_decisions_and_textfile(self):
+        blocked = pd.DataFrame({"error_type": ["firmware_issue", "firmware_issue"]})
+        evaluate_firmware_acceptance(blocked)
+        evaluate_firmware_acceptance(pd.DataFrame())
+        record_file(2048, 1000, 0.5)
+        self.assertEqual(DEPLOYMENT_DECISIONS.labels("blocked").value, 1)
+        self.assertEqual(DEPLOYMENT_DECISIONS.labels("accepted").value, 1)
+
+        path = os.path.join(self.tmp_dir, "textfile", "analyzer.prom")
+        REGISTRY.write_textfile(path)
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        self.assertIn("firmware_analyzer_files_processed_total 1", text)
+        self.assertIn("firmware_analyzer_bytes_read_total 2048", text)
+        self.assertIn("firmware_analyzer_lines_per_second_sum 2000", text)
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["analyzer.prom"])
+
+    def test_interval_writer(self):
+        path = os.path.join(self.tmp_dir, "interval.prom")
+        REGISTRY.start_interval_writer(path, 0.05)
+        time.sleep(0.2)
+        REGISTRY.stop_interval_writer()
+        self.assertTrue(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# tests/test_pdf_table.py – Tests für gestreamte PDF-Tabellen
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+from src.pdf_table import PdfTableWriter, compute_column_widths
+from src.emba_parser import assign_risk_level
+from src.error_visualizer import export_emba_report_to_pdf
+
+
+class TestPdfTable(unittest.TestCase):
+
+    def test_page_breaks_and_row_cap(self):
+        pdf = FPDF()
+        pdf.add_page()
+        headers = ["Komponente", "Version", "CVEs"]
+        rows = iter([(f"component_{i}", "1.0", i) for i in range(300)])
+        widths = compute_column_widths(pdf, headers, [("component_0", "1.0", 0)])
+        writer = PdfTableWriter(pdf, headers, widths)
+
+        written = writer.write_rows(rows, max_rows=200)
+
+        self.assertEqual(written, 200)
+        self.assertGreater(pdf.page, 1)
+        self.assertLessEqual(pdf.get_y(), pdf.page_break_trigger)
+        self.assertEqual(next(rows)[0], "component_200")
+
+    def test_widths_fit_page(self):
+        pdf = FPDF()
+        pdf.add_page()
+        widths = compute_column_widths(pdf, ["A", "B"], [("x" * 400, "y" * 400)])
+        self.assertAlmostEqual(sum(widths), pdf.w - pdf.l_margin - pdf.r_margin, places=3)
+
+    def test_emba_report_with_capped_rows(self):
+        rng = np.random.default_rng(1)
+        n = 3000
+        components = assign_risk_level(pd.DataFrame({
+            "component": [f"comp_{i}" for i in range(n)],
+            "version": "1.0",
+            "cves": rng.integers(0, 100, size=n),
+            "exploits": rng.integers(0, 6, size=n),
+        }))
+        summary = pd.DataFrame({"summary": ["[+] Identified 42 CVE entries."]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "emba.pdf")
+            export_emba_report_to_pdf(summary, os.path.join(tmp, "missing.png"), components, path,
+                                      max_detail_rows=100)
+            self.assertGreater(os.path.getsize(path), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
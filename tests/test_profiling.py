@@ -0,0 +1,66 @@
+# tests/test_profiling.py – Tests für Span-Profiling und --profile
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from typer.testing import CliRunner
+from src import profiling
+from src.profiling import disable_profiling, enable_profiling, profiled, span
+
+
+@profiled("parse")
+def _slow_parse(seconds):
+    with span("classify.inner"):
+        time.sleep(seconds)
+    return "fertig"
+
+
+class TestProfiling(unittest.TestCase):
+
+    def tearDown(self):
+        disable_profiling()
+
+    def test_disabled_spans_are_shared_noops(self):
+        self.assertIsNone(profiling._active)
+        self.assertIs(span("a"), span("b"))
+        self.assertEqual(_slow_parse(0), "fertig")
+
+    def test_nested_spans_report_self_time_per_stage(self):
+        enable_profiling(trace_memory=True)
+        _slow_parse(0.02)
+        _slow_parse(0.02)
+        with span("pandas.alloc"):
+            data = bytearray(2_000_000)
+            del data
+        report = disable_profiling()
+
+        spans = {item["name"]: item for item in report["spans"]}
+        self.assertEqual(spans["parse._slow_parse"]["calls"], 2)
+        self.assertGreaterEqual(spans["classify.inner"]["wall_s"], 0.04)
+        self.assertLess(spans["parse._slow_parse"]["self_wall_s"], spans["classify.inner"]["wall_s"])
+        self.assertGreaterEqual(spans["pandas.alloc"]["tracemalloc_peak_mb"], 2.0)
+        self.assertEqual(list(report["stages"])[0], "classify")
+        self.assertIsNone(profiling._active)
+
+    def test_cli_profile_option_writes_json_and_pstats(self):
+        from main import app
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            output = os.path.join(tmp_dir, "profile.json")
+            pstats_path = os.path.join(tmp_dir, "run.pstats")
+            result = CliRunner().invoke(app, ["--profile", "--profile-output", output, "--profile-pstats", pstats_path,
+                                              "search-text", "--dir", "./data_250503", "firmware"])
+            self.assertEqual(result.exit_code, 0, result.output)
+            with open(output, encoding="utf-8") as f:
+                report = json.load(f)
+            self.assertIn("total", {item["name"] for item in report["spans"]})
+            self.assertTrue(os.path.getsize(pstats_path) > 0)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
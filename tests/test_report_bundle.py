@@ -0,0 +1,76 @@
+# tests/test_report_bundle.py – Tests für gestreamte ZIP-Bundles
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from src.report_bundle import bundle_report_directory, bundle_files, build_report_manifest
+
+
+class TestReportBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.report_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.report_dir, "tables"))
+        with open(os.path.join(self.report_dir, "fehlerreport.pdf"), "w") as f:
+            f.write("Dummy PDF")
+        with open(os.path.join(self.report_dir, "tables", "events.csv"), "w") as f:
+            f.write("timestamp,error_type\n" + "2025-05-01 10:00:00,sensor_error\n" * 5000)
+        with open(os.path.join(self.report_dir, "old_bundle.zip"), "w") as f:
+            f.write("altes Archiv")
+
+    def tearDown(self):
+        shutil.rmtree(self.report_dir)
+
+    def test_manifest_covers_directory(self):
+        arcnames = [entry["arcname"] for entry in build_report_manifest(self.report_dir)]
+        self.assertEqual(arcnames, ["fehlerreport.pdf", "tables/events.csv"])
+
+    def test_bundle_is_compressed_and_has_manifest(self):
+        zip_path = os.path.join(self.report_dir, "bundle.zip")
+        bundle_report_directory(self.report_dir, zip_path, compression="deflated", compresslevel=9, chunk_size=1024)
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            names = zipf.namelist()
+            self.assertIn("tables/events.csv", names)
+            self.assertNotIn("old_bundle.zip", names)
+            info = zipf.getinfo("tables/events.csv")
+            self.assertEqual(info.compress_type, zipfile.ZIP_DEFLATED)
+            self.assertLess(info.compress_size, info.file_size / 10)
+            manifest = json.loads(zipf.read("manifest.json"))
+            self.assertEqual(len(manifest["files"]), 2)
+            self.assertEqual(len(manifest["files"][0]["sha256"]), 64)
+        leftovers = [f for f in os.listdir(self.report_dir) if f.startswith(".bundle-")]
+        self.assertEqual(leftovers, [])
+
+    def test_existing_manifest_is_not_bundled_twice(self):
+        with open(os.path.join(self.report_dir, "manifest.json"), "w") as f:
+            f.write('{"files": []}')
+        zip_path = os.path.join(self.report_dir, "bundle.zip")
+        bundle_report_directory(self.report_dir, zip_path)
+        with zipfile.ZipFile(zip_path) as zipf:
+            self.assertEqual(zipf.namelist().count("manifest.json"), 1)
+            self.assertEqual(len(json.loads(zipf.read("manifest.json"))["files"]), 2)
+        with self.assertRaises(ValueError):
+            bundle_files([{"path": zip_path, "arcname": "manifest.json", "size": 0}], zip_path)
+
+    def test_bundle_has_regular_file_mode(self):
+        zip_path = os.path.join(self.report_dir, "bundle.zip")
+        plain_path = os.path.join(self.report_dir, "plain.txt")
+        with open(plain_path, "w") as f:
+            f.write("Vergleich")
+        bundle_report_directory(self.report_dir, zip_path)
+        self.assertEqual(os.stat(zip_path).st_mode & 0o777, os.stat(plain_path).st_mode & 0o777)
+
+    def test_invalid_compression_keeps_existing_archive(self):
+        zip_path = os.path.join(self.report_dir, "old_bundle.zip")
+        with self.assertRaises(ValueError):
+            bundle_files(build_report_manifest(self.report_dir), zip_path, compression="rar")
+        with open(zip_path) as f:
+            self.assertEqual(f.read(), "altes Archiv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_risk_rules.py – Tests für die regelbasierte Risikobewertung
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import numpy as np
+import pandas as pd
+from src.emba_parser import assign_risk_level
+from src.risk_rules import load_risk_rules, validate_risk_rules, DEFAULT_RULES_PATH, FALLBACK_RISK_RULES
+
+
+def legacy_score(row):
+    """Ursprüngliche, zeilenweise Bewertung als Referenz."""
+    score = 0
+    score += 2 if row["cves"] >= 10 else 0
+    score += 3 if row["cves"] >= 50 else 0
+    score += 2 if row["exploits"] >= 1 else 0
+    score += 1 if row["exploits"] >= 5 else 0
+    score += 3 if row["component"].lower() == "linux_kernel" else 0
+    return score
+
+
+class TestRiskRules(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.df = pd.DataFrame({
+            "component": rng.choice(["linux_kernel", "Linux_Kernel", "busybox", "openssl"], size=500),
+            "version": "1.0",
+            "cves": rng.integers(0, 120, size=500),
+            "exploits": rng.integers(0, 8, size=500),
+        })
+
+    def test_default_rules_match_legacy_scoring(self):
+        result = assign_risk_level(self.df)
+        expected = self.df.apply(legacy_score, axis=1)
+        self.assertEqual(result["risk_score"].tolist(), expected.tolist())
+        self.assertEqual(result.loc[result["risk_score"] >= 7, "risk_level"].unique().tolist(), ["kritisch"])
+        self.assertEqual(set(result.loc[result["risk_score"] < 3, "risk_level"]), {"niedrig"})
+
+    def test_defaults_come_from_config_file(self):
+        with open(DEFAULT_RULES_PATH, encoding="utf-8") as f:
+            self.assertEqual(load_risk_rules(), json.load(f))
+
+    def test_fallback_without_config_file(self):
+        validate_risk_rules(FALLBACK_RISK_RULES)
+        with mock.patch("src.risk_rules.DEFAULT_RULES_PATH", Path(tempfile.gettempdir()) / "fehlt" / "risk_rules.json"):
+            result = assign_risk_level(self.df)
+        self.assertEqual(set(result["risk_level"]), {"niedrig", "hoch"})
+        self.assertTrue((result.loc[result["exploits"] >= 1, "risk_level"] == "hoch").all())
+
+    def test_custom_rules_from_file(self):
+        config = {
+            "rules": [{"components": ["open*"], "weight": 4}, {"column": "exploits", "threshold": 7, "weight": 1}],
+            "levels": [{"level": "ok", "min_score": 0}, {"level": "alarm", "min_score": 4}],
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(config, f)
+        try:
+            result = assign_risk_level(self.df, load_risk_rules(f.name))
+        finally:
+            os.remove(f.name)
+        alarm = result["risk_level"] == "alarm"
+        self.assertTrue((result.loc[result["component"] == "openssl", "risk_level"] == "alarm").all())
+        self.assertEqual(alarm.sum(), (self.df["component"] == "openssl").sum())
+        self.assertEqual(result.attrs["risk_levels"], ["alarm", "ok"])
+
+    def test_invalid_rules_raise(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"rules": [{"column": "cves"}], "levels": [{"level": "x", "min_score": 0}]}, f)
+        try:
+            with self.assertRaises(ValueError):
+                load_risk_rules(f.name)
+        finally:
+            os.remove(f.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+# tests/test_rollup.py – Tests für Zeit-Rollups, Downsampling und Seitenabfragen
+
+import unittest
+import numpy as np
+import pandas as pd
+from src.rollup import build_rollup, chart_frequency, chart_series, filter_counts, page_events, type_totals
+
+
+class TestRollup(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        seconds = rng.integers(0, 3 * 86400, 5000)
+        self.df = pd.DataFrame({
+            "timestamp": pd.Timestamp("2025-05-01") + pd.to_timedelta(seconds, unit="s"),
+            "error_type": rng.choice(["sensor_error", "firmware_issue", "voltage_warning"], 5000),
+            "message": "x",
+        })
+        self.rollup = build_rollup(self.df)
+
+    def test_counts_sum_to_events(self):
+        self.assertEqual(self.rollup["counts"]["count"].sum(), len(self.df))
+        self.assertTrue(self.rollup["events"]["timestamp"].is_monotonic_increasing)
+        self.assertEqual(self.rollup["error_types"], ["firmware_issue", "sensor_error", "voltage_warning"])
+
+    def test_chart_is_downsampled(self):
+        series = chart_series(self.rollup, max_points=100)
+        self.assertLessEqual(len(series), 100)
+        self.assertEqual(int(series.to_numpy().sum()), len(self.df))
+        self.assertEqual(chart_frequency("2025-05-01", "2025-05-01 01:00", 100), "min")
+        self.assertEqual(chart_frequency("2025-05-01", "2025-05-04", 100), "h")
+
+    def test_filters_match_raw_events(self):
+        start, end = pd.Timestamp("2025-05-02 06:00"), pd.Timestamp("2025-05-02 18:00")
+        mask = (self.df["timestamp"] >= start) & (self.df["timestamp"] <= end) & \
+               (self.df["error_type"] == "firmware_issue")
+        _, total = page_events(self.rollup, 0, 10, start, end, ["firmware_issue"])
+        self.assertEqual(total, int(mask.sum()))
+        # Rollup-Filter ist minutengenau: Endminute zählt vollständig
+        end_minute = end + pd.Timedelta(seconds=59)
+        mask_minute = (self.df["timestamp"] >= start) & (self.df["timestamp"] <= end_minute) & \
+                      (self.df["error_type"] == "firmware_issue")
+        self.assertEqual(type_totals(self.rollup, start, end, ["firmware_issue"]).sum(), int(mask_minute.sum()))
+        self.assertEqual(filter_counts(self.rollup, start, end)["error_type"].nunique(), 3)
+
+    def test_pages(self):
+        first, total = page_events(self.rollup, 0, 300)
+        last, _ = page_events(self.rollup, total // 300, 300)
+        self.assertEqual(total, len(self.df))
+        self.assertEqual(len(first), 300)
+        self.assertEqual(len(last), total % 300)
+        self.assertLessEqual(first["timestamp"].iloc[-1], last["timestamp"].iloc[0])
+
+    def test_empty(self):
+        rollup = build_rollup(pd.DataFrame())
+        self.assertIsNone(rollup["start"])
+        self.assertTrue(chart_series(rollup).empty)
+        self.assertEqual(page_events(rollup)[1], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
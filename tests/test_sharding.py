@@ -0,0 +1,93 @@
+# tests/test_sharding.py – Tests für Shard-Manifeste und das Zusammenführen von Teilergebnissen
+
+import os
+import sys
+import shutil
+import subprocess
+import tempfile
+import unittest
+from src.analysis_tasks import analyze_directory
+from src.error_visualizer import compare_error_logs
+from src.sharding import (default_partial_path, expand_partial_paths, load_manifest, merge_compare_partials,
+                          merge_events_partials, partial_kind, plan_shards, write_manifests)
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+LOG_DIR = os.path.join(ROOT, "data_250503")
+
+
+class TestSharding(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_plan_is_balanced_and_complete(self):
+        sizes = [5000, 4000, 3000, 3000, 2000, 2000, 1000]
+        for i, size in enumerate(sizes):
+            with open(os.path.join(self.tmp_dir, f"log{i}.txt"), "w", encoding="utf-8") as f:
+                f.write("x" * size)
+        manifests = plan_shards(self.tmp_dir, 2)
+        self.assertEqual(sorted(f for m in manifests for f in m["files"]), [f"log{i}.txt" for i in range(7)])
+        self.assertEqual([m["bytes"] for m in manifests], [10000, 10000])
+
+        paths = write_manifests(manifests, os.path.join(self.tmp_dir, "shards"))
+        self.assertEqual(load_manifest(paths[1]), manifests[1])
+        self.assertTrue(default_partial_path(paths[0], "analyze").endswith("shard-001-of-002.analyze.json.gz"))
+
+    def test_shards_as_separate_processes_match_single_run(self):
+        shard_dir = os.path.join(self.tmp_dir, "shards")
+        manifests = write_manifests(plan_shards(LOG_DIR, 3), shard_dir)
+        processes = [subprocess.Popen([sys.executable, "main.py", command, "--manifest", path], cwd=ROOT,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                     for path in manifests for command in ("analyze", "compare-logs")]
+        for process in processes:
+            _, stderr = process.communicate(timeout=300)
+            self.assertEqual(process.returncode, 0, stderr.decode(errors="replace"))
+
+        merged_df, stats = merge_events_partials(expand_partial_paths([os.path.join(shard_dir, "*.analyze.json.gz")]))
+        full_df, full_stats = analyze_directory(LOG_DIR)
+        self.assertEqual(merged_df.astype(str).values.tolist(), full_df.astype(str).values.tolist())
+        self.assertEqual(stats["error_counts"], full_stats["error_counts"])
+        self.assertEqual(len(stats["files"]), len(full_stats["files"]))
+
+        merged_counts = merge_compare_partials(expand_partial_paths([os.path.join(shard_dir, "*.compare.json.gz")]))
+        self.assertEqual(merged_counts.values.tolist(), compare_error_logs(LOG_DIR).values.tolist())
+
+    def test_overlapping_and_incomplete_partials_are_rejected(self):
+        manifests = write_manifests(plan_shards(LOG_DIR, 2), self.tmp_dir)
+        for path in manifests:
+            for command in ("analyze", "compare-logs"):
+                result = subprocess.run([sys.executable, "main.py", command, "--manifest", path], cwd=ROOT,
+                                        capture_output=True, timeout=300)
+                self.assertEqual(result.returncode, 0, result.stderr.decode(errors="replace"))
+        for kind, merge in (("analyze", merge_events_partials), ("compare", merge_compare_partials)):
+            first, second = (default_partial_path(path, kind) for path in manifests)
+            copy = os.path.join(self.tmp_dir, f"copy.{kind}.json.gz")
+            shutil.copy(first, copy)
+            self.assertEqual(partial_kind(copy), kind)
+            with self.subTest(kind=kind):
+                with self.assertRaisesRegex(ValueError, "doppelt"):
+                    merge([first, second, copy])
+                with self.assertRaisesRegex(ValueError, "Shard 2 von 2 fehlt"):
+                    merge([first])
+                merge([first, second])
+
+        first = default_partial_path(manifests[0], "compare")
+        result = subprocess.run([sys.executable, "main.py", "merge", "-p", first], cwd=ROOT, capture_output=True,
+                                text=True, timeout=300)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Unvollständig", result.stdout)
+
+    def test_partial_kind_from_header(self):
+        partial = os.path.join(self.tmp_dir, "teil.json")
+        compare_error_logs(LOG_DIR, partial_path=partial)
+        self.assertEqual(partial_kind(partial), "compare")
+        # ohne Plan (ohne --manifest) werden nur Überschneidungen geprüft
+        with self.assertRaises(ValueError):
+            merge_compare_partials([partial, partial])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# tests/test_upload_analysis.py – Tests für die blockweise Upload-Analyse der GUI
+
+import unittest
+from src.data_analysis import parse_log_to_dataframe
+from src.upload_analysis import analyze_upload, content_hash, iter_line_chunks, render_charts
+
+LOG_TEXT = """[2025-05-21 10:01:00] ERROR CAN-Bus timeout on channel 4
+[2025-05-21 10:02:00] ERROR Firmware update failed on node 2
+[2025-05-21 10:03:00] ERROR Firmware error at address 0x5C4F
+[2025-05-21 11:04:00] ERROR Sensor failed: ID 3 – Überhitzung
+[2025-05-21 11:05:00] WARNING Voltage drop detected: 10.49V
+"""
+
+
+class TestUploadAnalysis(unittest.TestCase):
+
+    def test_chunks_reassemble_lines_and_utf8(self):
+        data = LOG_TEXT.encode("utf-8")
+        for chunk_size in (1, 7, 64, len(data)):
+            with self.subTest(chunk_size=chunk_size):
+                lines = []
+                for chunk, done in iter_line_chunks(data, chunk_size):
+                    lines.extend(chunk)
+                self.assertEqual(done, len(data))
+                self.assertEqual(lines, LOG_TEXT.splitlines())
+
+    def test_invalid_bytes_are_replaced(self):
+        lines = [line for chunk, _ in iter_line_chunks(b"ok\n\xff\xfe kaputt\n", 4) for line in chunk]
+        self.assertEqual(lines, ["ok", "�� kaputt"])
+
+    def test_matches_single_pass_parse(self):
+        progress = []
+        analysis = analyze_upload(LOG_TEXT.encode("utf-8"), chunk_size=50,
+                                  progress=lambda done, total: progress.append((done, total)))
+        expected = parse_log_to_dataframe(LOG_TEXT, classify=True)
+        self.assertEqual(analysis["df"]["error_type"].tolist(), expected["error_type"].tolist())
+        self.assertEqual(progress[-1], (len(LOG_TEXT.encode("utf-8")),) * 2)
+        self.assertEqual(analysis["digest"], content_hash(LOG_TEXT.encode("utf-8")))
+        self.assertFalse(analysis["status"])
+        self.assertEqual(analysis["counts"]["firmware_issue"], 2)
+        self.assertEqual(analysis["hourly"].sum().sum(), 5)
+        self.assertEqual(analysis["df"].attrs["suggested_classes"], analysis["suggested_classes"])
+
+    def test_charts_are_rendered_once(self):
+        analysis = analyze_upload(LOG_TEXT.encode("utf-8"))
+        charts = render_charts(analysis)
+        self.assertEqual(set(charts), {"error_types", "error_stacked_bar", "error_heatmap"})
+        self.assertTrue(charts["error_heatmap"].startswith(b"\x89PNG"))
+        self.assertIs(render_charts(analysis), charts)
+
+    def test_empty_upload(self):
+        analysis = analyze_upload(b"")
+        self.assertTrue(analysis["df"].empty)
+        self.assertTrue(analysis["status"])
+        self.assertEqual(render_charts(analysis), {})
+
+
+if __name__ == "__main__":
+    unittest.main()